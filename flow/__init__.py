@@ -1,4 +1,4 @@
-from . import oddball, utils
+from . import force, oddball, utils
 from ._version import __version__
 from .utils.config import sys_info
 from .utils.logs import add_file_handler, set_log_level
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import click
+
+from .. import set_log_level
+from ..oddball._client import ControlClient
+from ..oddball._config import CONTROL_ADDRESS
+from ..oddball._control import _MESSAGES
+from ..utils._dashboard import format_percentiles
+
+if TYPE_CHECKING:
+    from typing import Optional, Union
+
+
+def _parse_step(step: str) -> Union[str, float]:
+    """Parse a step of a control script, a message or a pause in seconds."""
+    try:
+        pause = float(step)
+    except ValueError:
+        if step not in _MESSAGES:
+            raise click.UsageError(
+                f"The messages must be one of {', '.join(map(repr, _MESSAGES))}, got "
+                f"{step!r}."
+            ) from None
+        return step
+    if not math.isfinite(pause) or pause < 0:
+        raise click.UsageError(
+            f"The pauses must be finite and positive durations in seconds, got {step}."
+        )
+    return pause
+
+
+@click.command(name="control")
+@click.argument("steps", nargs=-1)
+@click.option(
+    "--file",
+    "fname",
+    help="file with one step per line, appended to the steps.",
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "--address",
+    default=CONTROL_ADDRESS,
+    help="address of the oddball control socket.",
+    show_default=True,
+    type=str,
+)
+@click.option(
+    "--timeout",
+    default=1.0,
+    help="duration in seconds to wait for a reply.",
+    show_default=True,
+    type=float,
+)
+@click.option(
+    "--retries",
+    default=3,
+    help="number of reconnections without reply before giving up.",
+    show_default=True,
+    type=int,
+)
+@click.option(
+    "--repeat",
+    default=1,
+    help="number of times the steps are run.",
+    show_default=True,
+    type=int,
+)
+def run(
+    steps: tuple[str, ...],
+    fname: Optional[str],
+    address: str,
+    timeout: float,
+    retries: int,
+    repeat: int,
+) -> None:
+    """Send hold and continue messages to the oddball paradigm.
+
+    STEPS is a sequence of messages 'hold' or 'continue' and of pauses in seconds,
+    e.g. 'flow control hold 5 continue'.
+    """
+    set_log_level("INFO")
+    script = [_parse_step(step) for step in steps]
+    if fname is not None:
+        with open(fname) as fid:
+            script.extend(_parse_step(line.strip()) for line in fid if line.strip())
+    if len(script) == 0:
+        raise click.UsageError("At least one step must be provided.")
+    with ControlClient(address, timeout=timeout, retries=retries) as client:
+        client.run(script, repeat=repeat)
+        rtts = client.rtts
+    click.echo(
+        f"Round-trip latency over {rtts.size} messages (ms): "
+        f"{format_percentiles(rtts, scale=1e3)}"
+    )
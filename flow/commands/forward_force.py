@@ -1,10 +1,32 @@
 from __future__ import annotations
 
-import socket as sc
+import time
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
 
 import click
+from byte_triggers import MockTrigger, ParallelPortTrigger
 from Phidget22.Devices.VoltageRatioInput import VoltageRatioInput
 
+from .. import set_log_level
+from ..force import (
+    ForceEventDetector,
+    ForceFanout,
+    ForceWriter,
+    SensorWatchdog,
+    SlidingFeatures,
+    load_recording,
+    replay,
+)
+from ..force._config import FEATURE_RATE, SAMPLE_RATE, TRIGGER_ADDRESS, TRIGGER_DELAY
+from ..force._dashboard import render_force
+from ..oddball._config import TRIGGER_ADDRESS as ODDBALL_TRIGGER_ADDRESS
+from ..utils._dashboard import Dashboard
+from ..utils.logs import logger
+
+if TYPE_CHECKING:
+    from typing import Optional, Union
+
 _GAIN: float = 262.36
 _GRAVITY_CONSTANT: float = 9.806
 _OFFSET: float = 0.0092264
@@ -25,19 +47,214 @@ _OFFSET: float = 0.0092264
     show_default=True,
     type=int,
 )
-def run(ip: str, port: int) -> None:
+@click.option(
+    "--destination",
+    "destinations",
+    help=(
+        "also send the samples to this destination, e.g. 'udp://host:port', "
+        "'zmq+tcp://*:port' or 'ws://host:port', with an optional decimation and rate "
+        "limit, e.g. 'udp://host:port?decimation=10&rate=50'. Can be repeated."
+    ),
+    multiple=True,
+    type=str,
+)
+@click.option(
+    "--shm",
+    help="also write the samples in a shared memory ring for local readers.",
+    is_flag=True,
+)
+@click.option(
+    "--detect",
+    help="detect the force events and mark them with triggers.",
+    is_flag=True,
+)
+@click.option(
+    "--trigger-address",
+    help=(
+        "address of the parallel port on which the force events are marked, e.g. "
+        "0x2FBC or /dev/parport1, distinct from the port driven by 'flow oddball'. "
+        "Defaults to TRIGGER_ADDRESS in flow/force/_config.py."
+    ),
+    type=str,
+)
+@click.option("--mock", help="run with a mock trigger.", is_flag=True)
+@click.option(
+    "--dashboard",
+    help="display a live dashboard of the stream instead of the logs.",
+    is_flag=True,
+)
+@click.option(
+    "--features-port",
+    help="also send the sliding-window features to this port of the Unity server.",
+    type=int,
+)
+@click.option(
+    "--replay",
+    "fname",
+    help="replay a force recording instead of reading the sensor.",
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "--speed",
+    default=1.0,
+    help="replay speed relative to the recording, 0 to replay as fast as possible.",
+    show_default=True,
+    type=click.FloatRange(min=0),
+)
+def run(
+    ip: str,
+    port: int,
+    destinations: tuple[str, ...],
+    shm: bool,
+    detect: bool,
+    trigger_address: Optional[str],
+    mock: bool,
+    dashboard: bool,
+    features_port: Optional[int],
+    fname: Optional[str],
+    speed: float,
+) -> None:
     """Run forward_force() command."""
-    socket = sc.socket(sc.AF_INET, sc.SOCK_DGRAM)
+    set_log_level("INFO")
+    fanout = ForceFanout([f"udp://{ip}:{port}", *destinations])
+    writer = ForceWriter() if shm else None
+    detector = None
+    if detect:
+        if mock:
+            trigger = MockTrigger()
+        else:
+            address = _parse_address(trigger_address)
+            trigger = ParallelPortTrigger(address, delay=round(TRIGGER_DELAY * 1e3))
+        detector = ForceEventDetector(trigger)
+    if features_port is None:
+        features = features_fanout = None
+    else:
+        features = SlidingFeatures()
+        features_fanout = ForceFanout([f"udp://{ip}:{features_port}"])
+    decimation = max(round(SAMPLE_RATE / FEATURE_RATE), 1)
+    n_samples = 0
+
+    def _forward(currentForce: float) -> None:
+        nonlocal n_samples
+        timestamp = time.perf_counter_ns()
+        # the triggers are sent first, as close as possible to the sample
+        if detector is not None:
+            detector.update(currentForce, timestamp)
+        if writer is not None:
+            writer.write(currentForce, timestamp)
+        fanout.push(currentForce)
+        if features is not None:
+            features.update(currentForce)
+            n_samples += 1
+            if n_samples % decimation == 0:
+                features_fanout.push(features.features)
 
     def _callback_on_voltage_ratio_change(self, voltageRatio) -> None:
+        watchdog.feed()
         currentWeight = (voltageRatio - _OFFSET) * _GAIN
-        currentForce = currentWeight * _GRAVITY_CONSTANT
-        socket.sendto(bytes(str(currentForce), encoding="ascii"), (ip, port))
-
-    voltageRatioInput0 = VoltageRatioInput()
-    voltageRatioInput0.openWaitForAttachment(500)
-    voltageRatioInput0.setBridgeGain(4)
-    voltageRatioInput0.setDataInterval(1)
-    voltageRatioInput0.setOnVoltageRatioChangeHandler(_callback_on_voltage_ratio_change)
-    input(">>> Press any key to stop the force measurement..")
-    voltageRatioInput0.close()
+        _forward(currentWeight * _GRAVITY_CONSTANT)
+
+    def _attach() -> VoltageRatioInput:
+        voltageRatioInput0 = VoltageRatioInput()
+        voltageRatioInput0.openWaitForAttachment(500)
+        voltageRatioInput0.setBridgeGain(4)
+        voltageRatioInput0.setDataInterval(round(1000 / SAMPLE_RATE))
+        voltageRatioInput0.setOnVoltageRatioChangeHandler(
+            _callback_on_voltage_ratio_change
+        )
+        return voltageRatioInput0
+
+    def _on_stale() -> None:
+        # the numbering of the samples in the ring and in the fan-out continues
+        if writer is not None:
+            writer.stale = True
+        fanout.push_stale()
+
+    def _on_recover() -> None:
+        if writer is not None:
+            writer.stale = False
+
+    features_context = nullcontext() if features_fanout is None else features_fanout
+    with fanout, features_context, nullcontext() if writer is None else writer:
+        if fname is not None:
+            samples = load_recording(fname)
+            logger.info(
+                "Replaying %i samples from %s, press Ctrl+C to stop.",
+                samples.size,
+                fname,
+            )
+            with Dashboard(render_force(fanout)) if dashboard else nullcontext():
+                stats = replay(samples, _forward, speed)
+            logger.info(
+                "Replayed %i samples in %.3f s (%.0f samples/s, speed %.2fx, "
+                "maximum lag %.3f ms).",
+                stats["n_samples"],
+                stats["duration"],
+                stats["rate"],
+                stats["speed"],
+                stats["max_lag"] * 1e3,
+            )
+        else:
+            watchdog = SensorWatchdog(
+                _attach,
+                lambda voltageRatioInput0: voltageRatioInput0.close(),
+                on_stale=_on_stale,
+                on_recover=_on_recover,
+            )
+            if dashboard:
+                logger.info("Press ENTER to stop the force measurement.")
+                with watchdog, Dashboard(render_force(fanout, watchdog)):
+                    input()
+            else:
+                with watchdog:
+                    input(">>> Press any key to stop the force measurement..")
+            logger.info(
+                "Received %i samples, the sensor was reattached %i times.",
+                watchdog.n_samples,
+                watchdog.n_reattach,
+            )
+    fanout_stats = fanout.stats
+    if features_fanout is not None:
+        fanout_stats.update(features_fanout.stats)
+    for url, stats in fanout_stats.items():
+        logger.info(
+            "Sent %i samples to %s (%i dropped, %i skipped by the rate limit).",
+            stats["sent"],
+            url,
+            stats["dropped"],
+            stats["skipped"],
+        )
+    if detector is not None and detector.n_skipped != 0:
+        logger.warning(
+            "%i force triggers were skipped as they followed another trigger by less "
+            "than %.0f ms.",
+            detector.n_skipped,
+            TRIGGER_DELAY * 1e3,
+        )
+
+
+def _parse_address(value: Optional[str]) -> Union[int, str]:
+    """Parse the address of the parallel port of the force triggers.
+
+    The port driven by the oddball paradigm is rejected, as 2 processes writing on the
+    same port corrupt each other's triggers.
+    """
+    if value is None:
+        if TRIGGER_ADDRESS is None:
+            raise click.UsageError(
+                "The address of the parallel port of the force triggers must be set "
+                "with --trigger-address or TRIGGER_ADDRESS in flow/force/_config.py."
+            )
+        address = TRIGGER_ADDRESS
+    else:
+        try:
+            address = int(value, 0)
+        except ValueError:
+            address = value  # e.g. /dev/parport1
+    if address == ODDBALL_TRIGGER_ADDRESS:
+        raise click.BadParameter(
+            f"The port {value if value is not None else address} is driven by the "
+            "oddball paradigm, the force triggers require a distinct port.",
+            param_hint="'--trigger-address'",
+        )
+    return address
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import click
 
+from .control import run as control
 from .forward_force import run as forward_force
 from .oddball import run as oddball
 from .sys_info import run as sys_info
@@ -12,6 +13,7 @@ def run() -> None:
     """Main package entry-point."""  # noqa: D401
 
 
+run.add_command(control)
 run.add_command(forward_force)
 run.add_command(oddball)
 run.add_command(sys_info)
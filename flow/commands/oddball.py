@@ -1,20 +1,160 @@
 from __future__ import annotations
 
+from pathlib import Path
+from typing import TYPE_CHECKING
+
 import click
 
 from .. import set_log_level
-from ..oddball import oddball
+from ..oddball import (
+    generate_trial_lists,
+    oddball,
+    prepare,
+    simulate,
+    write_trial_list,
+)
+
+if TYPE_CHECKING:
+    from typing import Optional
 
 
-@click.command(name="oddball")
+@click.group(name="oddball", invoke_without_command=True)
 @click.option(
     "--condition",
     type=str,
     help="condition to run among main1 | main2 | main3 | solo | stp1 | stp2 | stp3.",
-    prompt="Condition to run",
 )
 @click.option("--mock", help="run with a mock trigger.", is_flag=True)
-def run(condition: str, mock: bool):
+@click.option(
+    "--resume",
+    help="resume the condition from the last checkpointed trial.",
+    is_flag=True,
+)
+@click.option(
+    "--realtime",
+    help="pin the process, lock its memory and control the garbage collection.",
+    is_flag=True,
+)
+@click.option(
+    "--multiprocess",
+    help="run the trial loop in a dedicated process.",
+    is_flag=True,
+)
+@click.option(
+    "--dashboard",
+    help="display a live dashboard of the session instead of the logs.",
+    is_flag=True,
+)
+@click.option(
+    "--dry-run",
+    help="simulate the condition headless, in virtual time.",
+    is_flag=True,
+)
+@click.pass_context
+def run(
+    ctx: click.Context,
+    condition: str,
+    mock: bool,
+    resume: bool,
+    realtime: bool,
+    multiprocess: bool,
+    dashboard: bool,
+    dry_run: bool,
+):
     """Run oddball() command."""
+    if ctx.invoked_subcommand is not None:
+        return
+    if condition is None:
+        condition = click.prompt("Condition to run", type=str)
+    set_log_level("INFO")
+    if dry_run:
+        simulate(condition)
+        return
+    oddball(
+        condition,
+        mock=mock,
+        resume=resume,
+        realtime=realtime,
+        multiprocess=multiprocess,
+        dashboard=dashboard,
+    )
+
+
+@run.command(name="prepare")
+@click.option(
+    "--directory",
+    help="directory in which the prepared artifacts are stored.",
+    type=click.Path(file_okay=False),
+)
+@click.option(
+    "--n-jobs",
+    help="number of worker processes, defaults to the number of CPUs.",
+    type=int,
+)
+@click.option(
+    "--sample-rate",
+    "sample_rates",
+    help="sample rate at which the sounds are prepared, defaults to SAMPLE_RATES.",
+    type=int,
+    multiple=True,
+)
+def run_prepare(
+    directory: Optional[str], n_jobs: Optional[int], sample_rates: tuple[int, ...]
+) -> None:
+    """Prepare the trial lists and the sounds of every condition."""
+    set_log_level("INFO")
+    prepare(directory, n_jobs=n_jobs, sample_rates=list(sample_rates) or None)
+
+
+@run.command(name="generate")
+@click.option(
+    "--directory",
+    help="directory in which the trial lists are written.",
+    type=click.Path(file_okay=False),
+    required=True,
+)
+@click.option("--n-lists", help="number of trial lists.", type=int, default=1)
+@click.option("--n-trials", help="number of sounds per list.", type=int, required=True)
+@click.option("--p-target", help="proportion of targets.", type=float, default=0.1)
+@click.option("--p-novel", help="proportion of novels.", type=float, default=0.1)
+@click.option(
+    "--min-spacing", help="minimum distance between deviants.", type=int, default=2
+)
+@click.option(
+    "--cross-every",
+    help="insert a cross every N sounds, not playable by 'flow oddball'.",
+    type=int,
+)
+@click.option("--seed", help="seed of the random number generator.", type=int)
+@click.option(
+    "--n-jobs",
+    help="number of worker processes, defaults to the number of CPUs.",
+    type=int,
+)
+def run_generate(
+    directory: str,
+    n_lists: int,
+    n_trials: int,
+    p_target: float,
+    p_novel: float,
+    min_spacing: int,
+    cross_every: Optional[int],
+    seed: Optional[int],
+    n_jobs: Optional[int],
+) -> None:
+    """Generate random trial lists."""
     set_log_level("INFO")
-    oddball(condition, mock=mock)
+    trial_lists = generate_trial_lists(
+        n_lists,
+        n_trials,
+        p_target=p_target,
+        p_novel=p_novel,
+        min_spacing=min_spacing,
+        cross_every=cross_every,
+        seed=seed,
+        n_jobs=n_jobs,
+    )
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for k, trials in enumerate(trial_lists):
+        write_trial_list(trials, directory / f"list{k:04d}.txt")
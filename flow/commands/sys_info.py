@@ -11,6 +11,15 @@ from .. import sys_info
     help="Display information for optional dependencies.",
     is_flag=True,
 )
-def run(developer: bool) -> None:
+@click.option(
+    "--realtime",
+    help="Display the real-time readiness and measure the wake-up latency.",
+    is_flag=True,
+)
+def run(developer: bool, realtime: bool) -> None:
     """Run sys_info() command."""
-    sys_info(developer=developer)
+    sys_info(developer=developer, realtime=realtime)
+    if realtime:
+        from ..oddball._runtime import print_wakeup_latency
+
+        print_wakeup_latency()
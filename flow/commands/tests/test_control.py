@@ -0,0 +1,36 @@
+from click.testing import CliRunner
+
+from ...oddball._control import ControlServer
+from ..control import run
+
+_ADDRESS: str = "tcp://127.0.0.1:5597"
+
+
+def test_control(tmp_path):
+    """Test the control entry-point."""
+    with open(tmp_path / "script.txt", "w") as fid:
+        fid.write("hold\n0.01\ncontinue\n")
+    runner = CliRunner()
+    with ControlServer(_ADDRESS) as control:
+        result = runner.invoke(
+            run,
+            ["hold", "--file", str(tmp_path / "script.txt"), "--address", _ADDRESS]
+            + ["--repeat", "2"],
+        )
+        assert not control.hold
+    assert result.exit_code == 0
+    assert "Round-trip latency over 6 messages" in result.output
+    result = runner.invoke(run, ["--address", _ADDRESS])
+    assert result.exit_code != 0
+    assert "At least one step" in result.output
+    # a script without messages has no round-trip latency
+    result = runner.invoke(run, ["0.01", "--address", _ADDRESS])
+    assert result.exit_code == 0
+    assert "Round-trip latency over 0 messages (ms): n/a" in result.output
+    for pause in ("-1", "nan", "inf"):
+        result = runner.invoke(run, ["--address", _ADDRESS, "--", "hold", pause])
+        assert result.exit_code != 0
+        assert "finite and positive" in result.output
+    result = runner.invoke(run, ["hodl", "--address", _ADDRESS])
+    assert result.exit_code != 0
+    assert "got 'hodl'" in result.output
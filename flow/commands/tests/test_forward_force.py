@@ -0,0 +1,16 @@
+import click
+import pytest
+
+from ...oddball._config import TRIGGER_ADDRESS
+from ..forward_force import _parse_address
+
+
+def test_parse_address():
+    """Test the parsing of the port of the force triggers."""
+    assert _parse_address("0x2FBC") == 0x2FBC
+    assert _parse_address("12220") == 12220
+    assert _parse_address("/dev/parport1") == "/dev/parport1"
+    with pytest.raises(click.BadParameter, match="driven by the oddball"):
+        _parse_address(str(TRIGGER_ADDRESS))
+    with pytest.raises(click.UsageError, match="must be set"):
+        _parse_address(None)
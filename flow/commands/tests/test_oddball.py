@@ -0,0 +1,37 @@
+from click.testing import CliRunner
+
+from ..oddball import run
+
+
+def test_oddball_prepare(tmp_path):
+    """Test the oddball prepare entry-point."""
+    runner = CliRunner()
+    result = runner.invoke(
+        run, ["prepare", "--directory", str(tmp_path), "--n-jobs", "2"]
+    )
+    assert result.exit_code == 0
+    assert (tmp_path / "manifest.json").exists()
+
+
+def test_oddball_generate(tmp_path):
+    """Test the oddball generate entry-point."""
+    runner = CliRunner()
+    result = runner.invoke(
+        run,
+        ["generate", "--directory", str(tmp_path), "--n-lists", "3"]
+        + ["--n-trials", "50", "--seed", "0", "--n-jobs", "1"],
+    )
+    assert result.exit_code == 0
+    assert sorted(elt.name for elt in tmp_path.iterdir()) == [
+        "list0000.txt",
+        "list0001.txt",
+        "list0002.txt",
+    ]
+
+
+def test_oddball_dry_run():
+    """Test the oddball entry-point in dry-run mode."""
+    runner = CliRunner()
+    result = runner.invoke(run, ["--dry-run"], input="solo\n")
+    assert result.exit_code == 0
+    assert "Condition to run" in result.output
@@ -18,3 +18,12 @@ def test_sys_info(developer: bool):
         assert "Optional 'build' dependencies" in result.output
         assert "Optional 'style' dependencies" in result.output
         assert "Optional 'test' dependencies" in result.output
+
+
+def test_sys_info_realtime():
+    """Test the system information entry-point with real-time readiness."""
+    runner = CliRunner()
+    result = runner.invoke(run, ["--realtime"])
+    assert result.exit_code == 0
+    assert "Real-time readiness" in result.output
+    assert "Wake-up latency" in result.output
@@ -0,0 +1,6 @@
+from ._detector import ONSET, PRESS, RELEASE, SUSTAINED, ForceEventDetector
+from ._fanout import ForceFanout
+from ._features import SlidingFeatures
+from ._replay import load_recording, replay
+from ._ring import SAMPLE_DTYPE, ForceReader, ForceWriter
+from ._watchdog import SensorWatchdog
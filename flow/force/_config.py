@@ -0,0 +1,46 @@
+from ..utils._checks import check_type
+
+SHM_NAME: str = "flow-force"  # shared memory ring written by 'flow forward-force --shm'
+SHM_CAPACITY: int = 65536  # samples, i.e. ~65 s at 1 kHz
+SAMPLE_RATE: float = 1000.0  # Hz, data interval of the sensor
+# watchdog of the sensor in 'flow forward-force'
+WATCHDOG_STALE: int = 10  # data intervals without sample before the data is stale
+WATCHDOG_REATTACH: float = 0.5  # seconds without sample before the sensor is reattached
+WATCHDOG_BACKOFF: tuple[float, float] = (0.1, 5.0)  # seconds, first and maximum delays
+# online detection of the force events, see 'flow forward-force --detect'
+FORCE_THRESHOLD: float = 5.0  # N, grip detected above
+FORCE_HYSTERESIS: float = 1.0  # N, grip released below FORCE_THRESHOLD - hysteresis
+FORCE_SLOPE: float = 50.0  # N/s, onset detected when the smoothed derivative exceeds
+FORCE_SLOPE_TAU: float = 0.01  # seconds, time constant of the derivative smoothing
+FORCE_SUSTAIN: float = 1.0  # seconds, grip held above the threshold
+# port of the force triggers, distinct from the port driven by the oddball paradigm
+TRIGGER_ADDRESS: int | str | None = None  # e.g. 0x2FBC or /dev/parport1
+TRIGGER_DELAY: float = 0.01  # seconds, duration of a trigger and minimum interval
+TRIGGERS: dict[str, int] = {
+    "press": 10,
+    "release": 11,
+    "onset": 12,
+    "sustained": 13,
+}
+# sliding-window features, see 'flow forward-force --features-port'
+FEATURE_WINDOW: float = 1.0  # seconds
+FEATURE_RATE: float = 10.0  # Hz, publication rate of the features
+FEATURE_BANDS: dict[str, tuple[float, float]] = {
+    "slow": (0.5, 3.0),  # Hz
+    "tremor": (8.0, 12.0),  # Hz
+}
+
+# check the variables
+check_type(FORCE_THRESHOLD, ("numeric",), "FORCE_THRESHOLD")
+check_type(FORCE_HYSTERESIS, ("numeric",), "FORCE_HYSTERESIS")
+assert 0 <= FORCE_HYSTERESIS
+assert 0 < FORCE_SLOPE_TAU
+assert 0 < FORCE_SUSTAIN
+check_type(TRIGGER_ADDRESS, ("int-like", str, None), "TRIGGER_ADDRESS")
+assert 0 < TRIGGER_DELAY
+assert 0 < FEATURE_RATE <= SAMPLE_RATE
+assert 0 < WATCHDOG_STALE
+assert WATCHDOG_STALE / SAMPLE_RATE < WATCHDOG_REATTACH
+assert 0 < WATCHDOG_BACKOFF[0] <= WATCHDOG_BACKOFF[1]
+assert all(0 < low < high < SAMPLE_RATE / 2 for low, high in FEATURE_BANDS.values())
+assert set(TRIGGERS) == {"press", "release", "onset", "sustained"}
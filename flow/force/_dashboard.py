@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ..utils._dashboard import RateMeter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import Optional
+
+    from ._fanout import ForceFanout
+    from ._watchdog import SensorWatchdog
+
+
+def render_force(
+    fanout: ForceFanout, watchdog: Optional[SensorWatchdog] = None
+) -> Callable[[], list[str]]:
+    """Create the function rendering the dashboard of the force stream.
+
+    The function only reads the counters of the fan-out and of the watchdog, for
+    :class:`~flow.utils._dashboard.Dashboard`.
+
+    Parameters
+    ----------
+    fanout : ForceFanout
+        The fan-out sending the samples to the destinations.
+    watchdog : SensorWatchdog | None
+        The watchdog of the sensor, if the samples are read from a sensor.
+
+    Returns
+    -------
+    render : callable
+        Function returning the lines of the dashboard.
+    """
+    meter = RateMeter()
+
+    def render() -> list[str]:
+        n_samples = fanout.n_samples
+        line = (
+            f"Force       {meter.update(n_samples):.1f} samples/s, {n_samples} samples"
+        )
+        if watchdog is not None:
+            line += f", reattached {watchdog.n_reattach} times"
+            if watchdog.stale:
+                line += "  (stale)"
+        lines = [line]
+        for url, stats in fanout.stats.items():
+            lines.append(
+                f"  {url}  sent {stats['sent']}, dropped {stats['dropped']}, "
+                f"skipped {stats['skipped']}"
+            )
+        return lines
+
+    return render
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from ..utils._checks import check_type
+from ._config import (
+    FORCE_HYSTERESIS,
+    FORCE_SLOPE,
+    FORCE_SLOPE_TAU,
+    FORCE_SUSTAIN,
+    FORCE_THRESHOLD,
+    TRIGGER_DELAY,
+    TRIGGERS,
+)
+
+if TYPE_CHECKING:
+    from typing import Optional
+
+    from byte_triggers._base import BaseTrigger
+
+# events returned by ForceEventDetector.update as a bitmask
+PRESS: int = 1
+RELEASE: int = 2
+ONSET: int = 4
+SUSTAINED: int = 8
+
+
+class ForceEventDetector:
+    """Detect the force events online and mark them with triggers.
+
+    The detector processes one sample at a time with a constant amount of work, thus
+    it can run in the sensor callback:
+
+    - ``press``: the force rises above ``threshold``.
+    - ``release``: the force falls below ``threshold - hysteresis`` after a press.
+    - ``onset``: the derivative of the force, smoothed by a first-order low-pass
+      filter, rises above ``slope``. The detection is re-armed once the smoothed
+      derivative falls below ``slope / 2``.
+    - ``sustained``: the force stays above ``threshold - hysteresis`` for ``sustain``
+      seconds after a press.
+
+    The trigger of an event is sent as soon as the sample is processed. A single
+    trigger is sent per sample, for the first event in the order ``release``,
+    ``press``, ``onset`` and ``sustained``, and the triggers closer than ``delay`` to
+    the previous trigger are skipped, as they would overwrite the previous value on
+    the port. The skipped triggers are counted in :attr:`n_skipped`.
+
+    Parameters
+    ----------
+    trigger : BaseTrigger | None
+        The trigger object used to mark the events, e.g. a
+        :class:`byte_triggers.ParallelPortTrigger`. If None, the events are only
+        returned by :meth:`update`.
+    threshold : float
+        Force in N above which a grip is detected.
+    hysteresis : float
+        Force in N below the threshold at which the grip is released.
+    slope : float
+        Smoothed derivative of the force in N/s above which an onset is detected.
+    tau : float
+        Time constant in seconds of the low-pass filter smoothing the derivative.
+    sustain : float
+        Duration in seconds after which a grip is sustained.
+    triggers : dict | None
+        Trigger values of the events ``"press"``, ``"release"``, ``"onset"`` and
+        ``"sustained"``. If None, ``TRIGGERS`` is used.
+    delay : float
+        Minimum interval in seconds between 2 triggers, i.e. the duration of a
+        trigger on the port.
+    """
+
+    def __init__(
+        self,
+        trigger: Optional[BaseTrigger] = None,
+        *,
+        threshold: float = FORCE_THRESHOLD,
+        hysteresis: float = FORCE_HYSTERESIS,
+        slope: float = FORCE_SLOPE,
+        tau: float = FORCE_SLOPE_TAU,
+        sustain: float = FORCE_SUSTAIN,
+        triggers: Optional[dict[str, int]] = None,
+        delay: float = TRIGGER_DELAY,
+    ) -> None:
+        for value, name in (
+            (threshold, "threshold"),
+            (hysteresis, "hysteresis"),
+            (slope, "slope"),
+            (tau, "tau"),
+            (sustain, "sustain"),
+            (delay, "delay"),
+        ):
+            check_type(value, ("numeric",), name)
+        if hysteresis < 0 or delay < 0 or slope <= 0 or tau <= 0 or sustain <= 0:
+            raise ValueError(
+                "The hysteresis and the delay must be positive and the slope, the time "
+                "constant and the sustain duration strictly positive, got "
+                f"{hysteresis}, {delay}, {slope}, {tau} and {sustain}."
+            )
+        triggers = TRIGGERS if triggers is None else triggers
+        check_type(triggers, (dict,), "triggers")
+        missing = {"press", "release", "onset", "sustained"} - set(triggers)
+        if len(missing) != 0:
+            raise ValueError(
+                f"The trigger values of the events {sorted(missing)} are missing."
+            )
+        self._trigger = trigger
+        self._threshold_on = threshold
+        self._threshold_off = threshold - hysteresis
+        self._slope_on = slope
+        self._slope_off = slope / 2
+        self._tau = tau * 1e9  # nanoseconds
+        self._sustain = int(sustain * 1e9)  # nanoseconds
+        self._delay = int(delay * 1e9)  # nanoseconds
+        self._last_trigger = None
+        self._n_skipped = 0
+        # bitmask -> trigger value, by priority of the events
+        self._codes = tuple(
+            (event, triggers[name])
+            for event, name in (
+                (RELEASE, "release"),
+                (PRESS, "press"),
+                (ONSET, "onset"),
+                (SUSTAINED, "sustained"),
+            )
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset the state of the detector, e.g. after a gap in the stream."""
+        self._previous_time = None
+        self._previous_value = 0.0
+        self._slope = 0.0
+        self._pressed = False
+        self._armed = True
+        self._press_time = 0
+        self._sustained = False
+
+    def update(self, value: float, timestamp: Optional[int] = None) -> int:
+        """Process a sample.
+
+        Parameters
+        ----------
+        value : float
+            The force in N.
+        timestamp : int | None
+            Timestamp of the sample in nanoseconds, e.g. from
+            :func:`time.perf_counter_ns`. If None, the current time is used.
+
+        Returns
+        -------
+        events : int
+            Bitmask of the events detected on this sample, a combination of
+            ``PRESS``, ``RELEASE``, ``ONSET`` and ``SUSTAINED``, 0 if none.
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter_ns()
+        events = 0
+        # smoothed derivative, with a filter coefficient adapted to the interval
+        if self._previous_time is not None:
+            dt = timestamp - self._previous_time
+            if 0 < dt:
+                derivative = (value - self._previous_value) * 1e9 / dt
+                self._slope += dt / (self._tau + dt) * (derivative - self._slope)
+        self._previous_time = timestamp
+        self._previous_value = value
+        if self._armed and self._slope_on <= self._slope:
+            self._armed = False
+            events |= ONSET
+        elif not self._armed and self._slope < self._slope_off:
+            self._armed = True
+        # threshold with hysteresis and sustained grip
+        if not self._pressed and self._threshold_on <= value:
+            self._pressed = True
+            self._press_time = timestamp
+            self._sustained = False
+            events |= PRESS
+        elif self._pressed and value < self._threshold_off:
+            self._pressed = False
+            events |= RELEASE
+        elif (
+            self._pressed
+            and not self._sustained
+            and self._sustain <= timestamp - self._press_time
+        ):
+            self._sustained = True
+            events |= SUSTAINED
+        if events != 0 and self._trigger is not None:
+            if (
+                self._last_trigger is not None
+                and timestamp - self._last_trigger < self._delay
+            ):
+                self._n_skipped += 1
+            else:
+                # a single trigger per sample, the next one would overwrite it
+                for event, code in self._codes:
+                    if events & event:
+                        self._trigger.signal(code)
+                        break
+                self._last_trigger = timestamp
+        return events
+
+    @property
+    def pressed(self) -> bool:
+        """True if the force is above the threshold, with hysteresis."""
+        return self._pressed
+
+    @property
+    def n_skipped(self) -> int:
+        """Number of triggers skipped because they followed another too closely."""
+        return self._n_skipped
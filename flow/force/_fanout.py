@@ -0,0 +1,445 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlsplit
+
+import zmq
+
+from ..utils._checks import check_type, ensure_int
+from ..utils._imports import import_optional_dependency
+from ..utils.logs import logger
+
+if TYPE_CHECKING:
+    from typing import Optional, Union
+
+    _Value = Union[float, tuple[float, ...]]
+
+
+def _encode(value: _Value) -> bytes:
+    """Format a sample, or a tuple of values separated by commas, in ASCII."""
+    if isinstance(value, tuple):
+        return bytes(",".join(str(elt) for elt in value), encoding="ascii")
+    return bytes(str(value), encoding="ascii")
+
+
+class _Destination(ABC):
+    """Base class of a destination of the force samples.
+
+    Every destination owns a bounded queue and a sender task, thus a slow or
+    unreachable destination only fills its own queue, from which the oldest samples are
+    dropped.
+
+    Parameters
+    ----------
+    url : str
+        URL of the destination, whose query is ignored to connect.
+    decimation : int
+        Only every ``decimation``-th sample is sent.
+    rate : float | None
+        Maximum number of messages sent per second. When the destination is rate
+        limited, the most recent sample is sent and the older ones are skipped. If
+        None, the rate is not limited.
+    queue_size : int
+        Number of samples buffered for the destination.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        decimation: int = 1,
+        rate: Optional[float] = None,
+        queue_size: int = 1024,
+    ) -> None:
+        self._url = url
+        self._address = urlsplit(url)._replace(query="").geturl()
+        self._decimation = ensure_int(decimation, "decimation")
+        if self._decimation <= 0:
+            raise ValueError(
+                f"The decimation must be a positive integer, got {decimation}."
+            )
+        check_type(rate, ("numeric", None), "rate")
+        if rate is not None and rate <= 0:
+            raise ValueError(f"The rate must be positive, got {rate}.")
+        self._interval = None if rate is None else 1 / rate
+        self._queue = deque(maxlen=ensure_int(queue_size, "queue_size"))
+        self._event = None
+        self.n_sent = 0
+        self.n_dropped = 0  # overflow of the queue or failed sends
+        self.n_skipped = 0  # rate limit
+
+    def dispatch(self, batch: list[tuple[Optional[int], _Value]]) -> None:
+        """Queue the samples of a batch selected by the decimation, in the loop.
+
+        The samples without sequence number are markers, which are always queued.
+        """
+        queue = self._queue
+        for seq, value in batch:
+            if seq is None or seq % self._decimation == 0:
+                if len(queue) == queue.maxlen:
+                    self.n_dropped += 1
+                queue.append(value)
+        if len(queue) != 0:
+            self._event.set()
+
+    async def connect(self) -> None:
+        """Open the destination, in the loop."""
+        self._event = asyncio.Event()
+        await self.open()
+
+    async def run(self) -> None:
+        """Send the queued samples until cancelled, once the destination is open."""
+        loop = asyncio.get_running_loop()
+        try:
+            next_send = loop.time()
+            while True:
+                await self._event.wait()
+                self._event.clear()
+                if self._interval is not None:
+                    delay = next_send - loop.time()
+                    if 0 < delay:
+                        await asyncio.sleep(delay)
+                    # the samples queued during the sleep set the event again, while
+                    # they are sent below, thus the queue can be empty on the next pass
+                    if len(self._queue) == 0:
+                        continue
+                    # only the most recent sample is sent, see CONFLATE in ZMQ
+                    self.n_skipped += len(self._queue) - 1
+                    values = [self._queue.pop()]
+                    self._queue.clear()
+                    next_send = max(next_send + self._interval, loop.time())
+                else:
+                    values = list(self._queue)
+                    self._queue.clear()
+                for value in values:
+                    if await self.send(_encode(value)):
+                        self.n_sent += 1
+                    else:
+                        self.n_dropped += 1
+        finally:
+            await self.close()
+
+    @abstractmethod
+    async def open(self) -> None:
+        """Open the connection to the destination."""
+
+    @abstractmethod
+    async def send(self, message: bytes) -> bool:
+        """Send a message and return True if it was sent."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Close the connection to the destination."""
+
+    @property
+    def url(self) -> str:
+        """URL of the destination."""
+        return self._url
+
+
+class _UDPDestination(_Destination):
+    """Send the samples in UDP datagrams, e.g. ``udp://127.0.0.1:8055``."""
+
+    async def open(self) -> None:
+        """Open the connection to the destination."""
+        split = urlsplit(self._address)
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, remote_addr=(split.hostname, split.port)
+        )
+
+    async def send(self, message: bytes) -> bool:
+        """Send a message and return True if it was sent."""
+        # the transport never blocks, it buffers the datagrams if the socket is busy
+        self._transport.sendto(message)
+        return True
+
+    async def close(self) -> None:
+        """Close the connection to the destination."""
+        self._transport.close()
+
+
+class _ZMQDestination(_Destination):
+    """Publish the samples on a ZMQ ``PUB`` socket, e.g. ``zmq+tcp://*:5557``."""
+
+    async def open(self) -> None:
+        """Open the connection to the destination."""
+        self._context = zmq.Context()
+        self._socket = self._context.socket(zmq.PUB)
+        self._socket.setsockopt(zmq.LINGER, 0)
+        try:
+            self._socket.bind(self._address.removeprefix("zmq+"))
+        except zmq.ZMQError:
+            await self.close()
+            raise
+        logger.info("Publishing the force samples on %s.", self.endpoint)
+
+    async def send(self, message: bytes) -> bool:
+        """Send a message and return True if it was sent."""
+        try:
+            self._socket.send(message, zmq.NOBLOCK)
+        except zmq.Again:
+            return False
+        return True
+
+    async def close(self) -> None:
+        """Close the connection to the destination."""
+        self._socket.close()
+        self._context.term()
+
+    @property
+    def endpoint(self) -> str:
+        """Endpoint bound, with the port chosen by the system if the port is ``*``."""
+        return self._socket.last_endpoint.decode()
+
+
+class _WebSocketDestination(_Destination):
+    """Send the samples to a WebSocket server, e.g. ``ws://127.0.0.1:8765``.
+
+    The connection is established in the background and re-established with an
+    exponential backoff if it fails, while the samples are dropped.
+    """
+
+    _BACKOFF: tuple[float, float] = (0.1, 5.0)  # seconds, first and maximum delays
+
+    async def open(self) -> None:
+        """Open the connection to the destination."""
+        import_optional_dependency("websockets")
+        self._websocket = None
+        self._task = asyncio.create_task(self._connect())
+
+    async def _connect(self) -> None:
+        """Connect to the server, with an exponential backoff."""
+        from websockets.asyncio.client import connect
+        from websockets.exceptions import WebSocketException
+
+        delay = self._BACKOFF[0]
+        while self._websocket is None:
+            try:
+                self._websocket = await connect(self._address, close_timeout=1)
+            except (OSError, asyncio.TimeoutError, WebSocketException) as error:
+                logger.debug("Could not connect to %s: %s", self._address, error)
+                await asyncio.sleep(delay)
+                delay = min(2 * delay, self._BACKOFF[1])
+
+    async def send(self, message: bytes) -> bool:
+        """Send a message and return True if it was sent."""
+        from websockets.exceptions import ConnectionClosed
+
+        if self._websocket is None:
+            return False
+        try:
+            await self._websocket.send(message.decode())
+        except ConnectionClosed:
+            self._websocket = None
+            self._task = asyncio.create_task(self._connect())
+            return False
+        return True
+
+    async def close(self) -> None:
+        """Close the connection to the destination."""
+        self._task.cancel()
+        if self._websocket is not None:
+            await self._websocket.close()
+
+
+_SCHEMES: dict[str, type[_Destination]] = {
+    "udp": _UDPDestination,
+    "zmq+tcp": _ZMQDestination,
+    "zmq+ipc": _ZMQDestination,
+    "ws": _WebSocketDestination,
+    "wss": _WebSocketDestination,
+}
+
+
+def _parse_destination(url: str) -> _Destination:
+    """Create a destination from its URL.
+
+    The decimation and the rate limit are set in the query of the URL, e.g.
+    ``udp://127.0.0.1:8055?decimation=10&rate=50``.
+    """
+    check_type(url, (str,), "url")
+    split = urlsplit(url)
+    if split.scheme not in _SCHEMES:
+        raise ValueError(
+            f"The scheme of the destination '{url}' must be one of "
+            f"{', '.join(_SCHEMES)}."
+        )
+    query = {key: values[-1] for key, values in parse_qs(split.query).items()}
+    unknown = set(query) - {"decimation", "rate"}
+    if len(unknown) != 0:
+        raise ValueError(
+            f"The destination '{url}' has unknown parameters {', '.join(unknown)}, "
+            "only 'decimation' and 'rate' are supported."
+        )
+    if split.scheme == "udp" and (split.hostname is None or split.port is None):
+        raise ValueError(f"The destination '{url}' must define a host and a port.")
+    return _SCHEMES[split.scheme](
+        url,
+        decimation=int(query.get("decimation", 1)),
+        rate=float(query["rate"]) if "rate" in query else None,
+    )
+
+
+class ForceFanout:
+    """Send the force samples to several destinations concurrently.
+
+    The destinations are served by an asyncio event loop running in a background
+    thread. The samples pushed from the sensor thread are appended to a queue and
+    handed to the loop in batches, and every destination sends its share of the batch
+    from its own task, thus a slow or unreachable destination never delays the
+    others or the sensor thread. Every message contains a single sample, e.g. a force
+    in N, formatted as ASCII, or ``nan`` if the samples are stale, see
+    :meth:`push_stale`.
+
+    Parameters
+    ----------
+    destinations : list of str
+        URLs of the destinations, with the schemes ``udp`` (UDP datagrams),
+        ``zmq+tcp`` or ``zmq+ipc`` (ZMQ ``PUB`` socket bound on the address) and
+        ``ws`` or ``wss`` (WebSocket client, requires ``websockets``). The query of
+        the URL can set the decimation and the maximum number of messages per second,
+        e.g. ``udp://127.0.0.1:8055?decimation=10&rate=50``.
+    """
+
+    def __init__(self, destinations: list[str]) -> None:
+        check_type(destinations, (list, tuple), "destinations")
+        self._destinations = [_parse_destination(url) for url in destinations]
+        self._samples = deque()
+        self._scheduled = False
+        self._seq = 0
+        self._loop = None
+        self._thread = None
+        self._error = None
+
+    def start(self) -> None:
+        """Start the event loop and connect to the destinations."""
+        if self._thread is not None:
+            raise RuntimeError("The force fan-out is already started.")
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(started,), name="force-fanout", daemon=True
+        )
+        self._thread.start()
+        started.wait()
+        if self._error is not None:
+            self._thread.join()
+            self._thread = None
+            self._loop = None
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self, started: threading.Event) -> None:
+        """Run the event loop, in the background thread."""
+        asyncio.set_event_loop(self._loop)
+        results = self._loop.run_until_complete(
+            asyncio.gather(
+                *(destination.connect() for destination in self._destinations),
+                return_exceptions=True,
+            )
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        if len(errors) != 0:
+            for destination, result in zip(self._destinations, results):
+                if not isinstance(result, Exception):
+                    self._loop.run_until_complete(destination.close())
+            self._error = errors[0]
+            self._loop.close()
+            started.set()
+            return
+        self._tasks = [
+            self._loop.create_task(destination.run())
+            for destination in self._destinations
+        ]
+        started.set()
+        self._loop.run_forever()
+        # cancel the destinations and let them close their connections
+        for task in self._tasks:
+            task.cancel()
+        self._loop.run_until_complete(
+            asyncio.gather(*self._tasks, return_exceptions=True)
+        )
+        self._loop.close()
+
+    def stop(self) -> None:
+        """Send the pending samples, close the connections and stop the event loop.
+
+        The samples held back by a rate limit are not sent.
+        """
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._flush)
+        # the senders woken up by the flush run before the loop stops
+        self._loop.call_soon_threadsafe(self._loop.call_soon, self._loop.stop)
+        self._thread.join()
+        self._thread = None
+        self._loop = None
+
+    def push(self, value: Union[float, tuple[float, ...]]) -> None:
+        """Push a sample, from any thread.
+
+        Parameters
+        ----------
+        value : float | tuple of float
+            The force in N, or a tuple of values sent in a single message as
+            comma-separated ASCII values, e.g. the force features.
+        """
+        # appending to a deque is thread-safe, and the loop is woken up only if it
+        # is not already due to flush the queue
+        self._samples.append((self._seq, value))
+        self._seq += 1
+        if not self._scheduled:
+            self._scheduled = True
+            self._loop.call_soon_threadsafe(self._flush)
+
+    def push_stale(self) -> None:
+        """Push a NaN marker to every destination, from any thread.
+
+        The marker signals that the samples are stale, e.g. because the sensor is
+        detached. It is sent regardless of the decimation of the destinations and it
+        does not consume a sample in the numbering used by the decimation.
+        """
+        self._samples.append((None, math.nan))
+        if not self._scheduled:
+            self._scheduled = True
+            self._loop.call_soon_threadsafe(self._flush)
+
+    def _flush(self) -> None:
+        """Dispatch the pushed samples to the destinations, in the loop."""
+        self._scheduled = False
+        batch = []
+        while len(self._samples) != 0:
+            batch.append(self._samples.popleft())
+        if len(batch) == 0:
+            return
+        for destination in self._destinations:
+            destination.dispatch(batch)
+
+    @property
+    def n_samples(self) -> int:
+        """Number of samples pushed."""
+        return self._seq
+
+    @property
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Number of messages sent, dropped and skipped by the rate limit, by URL."""
+        return {
+            destination.url: {
+                "sent": destination.n_sent,
+                "dropped": destination.n_dropped,
+                "skipped": destination.n_skipped,
+            }
+            for destination in self._destinations
+        }
+
+    def __enter__(self) -> ForceFanout:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+from ..utils._checks import check_type, ensure_int
+from ._config import FEATURE_BANDS, FEATURE_WINDOW, SAMPLE_RATE
+
+if TYPE_CHECKING:
+    from typing import Optional
+
+
+class _Biquad:
+    """Band-pass biquad filter with a unit gain at its center frequency.
+
+    The coefficients follow the audio EQ cookbook of R. Bristow-Johnson, and the filter
+    is evaluated in the transposed direct form II.
+
+    Parameters
+    ----------
+    low : float
+        Lower edge of the band in Hz.
+    high : float
+        Upper edge of the band in Hz.
+    sample_rate : float
+        Sample rate of the signal in Hz.
+    """
+
+    def __init__(self, low: float, high: float, sample_rate: float) -> None:
+        center = math.sqrt(low * high)
+        w0 = 2 * math.pi * center / sample_rate
+        alpha = math.sin(w0) / (2 * center / (high - low))
+        a0 = 1 + alpha
+        self._b0 = alpha / a0
+        self._b2 = -alpha / a0
+        self._a1 = -2 * math.cos(w0) / a0
+        self._a2 = (1 - alpha) / a0
+        self._z1 = 0.0
+        self._z2 = 0.0
+
+    def update(self, x: float) -> float:
+        """Filter a sample."""
+        y = self._b0 * x + self._z1
+        self._z1 = -self._a1 * y + self._z2
+        self._z2 = self._b2 * x - self._a2 * y
+        return y
+
+
+class SlidingFeatures:
+    """Force variability features over a sliding window, updated sample by sample.
+
+    Every update costs a constant amount of work, independent of the window length:
+
+    - the mean and the variance are updated with Welford's algorithm, adding the new
+      sample and removing the sample leaving the window;
+    - the power in each band is the mean over the window of the square of the signal
+      filtered by a recursive band-pass filter, updated with a running sum. The sum is
+      recomputed once per window to bound the accumulation of rounding errors, which
+      amortizes to a constant cost per sample.
+
+    Parameters
+    ----------
+    window : float
+        Duration of the window in seconds.
+    sample_rate : float
+        Sample rate of the signal in Hz.
+    bands : dict | None
+        Frequency bands ``(low, high)`` in Hz in which the power is computed, by name.
+        If None, ``FEATURE_BANDS`` is used.
+    """
+
+    def __init__(
+        self,
+        window: float = FEATURE_WINDOW,
+        sample_rate: float = SAMPLE_RATE,
+        bands: Optional[dict[str, tuple[float, float]]] = None,
+    ) -> None:
+        check_type(window, ("numeric",), "window")
+        check_type(sample_rate, ("numeric",), "sample_rate")
+        bands = FEATURE_BANDS if bands is None else bands
+        check_type(bands, (dict,), "bands")
+        for name, (low, high) in bands.items():
+            if not 0 < low < high < sample_rate / 2:
+                raise ValueError(
+                    f"The band '{name}' ({low}, {high}) must be within (0, "
+                    f"{sample_rate / 2}) Hz."
+                )
+        self._size = ensure_int(round(window * sample_rate), "window")
+        if self._size < 2:
+            raise ValueError(
+                f"The window must contain at least 2 samples, got {self._size}."
+            )
+        self._names = tuple(bands)
+        self._filters = [
+            _Biquad(low, high, sample_rate) for low, high in bands.values()
+        ]
+        # circular buffers of the samples and of the squared filtered samples
+        self._values = [0.0] * self._size
+        self._squares = [[0.0] * self._size for _ in self._filters]
+        self._sums = [0.0] * len(self._filters)
+        self._idx = 0
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, value: float) -> None:
+        """Add a sample to the window.
+
+        Parameters
+        ----------
+        value : float
+            The force in N.
+        """
+        idx = self._idx
+        if self._n < self._size:
+            self._n += 1
+            delta = value - self._mean
+            self._mean += delta / self._n
+            self._m2 += delta * (value - self._mean)
+        else:
+            old = self._values[idx]
+            mean = self._mean + (value - old) / self._size
+            self._m2 += (value - old) * (value - mean + old - self._mean)
+            self._mean = mean
+        self._values[idx] = value
+        for k, biquad in enumerate(self._filters):
+            square = biquad.update(value) ** 2
+            squares = self._squares[k]
+            self._sums[k] += square - squares[idx]
+            squares[idx] = square
+        idx += 1
+        if idx == self._size:
+            idx = 0
+            for k, squares in enumerate(self._squares):
+                self._sums[k] = math.fsum(squares)
+        self._idx = idx
+
+    @property
+    def mean(self) -> float:
+        """Mean of the force over the window in N."""
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        """Unbiased variance of the force over the window in N²."""
+        if self._n < 2:
+            return 0.0
+        return max(self._m2, 0.0) / (self._n - 1)
+
+    @property
+    def cv(self) -> float:
+        """Coefficient of variation, the standard deviation divided by the mean."""
+        if self._mean == 0:
+            return math.nan
+        return math.sqrt(self.variance) / abs(self._mean)
+
+    @property
+    def power(self) -> dict[str, float]:
+        """Mean power of the force in each band over the window in N²."""
+        n = max(self._n, 1)
+        return {
+            name: max(total, 0.0) / n for name, total in zip(self._names, self._sums)
+        }
+
+    @property
+    def features(self) -> tuple[float, ...]:
+        """The mean, the variance, the coefficient of variation and the band powers."""
+        return (self.mean, self.variance, self.cv, *self.power.values())
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        """Names of the features, in the order of :attr:`features`."""
+        return ("mean", "variance", "cv", *self._names)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..oddball._time import BaseClock, Clock
+from ..utils._checks import check_type, ensure_path
+from ..utils.logs import logger
+from ._ring import SAMPLE_DTYPE
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+    from typing import Optional, Union
+
+
+def load_recording(fname: Union[str, Path]) -> np.ndarray:
+    """Load a force recording.
+
+    Parameters
+    ----------
+    fname : path-like
+        Path to the recording, either:
+
+        - a ``.npy`` file with the dtype ``SAMPLE_DTYPE``, e.g. the samples returned by
+          :meth:`~flow.force.ForceReader.read` saved with :func:`numpy.save`;
+        - a text file with 2 columns, the time in seconds and the force in N,
+          separated by commas or whitespaces.
+
+    Returns
+    -------
+    samples : array of shape (n_samples,)
+        The samples with the dtype ``SAMPLE_DTYPE``, with the timestamps in
+        nanoseconds.
+    """
+    fname = ensure_path(fname, must_exist=True)
+    if fname.suffix == ".npy":
+        samples = np.load(fname)
+        if samples.dtype != SAMPLE_DTYPE:
+            raise ValueError(
+                f"The recording '{fname.name}' must have the dtype {SAMPLE_DTYPE}, got "
+                f"{samples.dtype}."
+            )
+    else:
+        delimiter = "," if fname.suffix == ".csv" else None
+        data = np.loadtxt(fname, delimiter=delimiter, ndmin=2)
+        if data.shape[1] != 2:
+            raise ValueError(
+                f"The recording '{fname.name}' must have 2 columns, the time in "
+                f"seconds and the force in N, got {data.shape[1]} columns."
+            )
+        samples = np.empty(data.shape[0], dtype=SAMPLE_DTYPE)
+        samples["timestamp"] = np.round(data[:, 0] * 1e9)
+        samples["value"] = data[:, 1]
+    if samples.size == 0:
+        raise ValueError(f"The recording '{fname.name}' is empty.")
+    if np.any(np.diff(samples["timestamp"]) < 0):
+        raise ValueError(
+            f"The timestamps of the recording '{fname.name}' must be increasing."
+        )
+    return samples
+
+
+def replay(
+    samples: np.ndarray,
+    callback: Callable[[float], None],
+    speed: float = 1.0,
+    *,
+    clock: Optional[BaseClock] = None,
+) -> dict[str, float]:
+    """Replay a force recording with its original timing.
+
+    Parameters
+    ----------
+    samples : array of shape (n_samples,)
+        The samples with the dtype ``SAMPLE_DTYPE``, see :func:`load_recording`.
+    callback : callable
+        Function called with the force in N of every sample, at its scheduled time.
+    speed : float
+        Replay speed, e.g. ``1`` for real time or ``10`` for 10 times faster. If
+        ``0``, the samples are replayed as fast as possible.
+    clock : BaseClock | None
+        Clock used to pace the replay. If None, a :class:`~flow.oddball._time.Clock`
+        is used.
+
+    Returns
+    -------
+    stats : dict
+        The achieved throughput, with the keys:
+
+        - ``n_samples``: number of samples replayed;
+        - ``duration``: duration of the replay in seconds;
+        - ``rate``: number of samples replayed per second;
+        - ``speed``: achieved speed relative to the recording;
+        - ``max_lag``: maximum delay of a sample after its scheduled time, in seconds.
+
+    Notes
+    -----
+    The samples are scheduled on absolute deadlines with
+    :meth:`~flow.oddball._time.BaseClock.wait_until`, thus a late sample does not
+    delay the following ones. The replay can be interrupted with ``Ctrl+C``, in which
+    case the throughput of the samples replayed is returned.
+    """
+    check_type(samples, (np.ndarray,), "samples")
+    if samples.dtype != SAMPLE_DTYPE:
+        raise ValueError(
+            f"The samples must have the dtype {SAMPLE_DTYPE}, got {samples.dtype}."
+        )
+    check_type(speed, ("numeric",), "speed")
+    if speed < 0:
+        raise ValueError(f"The speed must be positive or 0, got {speed}.")
+    check_type(clock, (BaseClock, None), "clock")
+    clock = Clock() if clock is None else clock
+    values = samples["value"].tolist()
+    if speed == 0:
+        deadlines = None
+    else:
+        offsets = samples["timestamp"] - samples["timestamp"][0]
+        deadlines = np.round(offsets / speed).astype(np.int64).tolist()
+    max_lag = 0
+    n_samples = 0
+    start = clock.get_time_ns()
+    try:
+        for k, value in enumerate(values):
+            if deadlines is not None:
+                deadline = start + deadlines[k]
+                clock.wait_until(deadline)
+                max_lag = max(max_lag, clock.get_time_ns() - deadline)
+            callback(value)
+            n_samples += 1
+    except KeyboardInterrupt:
+        logger.info("Replay interrupted after %i samples.", n_samples)
+    duration = (clock.get_time_ns() - start) / 1e9
+    span = (
+        int(samples["timestamp"][n_samples - 1] - samples["timestamp"][0]) / 1e9
+        if 1 < n_samples
+        else 0.0
+    )
+    return {
+        "n_samples": n_samples,
+        "duration": duration,
+        "rate": n_samples / duration if duration != 0 else np.inf,
+        "speed": span / duration if duration != 0 else np.inf,
+        "max_lag": max_lag / 1e9,
+    }
@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..utils._checks import check_type, ensure_int
+from ..utils.logs import warn
+from ._config import SHM_CAPACITY, SHM_NAME
+
+if TYPE_CHECKING:
+    from typing import Optional, Union
+
+# little-endian: magic (8 bytes), version (uint32), record size in bytes (uint32),
+# capacity in records (uint64), padded to a cache line
+_HEADER = struct.Struct("<8sIIQ")
+_MAGIC: bytes = b"FLOWFRC\x00"
+_VERSION: int = 2
+_HEAD_OFFSET: int = 64  # bytes, number of samples written (uint64), own cache line
+_STATUS_OFFSET: int = 72  # bytes, status flags (uint64)
+_STALE: int = 1  # status flag set while the sensor does not deliver samples
+_N_STALE_OFFSET: int = 80  # bytes, number of times the samples became stale (uint64)
+_RECORDS_OFFSET: int = 128  # bytes
+_RECORD_DTYPE = np.dtype([("seq", "<u8"), ("timestamp", "<i8"), ("value", "<f8")])
+_RETRY_TIMEOUT: int = 20_000_000  # ns, to read a record while it is written
+SAMPLE_DTYPE = np.dtype([("timestamp", "<i8"), ("value", "<f8")])
+
+
+class ForceWriter:
+    """Write the force samples in a ring buffer in named shared memory.
+
+    The ring is written by a single process and can be read by any number of local
+    processes, in Python with :class:`ForceReader` or in any language able to map
+    named shared memory, e.g. ``MemoryMappedFile.OpenExisting`` in C#. On POSIX
+    systems, the block is the file ``/dev/shm/{name}``. The layout is::
+
+        offset  size          type     field
+        0       8             char[8]  magic      "FLOWFRC" and a null byte
+        8       4             uint32   version    2
+        12      4             uint32   size       size of a record in bytes, 24
+        16      8             uint64   capacity   number of records in the ring
+        64      8             uint64   head       number of samples written
+        72      8             uint64   status     bit 0 set if the samples are stale
+        80      8             uint64   n_stale    number of times bit 0 was set
+        128     24 * capacity record   records
+
+    with every record laid out as::
+
+        offset  size  type     field
+        0       8     uint64   seq        sequence number, see below
+        8       8     int64    timestamp  time.perf_counter_ns() of the writer
+        16      8     float64  value      force in N
+
+    All fields are little-endian. The sample ``n`` (counted from 0) is stored in the
+    record ``n % capacity``. Each record is protected by a sequence lock: the writer
+    sets ``seq`` to ``2n + 1`` before writing the sample and to ``2n + 2`` after, and
+    then sets ``head`` to ``n + 1``. A reader copies the records up to ``head`` and
+    keeps the sample ``n`` only if ``seq`` equals ``2n + 2`` both before and after
+    the copy, else the record was overwritten by a newer sample during the copy. The
+    timestamp is the value of the performance counter, ``QueryPerformanceCounter`` on
+    Windows and ``CLOCK_MONOTONIC`` on Linux, in nanoseconds. The bit 0 of ``status``
+    is set while the sensor does not deliver samples, e.g. when it is detached, and
+    the numbering of the samples continues when the sensor delivers samples again.
+
+    Parameters
+    ----------
+    name : str
+        Name of the shared memory block. A block with the same name left by a writer
+        which did not close is replaced.
+    capacity : int
+        Number of samples in the ring.
+
+    Notes
+    -----
+    The stores of the writer are issued in program order, which is sufficient on
+    x86-64 where stores are not reordered with other stores.
+    """
+
+    def __init__(self, name: str = SHM_NAME, capacity: int = SHM_CAPACITY) -> None:
+        check_type(name, (str,), "name")
+        capacity = ensure_int(capacity, "capacity")
+        if capacity <= 0:
+            raise ValueError(f"The capacity must be positive, got {capacity}.")
+        size = _RECORDS_OFFSET + capacity * _RECORD_DTYPE.itemsize
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            if os.name != "posix":  # the block is freed when its last handle is closed
+                raise
+            warn(f"Replacing the shared memory block '{name}' left by a previous run.")
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _HEADER.pack_into(
+            self._shm.buf, 0, _MAGIC, _VERSION, _RECORD_DTYPE.itemsize, capacity
+        )
+        self._head = np.ndarray(
+            (), dtype="<u8", buffer=self._shm.buf, offset=_HEAD_OFFSET
+        )
+        self._head[()] = 0
+        self._status = np.ndarray(
+            (), dtype="<u8", buffer=self._shm.buf, offset=_STATUS_OFFSET
+        )
+        self._status[()] = 0
+        self._n_stale = np.ndarray(
+            (), dtype="<u8", buffer=self._shm.buf, offset=_N_STALE_OFFSET
+        )
+        self._n_stale[()] = 0
+        records = np.ndarray(
+            (capacity,),
+            dtype=_RECORD_DTYPE,
+            buffer=self._shm.buf,
+            offset=_RECORDS_OFFSET,
+        )
+        records["seq"] = 0
+        self._seq = records["seq"]
+        self._timestamp = records["timestamp"]
+        self._value = records["value"]
+        self._capacity = capacity
+        self._n = 0
+
+    def write(self, value: float, timestamp: Optional[int] = None) -> None:
+        """Write a sample.
+
+        Parameters
+        ----------
+        value : float
+            The force in N.
+        timestamp : int | None
+            Timestamp of the sample from :func:`time.perf_counter_ns`. If None, the
+            current time is used.
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter_ns()
+        n = self._n
+        slot = n % self._capacity
+        self._seq[slot] = 2 * n + 1
+        self._timestamp[slot] = timestamp
+        self._value[slot] = value
+        self._seq[slot] = 2 * n + 2
+        self._n = n + 1
+        self._head[()] = n + 1
+
+    def close(self) -> None:
+        """Release and free the shared memory."""
+        del self._head
+        del self._status
+        del self._n_stale
+        del self._seq
+        del self._timestamp
+        del self._value
+        self._shm.close()
+        self._shm.unlink()
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        return self._shm.name
+
+    @property
+    def n_samples(self) -> int:
+        """Number of samples written."""
+        return self._n
+
+    @property
+    def stale(self) -> bool:
+        """Flag set while the sensor does not deliver samples."""
+        return bool(self._status[()] & _STALE)
+
+    @stale.setter
+    def stale(self, stale: bool) -> None:
+        check_type(stale, (bool,), "stale")
+        if stale and not self.stale:
+            self._n_stale[()] += 1
+        self._status[()] = _STALE if stale else 0
+
+    def __enter__(self) -> ForceWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class ForceReader:
+    """Read the force samples written by a :class:`ForceWriter` in another process.
+
+    The reader never blocks the writer. If the reader falls behind by more than the
+    capacity of the ring, the overwritten samples are skipped and counted in
+    :attr:`lost`.
+
+    Parameters
+    ----------
+    name : str
+        Name of the shared memory block.
+    """
+
+    def __init__(self, name: str = SHM_NAME) -> None:
+        check_type(name, (str,), "name")
+        self._buffer, self._shm = _map_readonly(name)
+        magic, version, size, capacity = _HEADER.unpack_from(self._buffer, 0)
+        if magic != _MAGIC or version != _VERSION or size != _RECORD_DTYPE.itemsize:
+            self._close_buffer()
+            raise ValueError(
+                f"The shared memory block '{name}' is not a force ring of version "
+                f"{_VERSION}."
+            )
+        self._head = np.ndarray(
+            (), dtype="<u8", buffer=self._buffer, offset=_HEAD_OFFSET
+        )
+        self._status = np.ndarray(
+            (), dtype="<u8", buffer=self._buffer, offset=_STATUS_OFFSET
+        )
+        self._n_stale = np.ndarray(
+            (), dtype="<u8", buffer=self._buffer, offset=_N_STALE_OFFSET
+        )
+        self._records = np.ndarray(
+            (capacity,),
+            dtype=_RECORD_DTYPE,
+            buffer=self._buffer,
+            offset=_RECORDS_OFFSET,
+        )
+        self._capacity = capacity
+        self._next = int(self._head[()])  # next sample to read
+        self._lost = 0
+
+    def read(self) -> np.ndarray:
+        """Read the samples written since the last read.
+
+        Returns
+        -------
+        samples : array of shape (n_samples,)
+            The samples with the dtype ``SAMPLE_DTYPE``, with the fields
+            ``timestamp`` and ``value``, in order. The first read returns the samples
+            written since the reader was created.
+        """
+        head = int(self._head[()])
+        start = max(self._next, head - self._capacity)
+        idx = np.arange(start, head, dtype=np.uint64)
+        slots = idx % np.uint64(self._capacity)
+        records = self._records[slots]  # fancy indexing copies the records
+        expected = 2 * idx + 2
+        valid = (records["seq"] == expected) & (self._records["seq"][slots] == expected)
+        # only the oldest records can be overwritten during the copy
+        n_valid = int(valid.sum())
+        self._lost += start - self._next + idx.size - n_valid
+        self._next = head
+        samples = np.empty(n_valid, dtype=SAMPLE_DTYPE)
+        samples["timestamp"] = records["timestamp"][valid]
+        samples["value"] = records["value"][valid]
+        return samples
+
+    def latest(self) -> Optional[tuple[int, float]]:
+        """Get the most recent sample without consuming the samples.
+
+        Returns
+        -------
+        sample : tuple | None
+            The ``(timestamp, value)`` of the most recent sample, or None if no
+            sample was written yet.
+
+        Notes
+        -----
+        The read is retried while the record is overwritten by the writer, yielding
+        the GIL between the attempts, for at most 20 ms, after which a RuntimeError is
+        raised, e.g. if the writer died while writing the record. A writer thread
+        suspended between its 2 stores of ``seq``, e.g. by a switch of the GIL which
+        happens every 5 ms, is thus not mistaken for a dead writer.
+        """
+        deadline = None
+        while True:
+            head = int(self._head[()])
+            if head == 0:
+                return None
+            record = self._records[(head - 1) % self._capacity].copy()
+            if int(record["seq"]) == 2 * head:
+                return int(record["timestamp"]), float(record["value"])
+            if deadline is None:
+                deadline = time.perf_counter_ns() + _RETRY_TIMEOUT
+            elif deadline < time.perf_counter_ns():
+                raise RuntimeError(
+                    "The most recent sample could not be read within "
+                    f"{_RETRY_TIMEOUT / 1e6:.0f} ms, the writer might have stopped "
+                    "while writing it."
+                )
+            time.sleep(0)
+
+    def close(self) -> None:
+        """Release the shared memory."""
+        del self._head
+        del self._status
+        del self._n_stale
+        del self._records
+        self._close_buffer()
+
+    def _close_buffer(self) -> None:
+        """Release the mapping of the shared memory."""
+        if self._shm is None:
+            self._buffer.close()
+        else:
+            self._buffer.release()
+            self._shm.close()
+
+    @property
+    def n_samples(self) -> int:
+        """Number of samples written in the ring, read or not."""
+        return int(self._head[()])
+
+    @property
+    def stale(self) -> bool:
+        """Flag set by the writer while the sensor does not deliver samples."""
+        return bool(self._status[()] & _STALE)
+
+    @property
+    def n_stale(self) -> int:
+        """Number of times the writer flagged the samples as stale."""
+        return int(self._n_stale[()])
+
+    @property
+    def lost(self) -> int:
+        """Number of samples overwritten before they could be read."""
+        return self._lost
+
+    def __enter__(self) -> ForceReader:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def _map_readonly(
+    name: str,
+) -> tuple[Union[mmap.mmap, memoryview], Optional[shared_memory.SharedMemory]]:
+    """Map an existing shared memory block in read-only mode.
+
+    On Linux, the block is the file ``/dev/shm/{name}``, mapped in read-only mode. On
+    other POSIX systems, e.g. macOS, the block is attached with
+    :class:`multiprocessing.shared_memory.SharedMemory`, which is also returned to be
+    closed after the buffer, and unregistered from its resource tracker, which would
+    otherwise free the block when the reading process exits, before python 3.13.
+    """
+    if os.name != "posix":
+        buffer = mmap.mmap(-1, _block_size(name), tagname=name, access=mmap.ACCESS_READ)
+        return buffer, None
+    if os.path.isdir("/dev/shm"):
+        fd = os.open(os.path.join("/dev/shm", name), os.O_RDONLY)
+        try:
+            return mmap.mmap(fd, os.fstat(fd).st_size, access=mmap.ACCESS_READ), None
+        finally:
+            os.close(fd)
+    if sys.version_info >= (3, 13):
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(f"/{name}", "shared_memory")
+    return shm.buf.toreadonly(), shm
+
+
+def _block_size(name: str) -> int:
+    """Read the size of a named shared memory block from its header, on Windows."""
+    with mmap.mmap(-1, _HEADER.size, tagname=name, access=mmap.ACCESS_READ) as buf:
+        _, _, size, capacity = _HEADER.unpack_from(buf, 0)
+    return _RECORDS_OFFSET + capacity * size
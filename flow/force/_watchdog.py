@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import time
+from threading import Event, Thread
+from typing import TYPE_CHECKING
+
+from ..utils._checks import check_type
+from ..utils.logs import logger
+from ._config import SAMPLE_RATE, WATCHDOG_BACKOFF, WATCHDOG_REATTACH, WATCHDOG_STALE
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import Any, Optional
+
+
+class SensorWatchdog:
+    """Monitor the samples delivered by a sensor and reattach it when it stalls.
+
+    The sensor callback only calls :meth:`feed`, which records the arrival time of the
+    sample. A background thread compares the time elapsed since the last arrival with
+    the data interval of the sensor, i.e. ``1 / sample_rate``, and flags the samples
+    as stale after ``stale`` data intervals without sample, then reattaches the sensor
+    after ``reattach`` seconds without sample, retrying with an exponential backoff
+    until it succeeds. The samples recover only once the sensor delivers a sample
+    after the stall, thus a reattached sensor which never delivers samples stays stale.
+    The consumers of the samples are notified through ``on_stale`` and
+    ``on_recover``, and keep their own numbering of the samples, which thus continues
+    across reattachments.
+
+    Parameters
+    ----------
+    attach : callable
+        Function called without argument which opens the sensor, registers the
+        callback calling :meth:`feed` and returns a handle on the sensor. It should
+        raise an exception if the sensor can not be opened.
+    detach : callable
+        Function called with the handle returned by ``attach`` which closes the sensor.
+    sample_rate : float
+        Rate at which the sensor delivers samples, in Hz.
+    stale : int
+        Number of data intervals without sample before the samples are stale.
+    reattach : float
+        Duration in seconds without sample before the sensor is reattached.
+    backoff : tuple of shape (2,)
+        First and maximum delays in seconds between 2 attempts to reattach the sensor.
+    on_stale : callable | None
+        Function called without argument, from the background thread, when the samples
+        become stale.
+    on_recover : callable | None
+        Function called without argument, from the background thread, when the sensor
+        delivers samples again.
+    """
+
+    def __init__(
+        self,
+        attach: Callable[[], Any],
+        detach: Callable[[Any], None],
+        sample_rate: float = SAMPLE_RATE,
+        *,
+        stale: int = WATCHDOG_STALE,
+        reattach: float = WATCHDOG_REATTACH,
+        backoff: tuple[float, float] = WATCHDOG_BACKOFF,
+        on_stale: Optional[Callable[[], None]] = None,
+        on_recover: Optional[Callable[[], None]] = None,
+    ) -> None:
+        check_type(sample_rate, ("numeric",), "sample_rate")
+        check_type(stale, ("int-like",), "stale")
+        check_type(reattach, ("numeric",), "reattach")
+        check_type(backoff, (tuple,), "backoff")
+        if sample_rate <= 0 or stale <= 0 or reattach <= 0:
+            raise ValueError(
+                "The sample rate, the stale and the reattach delays must be positive."
+            )
+        if reattach <= stale / sample_rate:
+            raise ValueError(
+                f"The reattach delay ({reattach} s) must be longer than the stale "
+                f"delay ({stale / sample_rate} s)."
+            )
+        self._attach = attach
+        self._detach = detach
+        self._stale_ns = int(stale / sample_rate * 1e9)
+        self._reattach_ns = int(reattach * 1e9)
+        # poll twice per stale delay, thus a stall is flagged within 1.5 stale delays
+        self._period = stale / sample_rate / 2
+        self._backoff = backoff
+        self._on_stale = on_stale
+        self._on_recover = on_recover
+        self._handle = None
+        self._n_samples = 0
+        self._last_sample = 0  # arrival time of the last sample in nanoseconds
+        self._last_attach = 0  # time of the last (re)attachment in nanoseconds
+        self._n_reattach = 0
+        self._stale = False
+        self._stopping = Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Attach the sensor and start monitoring its samples.
+
+        The exception raised if the sensor can not be attached is propagated.
+        """
+        if self._thread is not None:
+            raise RuntimeError("The sensor watchdog is already started.")
+        self._last_sample = self._last_attach = time.perf_counter_ns()
+        self._handle = self._attach()
+        self._stopping.clear()
+        self._thread = Thread(target=self._run, name="sensor-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop monitoring the samples and detach the sensor."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+        if self._handle is not None:
+            self._detach(self._handle)
+            self._handle = None
+
+    def feed(self) -> None:
+        """Signal that the sensor delivered a sample, from the sensor callback."""
+        self._last_sample = time.perf_counter_ns()
+        self._n_samples += 1
+
+    def _run(self) -> None:
+        """Monitor the time elapsed since the last sample until stopped."""
+        n_stall = 0  # number of samples delivered when the samples became stale
+        while not self._stopping.wait(self._period):
+            now = time.perf_counter_ns()
+            elapsed = now - self._last_sample
+            if self._stale:
+                # only a sample delivered since the stall recovers the stream, not
+                # the grace period given to a reattached sensor
+                if self._n_samples != n_stall and elapsed <= self._stale_ns:
+                    # the consumers are notified before the flag changes
+                    logger.info("The sensor delivers samples again.")
+                    if self._on_recover is not None:
+                        self._on_recover()
+                    self._stale = False
+                    continue
+            elif elapsed <= self._stale_ns:
+                continue
+            else:
+                logger.warning(
+                    "The sensor did not deliver samples for %.1f ms.", elapsed / 1e6
+                )
+                n_stall = self._n_samples
+                if self._on_stale is not None:
+                    self._on_stale()
+                self._stale = True
+            # give a reattached sensor the full delay to deliver samples
+            if self._reattach_ns < now - max(self._last_sample, self._last_attach):
+                self._reattach_sensor()
+                self._last_attach = time.perf_counter_ns()
+
+    def _reattach_sensor(self) -> None:
+        """Reattach the sensor, with an exponential backoff."""
+        if self._handle is not None:
+            try:
+                self._detach(self._handle)
+            except Exception as error:
+                logger.debug("Could not detach the sensor: %s", error)
+            self._handle = None
+        delay = self._backoff[0]
+        while not self._stopping.is_set():
+            try:
+                self._handle = self._attach()
+            except Exception as error:
+                logger.warning(
+                    "Could not reattach the sensor, retrying in %.1f s: %s",
+                    delay,
+                    error,
+                )
+                self._stopping.wait(delay)
+                delay = min(2 * delay, self._backoff[1])
+            else:
+                self._n_reattach += 1
+                logger.info("Reattached the sensor (%i).", self._n_reattach)
+                return
+
+    @property
+    def stale(self) -> bool:
+        """Flag set while the sensor does not deliver samples."""
+        return self._stale
+
+    @property
+    def n_samples(self) -> int:
+        """Number of samples delivered by the sensor, across reattachments."""
+        return self._n_samples
+
+    @property
+    def n_reattach(self) -> int:
+        """Number of times the sensor was reattached."""
+        return self._n_reattach
+
+    def __enter__(self) -> SensorWatchdog:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from byte_triggers import MockTrigger
+
+from flow.force import ONSET, PRESS, RELEASE, SUSTAINED, ForceEventDetector
+
+
+class _RecordingTrigger(MockTrigger):
+    """Mock trigger which records the values sent."""
+
+    def __init__(self) -> None:
+        self.values = list()
+
+    def signal(self, value: int) -> None:
+        """Send a trigger value."""
+        super().signal(value)
+        self.values.append(value)
+
+
+def _run(detector, signal, sample_rate=1000):
+    """Process a signal sampled at a fixed rate and return the events per sample."""
+    timestamps = np.arange(signal.size) * int(1e9 / sample_rate)
+    return np.array(
+        [detector.update(value, int(t)) for value, t in zip(signal, timestamps)]
+    )
+
+
+def test_detector_threshold():
+    """Test the threshold with hysteresis and the sustained grip."""
+    trigger = _RecordingTrigger()
+    detector = ForceEventDetector(
+        trigger,
+        threshold=5,
+        hysteresis=1,
+        slope=1e6,  # disable the onsets
+        sustain=0.5,
+        triggers={"press": 1, "release": 2, "onset": 3, "sustained": 4},
+    )
+    # press at 100 ms, noise around the threshold, release at 1 s, short press
+    signal = np.zeros(1500)
+    signal[100:1000] = 6
+    signal[200:300:2] = 4.5  # within the hysteresis, not released
+    signal[1200:1300] = 5.5
+    events = _run(detector, signal)
+    assert np.flatnonzero(events & PRESS).tolist() == [100, 1200]
+    assert np.flatnonzero(events & RELEASE).tolist() == [1000, 1300]
+    assert np.flatnonzero(events & SUSTAINED).tolist() == [600]
+    assert not np.any(events & ONSET)
+    assert trigger.values == [1, 4, 2, 1, 2]
+    assert not detector.pressed
+
+
+def test_detector_onset():
+    """Test the detection of the onsets on the smoothed derivative."""
+    detector = ForceEventDetector(slope=50, tau=0.01, threshold=1e6, sustain=10)
+    # 2 ramps of 100 N/s separated by a plateau, and a slow drift of 10 N/s
+    t = np.arange(3000) / 1000
+    signal = np.interp(t, [0, 0.5, 1, 1.5, 2, 3], [0, 0, 50, 50, 100, 110])
+    events = _run(detector, signal)
+    onsets = np.flatnonzero(events & ONSET)
+    assert len(onsets) == 2
+    # the smoothed derivative reaches half of the slope after tau * ln(2)
+    np.testing.assert_allclose(onsets, [507, 1507], atol=2)
+    assert not np.any(events & (PRESS | RELEASE | SUSTAINED))
+
+
+def test_detector_single_trigger():
+    """Test that the events on the same or on close samples send a single trigger."""
+    trigger = _RecordingTrigger()
+    detector = ForceEventDetector(
+        trigger,
+        threshold=5,
+        hysteresis=1,
+        slope=50,
+        sustain=10,
+        triggers={"press": 1, "release": 2, "onset": 3, "sustained": 4},
+        delay=0.01,
+    )
+    # a step detected as an onset and a press on the same sample, released after 5 ms
+    # and pressed again after 50 ms
+    signal = np.zeros(200)
+    signal[100:105] = 10
+    signal[150:] = 10
+    events = _run(detector, signal)
+    assert events[100] == PRESS | ONSET
+    assert events[105] == RELEASE
+    assert events[150] & PRESS
+    assert trigger.values == [1, 1]
+    assert detector.n_skipped == 1
+
+
+def test_detector_invalid():
+    """Test invalid arguments."""
+    with pytest.raises(ValueError, match="must be positive"):
+        ForceEventDetector(hysteresis=-1)
+    with pytest.raises(ValueError, match="are missing"):
+        ForceEventDetector(triggers={"press": 1})
@@ -0,0 +1,164 @@
+import math
+import socket
+import time
+
+import pytest
+import zmq
+
+from flow.force import ForceFanout
+from flow.force._fanout import _parse_destination
+
+
+def _wait_for(condition, timeout=5):
+    """Wait until a condition is met."""
+    start = time.monotonic()
+    while not condition():
+        assert time.monotonic() - start < timeout
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def receiver():
+    """Create a UDP socket bound on a free local port."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(5)
+    yield sock
+    sock.close()
+
+
+def _receive(sock, n_messages):
+    """Receive messages from a UDP socket."""
+    return [float(sock.recv(64)) for _ in range(n_messages)]
+
+
+def test_parse_destination():
+    """Test the parsing of the destination URLs."""
+    destination = _parse_destination("udp://127.0.0.1:8055?decimation=10&rate=50")
+    assert destination._address == "udp://127.0.0.1:8055"
+    assert destination._decimation == 10
+    assert destination._interval == pytest.approx(0.02)
+    with pytest.raises(ValueError, match="scheme"):
+        _parse_destination("http://127.0.0.1:8055")
+    with pytest.raises(ValueError, match="unknown parameters"):
+        _parse_destination("udp://127.0.0.1:8055?latency=1")
+    with pytest.raises(ValueError, match="host and a port"):
+        _parse_destination("udp://127.0.0.1")
+    with pytest.raises(ValueError, match="decimation must be a positive"):
+        _parse_destination("udp://127.0.0.1:8055?decimation=0")
+
+
+def test_fanout_udp(receiver):
+    """Test the decimation to several UDP destinations."""
+    address = f"udp://127.0.0.1:{receiver.getsockname()[1]}"
+    with ForceFanout([address, f"{address}?decimation=10"]) as fanout:
+        for k in range(100):
+            fanout.push(float(k))
+        _wait_for(lambda: sum(stat["sent"] for stat in fanout.stats.values()) == 110)
+    values = _receive(receiver, 110)
+    assert sorted(values) == sorted([*range(100), *range(0, 100, 10)])
+    assert fanout.stats[address] == {"sent": 100, "dropped": 0, "skipped": 0}
+    assert fanout.n_samples == 100
+
+
+def test_fanout_stale(receiver):
+    """Test that the stale marker bypasses the decimation."""
+    address = f"udp://127.0.0.1:{receiver.getsockname()[1]}?decimation=10"
+    with ForceFanout([address]) as fanout:
+        for k in range(15):
+            fanout.push(float(k))
+        fanout.push_stale()
+        for k in range(15, 25):
+            fanout.push(float(k))
+        _wait_for(lambda: fanout.stats[address]["sent"] == 4)
+    values = _receive(receiver, 4)
+    assert values[:2] == [0, 10]
+    assert math.isnan(values[2])
+    assert values[3] == 20
+
+
+def test_fanout_rate_limit(receiver):
+    """Test that a rate limited destination sends the most recent sample."""
+    address = f"udp://127.0.0.1:{receiver.getsockname()[1]}?rate=5"
+    with ForceFanout([address]) as fanout:
+        for k in range(50):
+            fanout.push(float(k))
+        time.sleep(0.3)
+        fanout.push(50.0)
+        _wait_for(
+            lambda: sum(fanout.stats[address][key] for key in ("sent", "skipped")) == 51
+        )
+    stats = fanout.stats[address]
+    # at 5 messages per second, at most 3 messages are sent in ~0.4 seconds
+    assert stats["sent"] <= 3
+    values = _receive(receiver, stats["sent"])
+    assert values[-1] == 50
+
+
+def test_fanout_rate_limit_burst(receiver):
+    """Test that a rate limited destination survives the end of a burst."""
+    address = f"udp://127.0.0.1:{receiver.getsockname()[1]}?rate=10"
+    with ForceFanout([address]) as fanout:
+        # the samples arriving during the rate limit sleep set the event again
+        for k in range(3):
+            fanout.push(float(k))
+            time.sleep(0.01)
+        time.sleep(0.3)
+        assert not any(task.done() for task in fanout._tasks)
+        fanout.push(3.0)
+        _wait_for(
+            lambda: sum(fanout.stats[address][key] for key in ("sent", "skipped")) == 4
+        )
+    assert _receive(receiver, fanout.stats[address]["sent"])[-1] == 3
+
+
+def test_fanout_zmq():
+    """Test the publication on a ZMQ PUB socket."""
+    context = zmq.Context()
+    sub = context.socket(zmq.SUB)
+    sub.setsockopt(zmq.SUBSCRIBE, b"")
+    sub.setsockopt(zmq.LINGER, 0)
+    try:
+        # the port is chosen by the system and read back from the destination
+        with ForceFanout(["zmq+tcp://127.0.0.1:*"]) as fanout:
+            sub.connect(fanout._destinations[0].endpoint)
+            # wait for the subscription to propagate, i.e. the slow joiner
+            deadline = time.monotonic() + 5
+            while not sub.poll(10):
+                assert time.monotonic() < deadline
+                fanout.push(-1.0)
+            while sub.poll(100):
+                sub.recv()
+            fanout.push(42.0)
+            assert sub.poll(5000)
+            assert float(sub.recv()) == 42
+            fanout.push((1.0, 2.5))
+            assert sub.poll(5000)
+            assert sub.recv() == b"1.0,2.5"
+    finally:
+        sub.close()
+        context.term()
+
+
+def test_fanout_unreachable_websocket(receiver):
+    """Test that an unreachable destination does not delay the others."""
+    pytest.importorskip("websockets")
+    with socket.socket() as sock:  # find a port on which nothing listens
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    address = f"udp://127.0.0.1:{receiver.getsockname()[1]}"
+    with ForceFanout([f"ws://127.0.0.1:{port}", address]) as fanout:
+        start = time.perf_counter()
+        for k in range(200):
+            fanout.push(float(k))
+        assert time.perf_counter() - start < 0.5
+        _wait_for(lambda: fanout.stats[address]["sent"] == 200)
+    assert _receive(receiver, 200) == list(range(200))
+    assert fanout.stats[f"ws://127.0.0.1:{port}"]["sent"] == 0
+
+
+def test_fanout_invalid_destination():
+    """Test that a destination which can not be opened raises on start."""
+    fanout = ForceFanout(["zmq+tcp://256.0.0.1:1"])
+    with pytest.raises(zmq.ZMQError):
+        fanout.start()
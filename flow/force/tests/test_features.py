@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from flow.force import SlidingFeatures
+
+
+def test_sliding_features():
+    """Test the mean, the variance and the coefficient of variation."""
+    rng = np.random.default_rng(0)
+    signal = 20 + rng.standard_normal(5500)
+    features = SlidingFeatures(window=1, sample_rate=1000, bands={})
+    assert features.names == ("mean", "variance", "cv")
+    for k, value in enumerate(signal):
+        features.update(value)
+        if k in (0, 499, 999, 1234, 5499):
+            window = signal[max(k - 999, 0) : k + 1]
+            assert features.mean == pytest.approx(window.mean(), rel=1e-9)
+            if 1 < window.size:
+                assert features.variance == pytest.approx(window.var(ddof=1), rel=1e-6)
+                cv = window.std(ddof=1) / window.mean()
+                assert features.cv == pytest.approx(cv, rel=1e-6)
+    assert len(features.features) == 3
+
+
+def test_sliding_features_band_power():
+    """Test the power in a band of a sine wave."""
+    t = np.arange(3000) / 1000
+    features = SlidingFeatures(
+        window=1, sample_rate=1000, bands={"slow": (0.5, 3.0), "tremor": (8, 12)}
+    )
+    for value in 5 + 2 * np.sin(2 * np.pi * 10 * t):
+        features.update(value)
+    power = features.power
+    # the power of a sine of amplitude 2 is 2, attenuated by the second-order filters
+    # outside of their band, while the offset is rejected by both bands
+    assert power["tremor"] == pytest.approx(2, rel=0.05)
+    assert power["slow"] < 0.1 * power["tremor"]
+    assert features.names == ("mean", "variance", "cv", "slow", "tremor")
+    assert features.features[3:] == tuple(power.values())
+
+
+def test_sliding_features_invalid():
+    """Test invalid arguments."""
+    with pytest.raises(ValueError, match="must be within"):
+        SlidingFeatures(sample_rate=100, bands={"high": (40, 60)})
+    with pytest.raises(ValueError, match="at least 2 samples"):
+        SlidingFeatures(window=0.001, sample_rate=1000)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from flow.force import SAMPLE_DTYPE, load_recording, replay
+from flow.oddball._time import Clock, VirtualClock
+
+
+def _recording(n_samples=1000, sample_rate=1000):
+    """Create a recording sampled at a fixed rate."""
+    samples = np.empty(n_samples, dtype=SAMPLE_DTYPE)
+    samples["timestamp"] = 12345 + np.arange(n_samples) * int(1e9 / sample_rate)
+    samples["value"] = np.sin(np.arange(n_samples) / 10)
+    return samples
+
+
+def test_load_recording(tmp_path):
+    """Test loading recordings in binary and text formats."""
+    samples = _recording(100)
+    np.save(tmp_path / "force.npy", samples)
+    loaded = load_recording(tmp_path / "force.npy")
+    assert loaded.dtype == SAMPLE_DTYPE
+    assert np.array_equal(loaded, samples)
+    data = np.c_[samples["timestamp"] / 1e9, samples["value"]]
+    np.savetxt(tmp_path / "force.csv", data, delimiter=",", fmt="%.9f")
+    np.savetxt(tmp_path / "force.txt", data, fmt="%.9f")
+    for fname in ("force.csv", "force.txt"):
+        loaded = load_recording(tmp_path / fname)
+        assert np.array_equal(loaded["timestamp"], samples["timestamp"])
+        assert np.allclose(loaded["value"], samples["value"], atol=1e-9)
+    np.savetxt(tmp_path / "invalid.txt", np.zeros((10, 3)))
+    with pytest.raises(ValueError, match="must have 2 columns"):
+        load_recording(tmp_path / "invalid.txt")
+    np.savetxt(tmp_path / "invalid.txt", data[::-1])
+    with pytest.raises(ValueError, match="must be increasing"):
+        load_recording(tmp_path / "invalid.txt")
+    np.save(tmp_path / "invalid.npy", np.zeros(10))
+    with pytest.raises(ValueError, match="must have the dtype"):
+        load_recording(tmp_path / "invalid.npy")
+
+
+@pytest.mark.parametrize("speed", [1, 2.5, 10])
+def test_replay(speed):
+    """Test the pacing of a replay on a virtual clock."""
+    samples = _recording()
+    clock = VirtualClock()
+    times = list()
+    values = list()
+
+    def callback(value):
+        times.append(clock.get_time_ns())
+        values.append(value)
+
+    stats = replay(samples, callback, speed, clock=clock)
+    offsets = (samples["timestamp"] - samples["timestamp"][0]) / speed
+    assert np.allclose(times, offsets, atol=1)
+    assert np.array_equal(values, samples["value"])
+    assert stats["n_samples"] == samples.size
+    assert stats["speed"] == pytest.approx(speed)
+    assert stats["rate"] == pytest.approx(samples.size / stats["duration"])
+    assert stats["max_lag"] == 0
+
+
+def test_replay_as_fast_as_possible():
+    """Test a replay which does not wait between samples."""
+    samples = _recording(5000)
+    values = list()
+    stats = replay(samples, values.append, 0, clock=Clock())
+    assert np.array_equal(values, samples["value"])
+    assert stats["n_samples"] == samples.size
+    assert 1 < stats["speed"]
+    with pytest.raises(ValueError, match="must be positive"):
+        replay(samples, values.append, -1)
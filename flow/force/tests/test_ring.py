@@ -0,0 +1,134 @@
+import subprocess
+import sys
+import threading
+import uuid
+
+import numpy as np
+import pytest
+
+from flow.force import SAMPLE_DTYPE, ForceReader, ForceWriter
+
+_WRITER = """
+import sys
+from flow.force import ForceWriter
+
+with ForceWriter(sys.argv[1], capacity=64) as writer:
+    for k in range(100):
+        writer.write(float(k), timestamp=k)
+    print("written", flush=True)
+    sys.stdin.readline()
+"""
+
+
+@pytest.fixture
+def name():
+    """Return a unique name of shared memory block."""
+    return f"flow-test-{uuid.uuid4().hex[:8]}"
+
+
+def test_force_ring(name):
+    """Test writing and reading the ring in the same process."""
+    with ForceWriter(name, capacity=8) as writer:
+        with ForceReader(name) as reader:
+            assert reader.latest() is None
+            assert reader.read().size == 0
+            for k in range(5):
+                writer.write(k * 1.5, timestamp=k)
+            assert reader.latest() == (4, 6.0)
+            samples = reader.read()
+            assert samples.dtype == SAMPLE_DTYPE
+            np.testing.assert_array_equal(samples["timestamp"], np.arange(5))
+            np.testing.assert_array_equal(samples["value"], np.arange(5) * 1.5)
+            assert reader.read().size == 0
+            # wrap around the end of the ring and overrun the reader
+            for k in range(5, 25):
+                writer.write(k * 1.5, timestamp=k)
+            samples = reader.read()
+            np.testing.assert_array_equal(samples["timestamp"], np.arange(17, 25))
+            assert reader.lost == 12
+            assert writer.n_samples == 25
+            # the stale flag does not interrupt the numbering of the samples
+            assert not reader.stale
+            assert reader.n_stale == 0
+            writer.stale = True
+            writer.stale = True  # counted once per stale period
+            assert reader.stale
+            assert writer.stale
+            writer.write(37.5, timestamp=25)
+            writer.stale = False
+            assert not reader.stale
+            assert reader.n_stale == 1
+            assert reader.read()["timestamp"].tolist() == [25]
+            assert reader.n_samples == writer.n_samples == 26
+        writer.write(0.0)  # the reader does not hold the block
+
+
+def test_force_reader_latest_torn(name):
+    """Test reading the latest sample of a writer stopped while writing it."""
+    with ForceWriter(name, capacity=1) as writer, ForceReader(name) as reader:
+        writer.write(1.0, timestamp=0)
+        assert reader.latest() == (0, 1.0)
+        writer._seq[0] = 3  # the writer stopped after setting the sequence number
+        with pytest.raises(RuntimeError, match="could not be read"):
+            reader.latest()
+        # a writer suspended between its 2 stores, e.g. by a switch of the GIL
+        timer = threading.Timer(0.005, writer._seq.__setitem__, args=(0, 2))
+        timer.start()
+        assert reader.latest() == (0, 1.0)
+        timer.join()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX shared memory")
+def test_force_ring_stale(name):
+    """Test replacing a block left by a writer which did not close."""
+    from multiprocessing import resource_tracker, shared_memory
+
+    shm = shared_memory.SharedMemory(name=name, create=True, size=256)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    shm.close()  # the block is left in /dev/shm
+    with pytest.warns(RuntimeWarning, match="Replacing"):
+        writer = ForceWriter(name, capacity=16)
+    with writer, ForceReader(name) as reader:
+        writer.write(2.0, timestamp=0)
+        assert reader.read()["value"].tolist() == [2.0]
+
+
+@pytest.mark.parametrize("dev_shm", [True, False])
+def test_force_ring_process(name, dev_shm, monkeypatch):
+    """Test reading the ring written by another process."""
+    if not dev_shm:  # attach the block as on the POSIX systems without /dev/shm
+        if sys.platform == "win32":
+            pytest.skip("POSIX shared memory")
+        monkeypatch.setattr("flow.force._ring.os.path.isdir", lambda path: False)
+    with subprocess.Popen(
+        [sys.executable, "-c", _WRITER, name],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    ) as process:
+        assert process.stdout.readline().strip() == "written"
+        with ForceReader(name) as reader:
+            assert reader.latest() == (99, 99.0)
+            assert reader.read().size == 0  # written before the reader was created
+            reader._next = 0
+            samples = reader.read()
+            np.testing.assert_array_equal(samples["value"], np.arange(36, 100))
+            assert reader.lost == 36
+        process.stdin.write("\n")
+        process.stdin.flush()
+        assert process.wait(timeout=10) == 0
+    with pytest.raises(FileNotFoundError):
+        ForceReader(name)
+
+
+def test_force_reader_invalid(name):
+    """Test attaching a block which is not a force ring."""
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=name, create=True, size=256)
+    try:
+        with pytest.raises(ValueError, match="not a force ring"):
+            ForceReader(name)
+    finally:
+        shm.close()
+        shm.unlink()
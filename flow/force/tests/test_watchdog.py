@@ -0,0 +1,138 @@
+import time
+from threading import Event, Thread
+from types import SimpleNamespace
+
+import pytest
+
+from flow.force import SensorWatchdog
+
+
+class _FakeSensor:
+    """Sensor delivering samples from a thread until stalled or detached."""
+
+    def __init__(self, sample_rate=200) -> None:
+        self.watchdog = None
+        self.n_attach = 0
+        self.n_failures = 0  # number of attach attempts to fail
+        self.stalled = Event()
+        self._period = 1 / sample_rate
+        self._running = None
+
+    def attach(self):
+        """Start delivering samples."""
+        if 0 < self.n_failures:
+            self.n_failures -= 1
+            raise RuntimeError("The sensor is not connected.")
+        self.n_attach += 1
+        self.stalled.clear()
+        self._running = Event()
+        self._running.set()
+        thread = Thread(target=self._run, args=(self._running,), daemon=True)
+        thread.start()
+        return thread
+
+    def detach(self, thread):
+        """Stop delivering samples."""
+        self._running.clear()
+        thread.join()
+
+    def _run(self, running):
+        while running.is_set():
+            if not self.stalled.is_set():
+                self.watchdog.feed()
+            time.sleep(self._period)
+
+
+def _wait_for(condition, timeout=5):
+    """Wait until a condition is met."""
+    start = time.monotonic()
+    while not condition():
+        assert time.monotonic() - start < timeout
+        time.sleep(0.005)
+
+
+def test_watchdog_reattach():
+    """Test the detection of a stall and the reattachment of the sensor."""
+    sensor = _FakeSensor()
+    events = list()
+    watchdog = SensorWatchdog(
+        sensor.attach,
+        sensor.detach,
+        200,
+        stale=10,
+        reattach=0.2,
+        backoff=(0.01, 0.04),
+        on_stale=lambda: events.append("stale"),
+        on_recover=lambda: events.append("recover"),
+    )
+    sensor.watchdog = watchdog
+    with watchdog:
+        _wait_for(lambda: 50 < watchdog.n_samples)
+        assert not watchdog.stale
+        assert sensor.n_attach == 1
+        # stall the sensor, which fails to reattach twice
+        sensor.n_failures = 2
+        sensor.stalled.set()
+        _wait_for(lambda: watchdog.stale)
+        assert events == ["stale"]
+        n_samples = watchdog.n_samples
+        _wait_for(lambda: watchdog.n_reattach == 1)
+        _wait_for(lambda: len(events) == 2)
+        assert not watchdog.stale
+        assert sensor.n_failures == 0
+        assert sensor.n_attach == 2
+        assert events == ["stale", "recover"]
+        _wait_for(lambda: n_samples + 10 < watchdog.n_samples)
+    assert watchdog.n_reattach == 1
+
+
+def test_watchdog_stale_without_reattach():
+    """Test a short stall which does not trigger a reattachment."""
+    sensor = _FakeSensor()
+    watchdog = SensorWatchdog(sensor.attach, sensor.detach, 200, stale=10, reattach=2)
+    sensor.watchdog = watchdog
+    with watchdog:
+        _wait_for(lambda: 10 < watchdog.n_samples)
+        sensor.stalled.set()
+        _wait_for(lambda: watchdog.stale)
+        sensor.stalled.clear()
+        _wait_for(lambda: not watchdog.stale)
+    assert watchdog.n_reattach == 0
+    assert sensor.n_attach == 1
+
+
+def test_watchdog_reattach_without_samples():
+    """Test that a reattached sensor which never delivers samples stays stale."""
+    sensor = _FakeSensor()
+    events = list()
+    watchdog = SensorWatchdog(
+        sensor.attach,
+        sensor.detach,
+        200,
+        stale=4,
+        reattach=0.05,
+        backoff=(0.01, 0.04),
+        on_stale=lambda: events.append("stale"),
+        on_recover=lambda: events.append("recover"),
+    )
+    sensor.watchdog = SimpleNamespace(feed=lambda: None)  # attaches but never feeds
+    with watchdog:
+        _wait_for(lambda: 3 <= watchdog.n_reattach)
+        assert watchdog.stale
+        assert watchdog.n_samples == 0
+        assert events == ["stale"]
+        sensor.watchdog = watchdog
+        _wait_for(lambda: not watchdog.stale)
+    assert events == ["stale", "recover"]
+
+
+def test_watchdog_invalid():
+    """Test invalid arguments."""
+    with pytest.raises(ValueError, match="must be longer"):
+        SensorWatchdog(lambda: None, lambda handle: None, 100, stale=10, reattach=0.1)
+    with pytest.raises(ValueError, match="must be positive"):
+        SensorWatchdog(lambda: None, lambda handle: None, 0)
+    sensor = _FakeSensor()
+    sensor.n_failures = 1
+    with pytest.raises(RuntimeError, match="not connected"):
+        SensorWatchdog(sensor.attach, sensor.detach).start()
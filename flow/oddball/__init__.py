@@ -1 +1,4 @@
+from ._generate import generate_trial_lists, write_trial_list
+from ._prepare import prepare
+from ._simulation import simulate
 from .oddball import oddball
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import os
+import struct
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..utils._checks import check_type, ensure_int, ensure_path
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Optional, Union
+
+# little-endian: magic (8 bytes), version (uint32), number of sounds (uint32), offset of
+# the PCM blob in bytes (uint64), padded to _ALIGNMENT
+_HEADER = struct.Struct("<8sIIQ")
+_MAGIC: bytes = b"FLOWPCM\x00"
+_VERSION: int = 1
+_ALIGNMENT: int = 64  # bytes, alignment of the index, of the blob and of every sound
+_INDEX_DTYPE = np.dtype(
+    [
+        ("name", "S16"),
+        ("sample_rate", "<u4"),
+        ("n_channels", "<u4"),
+        ("offset", "<u8"),
+        ("n_samples", "<u8"),
+    ]
+)
+_SAMPLE_DTYPE = np.dtype("<f4")
+
+
+def _align(n_bytes: int) -> int:
+    """Round a number of bytes up to the alignment."""
+    return -(-n_bytes // _ALIGNMENT) * _ALIGNMENT
+
+
+def write_sound_archive(
+    fname: Union[str, Path], sounds: list[tuple[str, int, np.ndarray]]
+) -> Path:
+    """Pack sounds in a single memory-mappable archive.
+
+    The archive is laid out as::
+
+        offset       size              content
+        0            64                header, see _HEADER
+        64           40 * n_sounds     index, see _INDEX_DTYPE
+        data_offset  ...               PCM blob, float32 little-endian
+
+    The index stores for every sound its name, sample rate, number of channels, offset
+    in the blob in number of float32 and number of samples. The samples of each sound
+    are interleaved by channel and aligned on 64 bytes.
+
+    Parameters
+    ----------
+    fname : path-like
+        Path to the archive, replaced atomically if it exists.
+    sounds : list of tuple
+        The sounds as ``(name, sample_rate, data)`` with ``data`` of shape
+        ``(n_samples, n_channels)``.
+
+    Returns
+    -------
+    fname : Path
+        Path to the archive.
+    """
+    fname = ensure_path(fname, must_exist=False)
+    check_type(sounds, (list, tuple), "sounds")
+    index = np.zeros(len(sounds), dtype=_INDEX_DTYPE)
+    offset = 0  # bytes
+    for k, (name, sample_rate, data) in enumerate(sounds):
+        check_type(data, (np.ndarray,), "data")
+        if data.ndim != 2:
+            raise ValueError(
+                f"The sound '{name}' must be of shape (n_samples, n_channels), got "
+                f"{data.shape}."
+            )
+        encoded = name.encode()
+        if _INDEX_DTYPE["name"].itemsize < len(encoded):
+            raise ValueError(f"The name of the sound '{name}' is too long.")
+        index[k] = (
+            encoded,
+            ensure_int(sample_rate, "sample_rate"),
+            data.shape[1],
+            offset // _SAMPLE_DTYPE.itemsize,
+            data.shape[0],
+        )
+        offset = _align(offset + data.size * _SAMPLE_DTYPE.itemsize)
+    keys = set(zip(index["name"].tolist(), index["sample_rate"].tolist()))
+    if len(keys) != index.size:
+        raise ValueError("The sounds must be unique for a given name and sample rate.")
+    data_offset = _align(_ALIGNMENT + index.nbytes)
+    # write to a temporary file first to replace the archive atomically
+    fname_tmp = fname.with_suffix(".tmp")
+    with open(fname_tmp, "wb") as fid:
+        fid.write(_HEADER.pack(_MAGIC, _VERSION, index.size, data_offset))
+        fid.seek(_ALIGNMENT)
+        fid.write(index.tobytes())
+        for entry, (_, _, data) in zip(index, sounds):
+            fid.seek(data_offset + int(entry["offset"]) * _SAMPLE_DTYPE.itemsize)
+            fid.write(np.ascontiguousarray(data, dtype=_SAMPLE_DTYPE).tobytes())
+        fid.truncate(data_offset + offset)
+    os.replace(fname_tmp, fname)
+    return fname
+
+
+class SoundArchive:
+    """Read-only access to a sound archive written by :func:`write_sound_archive`.
+
+    The archive is opened and memory-mapped once, and every sound is returned as a
+    zero-copy view on the mapped PCM blob, thus only the pages of the sounds played are
+    read from the disk.
+
+    Parameters
+    ----------
+    fname : path-like
+        Path to the archive.
+    """
+
+    def __init__(self, fname: Union[str, Path]) -> None:
+        self._fname = ensure_path(fname, must_exist=True)
+        with open(self._fname, "rb") as fid:
+            header = fid.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"The file '{self._fname}' is not a sound archive.")
+            magic, version, n_sounds, data_offset = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise ValueError(f"The file '{self._fname}' is not a sound archive.")
+            if version != _VERSION:
+                raise ValueError(
+                    f"The sound archive '{self._fname}' version {version} is not "
+                    f"supported, expected {_VERSION}."
+                )
+            fid.seek(_ALIGNMENT)
+            index = np.frombuffer(
+                fid.read(n_sounds * _INDEX_DTYPE.itemsize), dtype=_INDEX_DTYPE
+            )
+        if data_offset < os.stat(self._fname).st_size:
+            self._blob = np.memmap(
+                self._fname, dtype=_SAMPLE_DTYPE, mode="r", offset=data_offset
+            )
+        else:  # empty blob, which can not be memory-mapped
+            self._blob = np.zeros(0, dtype=_SAMPLE_DTYPE)
+        self._index = {
+            (entry["name"].decode(), int(entry["sample_rate"])): entry
+            for entry in index
+        }
+
+    def get(self, name: str, sample_rate: int) -> Optional[np.ndarray]:
+        """Get a sound.
+
+        Parameters
+        ----------
+        name : str
+            Name of the sound, e.g. ``"low_tone"`` or ``"wav0001"``.
+        sample_rate : int
+            Sample rate of the sound in Hz.
+
+        Returns
+        -------
+        data : array of shape (n_samples, n_channels) | None
+            A read-only view of the samples, or None if the archive does not contain
+            the sound at this sample rate.
+        """
+        entry = self._index.get((name, sample_rate))
+        if entry is None:
+            return None
+        start = int(entry["offset"])
+        n_channels = int(entry["n_channels"])
+        stop = start + int(entry["n_samples"]) * n_channels
+        return self._blob[start:stop].reshape(-1, n_channels)
+
+    def __contains__(self, key: tuple[str, int]) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def fname(self) -> Path:
+        """Path to the archive."""
+        return self._fname
+
+    @property
+    def sounds(self) -> list[tuple[str, int]]:
+        """The ``(name, sample_rate)`` of every sound in the archive."""
+        return list(self._index)
@@ -0,0 +1,485 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..utils._checks import check_type, check_value, ensure_int
+from ..utils._docs import copy_doc
+from ..utils._imports import import_optional_dependency
+from ..utils.logs import warn
+from ._dsp import resample_poly
+from ._time import BaseClock, Clock, PTBClock, VirtualClock
+
+if TYPE_CHECKING:
+    from typing import Any, Optional
+
+    from psychopy.sound.backend_ptb import SoundPTB
+
+_RAMP_DURATION: float = 0.005  # seconds, fade-in and fade-out of the mixed sounds
+
+
+class BaseAudioBackend(ABC):
+    """Base class for the audio backends.
+
+    An audio backend creates the sound objects, with a ``play(when)`` and a
+    ``setVolume(volume)`` method, and the clock in the timebase in which ``when`` is
+    expressed, see :meth:`create_clock`. If you want to implement a custom backend, you
+    should subclass this class and define the abstract methods.
+    """
+
+    @abstractmethod
+    def __init__(self) -> None:
+        pass
+
+    @abstractmethod
+    def create_sound(
+        self, name: str, data: np.ndarray, sample_rate: int, duration: float
+    ) -> Any:
+        """Create a sound from its samples.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stimulus.
+        data : array of shape (n_samples, n_channels)
+            The samples of the sound, as float32 between -1 and 1.
+        sample_rate : int
+            The sample rate of ``data`` in Hz.
+        duration : float
+            Duration of the sound in seconds.
+
+        Returns
+        -------
+        sound : object
+            The sound, with a ``play(when)`` and a ``setVolume(volume)`` method.
+        """
+
+    @abstractmethod
+    def create_clock(self, t0: Optional[float] = None) -> BaseClock:
+        """Create the clock used to schedule the sounds.
+
+        Parameters
+        ----------
+        t0 : float | None
+            Origin of the clock in seconds, in the timebase of the backend. If None,
+            the origin is the instantiation of the clock.
+
+        Returns
+        -------
+        clock : BaseClock
+            The clock, with a ``to_ptb`` method converting its time to the timebase
+            of the ``when`` argument of the sounds.
+        """
+
+    @property
+    def sample_rate(self) -> Optional[int]:
+        """Native sample rate of the output in Hz, None if unknown."""
+        return self._sample_rate
+
+    def start(self) -> None:  # noqa: B027
+        """Start the audio output."""
+
+    def stop(self) -> None:  # noqa: B027
+        """Stop the audio output."""
+
+    def __enter__(self) -> BaseAudioBackend:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+class PTBBackend(BaseAudioBackend):
+    """Audio backend scheduling the sounds with psychtoolbox through psychopy.
+
+    Parameters
+    ----------
+    device : str
+        Name of the output device.
+    """
+
+    def __init__(self, device: str) -> None:
+        from psychopy.sound import setDevice
+
+        check_type(device, (str,), "device")
+        setDevice(device, kind="output")
+        self._sample_rate = _get_device_sample_rate(device)
+
+    @copy_doc(BaseAudioBackend.create_sound)
+    def create_sound(
+        self, name: str, data: np.ndarray, sample_rate: int, duration: float
+    ) -> SoundPTB:
+        from psychopy.sound.backend_ptb import SoundPTB
+
+        return SoundPTB(
+            data, secs=duration, hamming=True, name="stim", sampleRate=sample_rate
+        )
+
+    @copy_doc(BaseAudioBackend.create_clock)
+    def create_clock(self, t0: Optional[float] = None) -> PTBClock:
+        return PTBClock(t0)
+
+
+def _get_device_sample_rate(device: str) -> Optional[int]:
+    """Get the native sample rate of an output device, None if it is not found."""
+    from psychtoolbox import audio
+
+    for elt in audio.get_devices():
+        if elt["DeviceName"] == device and 0 < elt["NrOutputChannels"]:
+            return int(elt["DefaultSampleRate"])
+    return None
+
+
+class _Mixer:
+    """Mix the scheduled sounds into the blocks of an output stream.
+
+    The sounds are scheduled from any thread through a :class:`collections.deque`,
+    and the blocks are rendered in the audio callback, which only adds the samples of
+    the active sounds to the output buffer at their sample offset, without locks.
+
+    Parameters
+    ----------
+    sample_rate : int
+        Sample rate of the output stream in Hz.
+    """
+
+    def __init__(self, sample_rate: int) -> None:
+        self._sample_rate = sample_rate
+        self._queue = deque()  # (when, data) appended by play()
+        self._pending = list()  # (when, data) not yet started, owned by the callback
+        self._voices = list()  # (data, position, offset) playing
+        self.n_late = 0  # sounds started after their scheduled onset
+        self.n_xruns = 0  # underflows reported by the stream
+
+    def schedule(self, data: np.ndarray, when: float) -> None:
+        """Schedule a sound.
+
+        Parameters
+        ----------
+        data : array of shape (n_samples, n_channels)
+            The samples to play, already scaled by the volume.
+        when : float
+            Onset in seconds, in the timebase of the stream.
+        """
+        self._queue.append((when, data))
+
+    def render(self, out: np.ndarray, dac_time: float) -> None:
+        """Render a block of the output stream.
+
+        Parameters
+        ----------
+        out : array of shape (n_frames, n_channels)
+            The output buffer, overwritten.
+        dac_time : float
+            Time in seconds, in the timebase of the stream, at which the first frame
+            of the block is played.
+        """
+        out.fill(0)
+        while len(self._queue) != 0:
+            self._pending.append(self._queue.popleft())
+        n_frames = out.shape[0]
+        pending = list()
+        for when, data in self._pending:
+            offset = round((when - dac_time) * self._sample_rate)
+            if n_frames <= offset:
+                pending.append((when, data))
+                continue
+            if offset < 0:  # scheduled too late, played as soon as possible
+                self.n_late += 1
+                offset = 0
+            self._voices.append((data, 0, offset))
+        self._pending = pending
+        voices = list()
+        for data, position, offset in self._voices:
+            n = min(n_frames - offset, data.shape[0] - position)
+            out[offset : offset + n] += data[position : position + n]
+            if position + n < data.shape[0]:
+                voices.append((data, position + n, 0))
+        self._voices = voices
+
+
+class _MixerSound:
+    """Sound played by a :class:`_Mixer`.
+
+    Parameters
+    ----------
+    mixer : _Mixer
+        The mixer of the output stream.
+    data : array of shape (n_samples, n_channels)
+        The samples of the sound, at the sample rate of the stream.
+    """
+
+    def __init__(self, mixer: _Mixer, data: np.ndarray) -> None:
+        self._mixer = mixer
+        self._data = data
+        self._scaled = data
+
+    def play(self, when: float) -> None:
+        """Schedule the sound.
+
+        Parameters
+        ----------
+        when : float
+            Onset of the sound in seconds, in the timebase of the stream.
+        """
+        self._mixer.schedule(self._scaled, when)
+
+    def setVolume(self, volume: float) -> None:  # noqa: N802
+        """Set the volume of the sound.
+
+        Parameters
+        ----------
+        volume : float
+            Volume of the sound, between 0 and 1.
+        """
+        # scaled once here, thus the audio callback only adds the samples
+        self._scaled = (self._data * volume).astype(np.float32)
+
+
+class _StreamClock(BaseClock):
+    """Clock which keeps track of time in nanoseconds in the timebase of a stream.
+
+    Parameters
+    ----------
+    stream : sounddevice.OutputStream
+        The open output stream.
+    t0 : float | None
+        Origin of the clock in seconds, in the timebase of the stream. If None, the
+        origin is the instantiation of the clock.
+    """
+
+    def __init__(self, stream, t0: Optional[float] = None) -> None:
+        check_type(t0, ("numeric", None), "t0")
+        self._stream = stream
+        self._t0 = stream.time if t0 is None else float(t0)
+
+    @copy_doc(BaseClock.get_time_ns)
+    def get_time_ns(self) -> int:
+        return int((self._stream.time - self._t0) * 1e9)
+
+    def to_ptb(self, time_ns: int) -> float:
+        """Convert a time of the clock to the timebase of the stream.
+
+        Parameters
+        ----------
+        time_ns : int
+            Time in nanoseconds, in the referential of the clock.
+
+        Returns
+        -------
+        time : float
+            The corresponding time in seconds in the timebase of the stream, e.g. to
+            be used as the ``when`` argument of a sound.
+        """
+        return self._t0 + time_ns / 1e9
+
+
+class SounddeviceBackend(BaseAudioBackend):
+    """Callback-driven audio engine on a PortAudio stream through sounddevice.
+
+    The sounds are preloaded at the sample rate of the stream and mixed in the audio
+    callback into fixed-size blocks, at the sample offset corresponding to their onset
+    relative to the output time of the block reported by PortAudio. Thus, the onsets
+    are sample-accurate and do not depend on the scheduling of the Python threads, as
+    long as a sound is scheduled at least one block ahead.
+
+    Parameters
+    ----------
+    device : str | int | None
+        Name or index of the output device. If None, the default output device is
+        used.
+    sample_rate : int | None
+        Sample rate of the stream in Hz. If None, the native sample rate of the device
+        is used.
+    blocksize : int
+        Number of frames per block. Smaller blocks reduce the output latency but
+        increase the load of the audio callback.
+    latency : str | float
+        Latency requested to PortAudio, ``"low"``, ``"high"`` or in seconds.
+    """
+
+    def __init__(
+        self,
+        device=None,
+        sample_rate: Optional[int] = None,
+        blocksize: int = 64,
+        latency="low",
+    ) -> None:
+        sd = import_optional_dependency("sounddevice")
+        info = sd.query_devices(device, "output")
+        self._sample_rate = (
+            int(info["default_samplerate"])
+            if sample_rate is None
+            else ensure_int(sample_rate, "sample_rate")
+        )
+        self._n_channels = min(int(info["max_output_channels"]), 2)
+        self._mixer = _Mixer(self._sample_rate)
+        self._stream = sd.OutputStream(
+            samplerate=self._sample_rate,
+            blocksize=ensure_int(blocksize, "blocksize"),
+            device=device,
+            channels=self._n_channels,
+            dtype="float32",
+            latency=latency,
+            callback=self._callback,
+        )
+
+    def _callback(self, outdata, frames, time, status) -> None:
+        """Audio callback, executed in the PortAudio thread."""
+        if status.output_underflow:
+            self._mixer.n_xruns += 1
+        self._mixer.render(outdata, time.outputBufferDacTime)
+
+    @copy_doc(BaseAudioBackend.create_sound)
+    def create_sound(
+        self, name: str, data: np.ndarray, sample_rate: int, duration: float
+    ) -> _MixerSound:
+        if sample_rate != self._sample_rate:
+            data = resample_poly(data, self._sample_rate, sample_rate)
+        if self._n_channels < data.shape[1]:
+            data = data.mean(axis=1, keepdims=True)
+        data = np.array(data[: round(duration * self._sample_rate)], dtype=np.float32)
+        # fade-in and fade-out to prevent clicks
+        n_ramp = min(round(_RAMP_DURATION * self._sample_rate), data.shape[0] // 2)
+        ramp = np.sin(np.linspace(0, np.pi / 2, n_ramp, dtype=np.float32)) ** 2
+        data[:n_ramp] *= ramp[:, np.newaxis]
+        data[data.shape[0] - n_ramp :] *= ramp[::-1, np.newaxis]
+        return _MixerSound(self._mixer, data)
+
+    @copy_doc(BaseAudioBackend.create_clock)
+    def create_clock(self, t0: Optional[float] = None) -> _StreamClock:
+        return _StreamClock(self._stream, t0)
+
+    def start(self) -> None:
+        """Start the output stream."""
+        self._stream.start()
+
+    def stop(self) -> None:
+        """Stop and close the output stream."""
+        self._stream.close()
+        if self._mixer.n_late != 0 or self._mixer.n_xruns != 0:
+            warn(
+                f"{self._mixer.n_late} sound(s) were scheduled too late and the output "
+                f"stream underflowed {self._mixer.n_xruns} time(s)."
+            )
+
+
+class NullSound:
+    """Sound which records the scheduled onsets instead of playing.
+
+    Parameters
+    ----------
+    name : str
+        Name of the stimulus.
+    sample_rate : int
+        Sample rate in Hz used to convert the onsets to sample positions.
+    """
+
+    def __init__(self, name: str, sample_rate: int = 48000) -> None:
+        self.name = name
+        self.sample_rate = sample_rate
+        self.onsets: list[float] = list()
+        self.positions: list[int] = list()
+        self.volume = 1.0
+
+    def play(self, when: float) -> None:
+        """Schedule the sound.
+
+        Parameters
+        ----------
+        when : float
+            Onset of the sound in seconds.
+        """
+        self.onsets.append(when)
+        self.positions.append(round(when * self.sample_rate))
+
+    def setVolume(self, volume: float) -> None:  # noqa: N802
+        """Set the volume of the sound.
+
+        Parameters
+        ----------
+        volume : float
+            Volume of the sound, between 0 and 1.
+        """
+        self.volume = volume
+
+
+class _NullClock(Clock):
+    """Real-time clock converting its time to seconds for the null backend."""
+
+    @copy_doc(VirtualClock.to_ptb)
+    def to_ptb(self, time_ns: int) -> float:
+        return time_ns / 1e9
+
+
+class NullBackend(BaseAudioBackend):
+    """Audio backend which records the scheduled sounds instead of playing them.
+
+    The sounds are :class:`NullSound` which record their onsets in seconds and in
+    samples since the origin of the clock, thus the timing of a session can be tested
+    without audio device.
+
+    Parameters
+    ----------
+    sample_rate : int
+        Sample rate in Hz used to convert the onsets to sample positions.
+    virtual : bool
+        If True, the clock is a :class:`~flow.oddball._time.VirtualClock` which only
+        advances when it waits. If False, the clock follows the real time.
+    """
+
+    def __init__(self, sample_rate: int = 48000, virtual: bool = False) -> None:
+        self._sample_rate = ensure_int(sample_rate, "sample_rate")
+        check_type(virtual, (bool,), "virtual")
+        self._virtual = virtual
+
+    @copy_doc(BaseAudioBackend.create_sound)
+    def create_sound(
+        self, name: str, data: np.ndarray, sample_rate: int, duration: float
+    ) -> NullSound:
+        return NullSound(name, self._sample_rate)
+
+    def create_clock(self, t0: Optional[float] = None) -> BaseClock:
+        """Create the clock used to schedule the sounds.
+
+        Parameters
+        ----------
+        t0 : float | None
+            Not supported, the origin is the instantiation of the clock.
+
+        Returns
+        -------
+        clock : BaseClock
+            The clock, with a ``to_ptb`` method converting its time to seconds.
+        """
+        if t0 is not None:
+            raise ValueError("The null audio backend does not support an origin t0.")
+        return VirtualClock() if self._virtual else _NullClock()
+
+
+def create_backend(backend: str, device: str) -> BaseAudioBackend:
+    """Create an audio backend.
+
+    Parameters
+    ----------
+    backend : "ptb" | "sounddevice" | "null"
+        The audio backend, see :class:`PTBBackend`, :class:`SounddeviceBackend` and
+        :class:`NullBackend`.
+    device : str
+        Name of the output device, ignored by the null backend.
+
+    Returns
+    -------
+    backend : BaseAudioBackend
+        The audio backend.
+    """
+    check_value(backend, ("ptb", "sounddevice", "null"), "backend")
+    if backend == "ptb":
+        return PTBBackend(device)
+    elif backend == "sounddevice":
+        return SounddeviceBackend(device)
+    return NullBackend()
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import time
+from hashlib import blake2b
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..utils._checks import check_type, ensure_path
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Union
+
+_MAGIC: bytes = b"FLOWCKPT"
+_VERSION: int = 1
+_HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("n_trials", "<u4"),
+        ("counter", "<u4"),
+        ("condition", "S32"),
+        ("digest", "S16"),
+    ]
+)
+_EVENT_DTYPE = np.dtype(
+    [
+        ("idx", "<u4"),
+        ("trigger", "<u4"),
+        ("onset", "<i8"),  # nanoseconds, in the referential of the session clock
+        ("time", "<i8"),  # nanoseconds, since the epoch
+    ]
+)
+
+
+class Checkpoint:
+    """Memory-mapped checkpoint of an oddball session.
+
+    The checkpoint is a fixed-size file composed of a header storing the number of
+    trials played, followed by one event record per trial. Recording a trial is a
+    fixed-size write in the memory map which is persisted by the OS even if the
+    process crashes.
+
+    Parameters
+    ----------
+    fname : path-like
+        Path to the checkpoint file.
+    condition : str
+        Oddball condition.
+    trials : list of tuple
+        Parsed trial list of the condition.
+    resume : bool
+        If True and if the checkpoint file exists, resume from the last trial
+        recorded. Else, a new checkpoint is created, overwriting the existing file.
+    """
+
+    def __init__(
+        self,
+        fname: Union[str, Path],
+        condition: str,
+        trials: list[tuple[int, str]],
+        *,
+        resume: bool = False,
+    ) -> None:
+        self._fname = ensure_path(fname, must_exist=False)
+        check_type(condition, (str,), "condition")
+        check_type(resume, (bool,), "resume")
+        digest = _hash_trials(trials)
+        if resume and self._fname.exists():
+            self._open(condition, len(trials), digest)
+        else:
+            self._create(condition, len(trials), digest)
+
+    def _create(self, condition: str, n_trials: int, digest: bytes) -> None:
+        """Create a new checkpoint file."""
+        self._fname.parent.mkdir(parents=True, exist_ok=True)
+        self._header = np.memmap(
+            self._fname, dtype=_HEADER_DTYPE, mode="w+", shape=(1,)
+        )
+        self._header[0] = (_MAGIC, _VERSION, n_trials, 0, condition.encode(), digest)
+        self._header.flush()
+        # the memory map extends the file to its final size with zeros
+        self._events = np.memmap(
+            self._fname,
+            dtype=_EVENT_DTYPE,
+            mode="r+",
+            offset=_HEADER_DTYPE.itemsize,
+            shape=(n_trials,),
+        )
+
+    def _open(self, condition: str, n_trials: int, digest: bytes) -> None:
+        """Open an existing checkpoint file."""
+        self._header = np.memmap(
+            self._fname, dtype=_HEADER_DTYPE, mode="r+", shape=(1,)
+        )
+        header = self._header[0]
+        if header["magic"] != _MAGIC or header["version"] != _VERSION:
+            raise ValueError(
+                f"The file '{self._fname}' is not a valid oddball checkpoint."
+            )
+        if (
+            header["condition"].decode() != condition
+            or header["n_trials"] != n_trials
+            or header["digest"] != digest
+        ):
+            raise ValueError(
+                f"The checkpoint '{self._fname}' does not match the trial list of the "
+                f"condition '{condition}'."
+            )
+        if header["counter"] == n_trials:
+            raise RuntimeError(
+                f"The session recorded in the checkpoint '{self._fname}' is already "
+                "completed."
+            )
+        self._events = np.memmap(
+            self._fname,
+            dtype=_EVENT_DTYPE,
+            mode="r+",
+            offset=_HEADER_DTYPE.itemsize,
+            shape=(n_trials,),
+        )
+
+    def record(self, idx: int, trigger: int, onset: int) -> None:
+        """Record the trial played.
+
+        Parameters
+        ----------
+        idx : int
+            Index of the trial in the trial list.
+        trigger : int
+            Trigger value sent.
+        onset : int
+            Onset of the trial in nanoseconds, in the referential of the session clock.
+        """
+        counter = self._header[0]["counter"]
+        self._events[counter] = (idx, trigger, onset, time.time_ns())
+        # the counter is incremented after the event is written to commit it
+        self._header["counter"] = counter + 1
+
+    def close(self) -> None:
+        """Flush the checkpoint to the disk and release the memory map."""
+        self._events.flush()
+        self._header.flush()
+        del self._events
+        del self._header
+
+    @property
+    def counter(self) -> int:
+        """Number of trials already played."""
+        return int(self._header[0]["counter"])
+
+    @property
+    def events(self) -> np.ndarray:
+        """Events recorded, as a structured array."""
+        return np.array(self._events[: self.counter])
+
+    @property
+    def fname(self) -> Path:
+        """Path to the checkpoint file."""
+        return self._fname
+
+    def __enter__(self) -> Checkpoint:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def _hash_trials(trials: list[tuple[int, str]]) -> bytes:
+    """Hash a trial list."""
+    hasher = blake2b(digest_size=16)
+    for idx, trial in trials:
+        hasher.update(f"{idx},{trial};".encode())
+    return hasher.digest()
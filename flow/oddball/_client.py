@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+import zmq
+
+from ..utils._checks import check_type, check_value, ensure_int
+from ..utils.logs import logger
+from ._control import _MESSAGES
+
+if TYPE_CHECKING:
+    from typing import Union
+
+
+class ControlClient:
+    """Send control messages to the oddball paradigm on a persistent connection.
+
+    The ``REQ`` socket is kept open between messages. If the server does not reply
+    within the timeout, the socket is closed and reconnected before the message is sent
+    again, as a ``REQ`` socket can not send a new request until it receives a reply.
+
+    Parameters
+    ----------
+    address : str
+        Address of the ``REP`` socket of the paradigm, e.g. ``"tcp://localhost:5555"``.
+    timeout : float
+        Duration in seconds to wait for a reply before reconnecting.
+    retries : int
+        Number of times a message is sent again without reply before giving up.
+    """
+
+    def __init__(self, address: str, timeout: float = 1.0, retries: int = 3) -> None:
+        check_type(address, (str,), "address")
+        check_type(timeout, ("numeric",), "timeout")
+        retries = ensure_int(retries, "retries")
+        if timeout <= 0 or retries < 0:
+            raise ValueError(
+                "The timeout must be strictly positive and the number of retries must "
+                f"be positive, got {timeout} and {retries}."
+            )
+        self._address = address
+        self._timeout = int(timeout * 1000)  # milliseconds
+        self._retries = retries
+        self._context = zmq.Context()
+        self._socket = None
+        self._rtts: list[int] = list()  # nanoseconds
+        self._connect()
+
+    def _connect(self) -> None:
+        """Open the socket and connect to the server."""
+        self._socket = self._context.socket(zmq.REQ)
+        self._socket.setsockopt(zmq.LINGER, 0)
+        self._socket.connect(self._address)
+
+    def send(self, message: str) -> float:
+        """Send a control message and wait for its acknowledgment.
+
+        Parameters
+        ----------
+        message : str
+            The message, ``"hold"`` or ``"continue"``.
+
+        Returns
+        -------
+        rtt : float
+            The duration in seconds between the request and the reply.
+        """
+        check_value(message, _MESSAGES, "message")
+        for attempt in range(self._retries + 1):
+            start = time.perf_counter_ns()
+            self._socket.send_string(message)
+            if self._socket.poll(self._timeout, zmq.POLLIN):
+                reply = self._socket.recv_string()
+                rtt = time.perf_counter_ns() - start
+                if reply != "ACK":
+                    raise RuntimeError(f"Unexpected reply '{reply}' from the server.")
+                self._rtts.append(rtt)
+                logger.info(
+                    "Server reply to '%s': %s (%.3f ms).", message, reply, rtt / 1e6
+                )
+                return rtt / 1e9
+            logger.warning(
+                "No reply from %s within %i ms (attempt %i / %i), reconnecting.",
+                self._address,
+                self._timeout,
+                attempt + 1,
+                self._retries + 1,
+            )
+            self._socket.close()
+            self._connect()
+        raise TimeoutError(
+            f"The server at {self._address} did not reply to '{message}' after "
+            f"{self._retries + 1} attempts."
+        )
+
+    def run(self, script: list[Union[str, float]], repeat: int = 1) -> None:
+        """Run a sequence of control messages and pauses.
+
+        Parameters
+        ----------
+        script : list of str | float
+            Sequence of messages, ``"hold"`` or ``"continue"``, and pauses in seconds.
+        repeat : int
+            Number of times the sequence is run.
+        """
+        check_type(script, (list, tuple), "script")
+        repeat = ensure_int(repeat, "repeat")
+        for step in script:
+            check_type(step, (str, "numeric"), "step")
+            if isinstance(step, str):
+                check_value(step, _MESSAGES, "message")
+            elif not math.isfinite(step) or step < 0:
+                raise ValueError(
+                    "The pauses must be finite and positive durations in seconds, got "
+                    f"{step}."
+                )
+        for _ in range(repeat):
+            for step in script:
+                if isinstance(step, str):
+                    self.send(step)
+                else:
+                    time.sleep(step)
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._socket.close()
+        self._context.term()
+
+    @property
+    def rtts(self) -> np.ndarray:
+        """Round-trip durations of the acknowledged messages in seconds."""
+        return np.array(self._rtts, dtype=np.float64) / 1e9
+
+    def __enter__(self) -> ControlClient:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -1,7 +1,14 @@
+from pathlib import Path
+
 from ..utils._checks import check_type
 
 DURATION_STIM: float = 0.2  # seconds
 DURATION_ITI: float = 1.0  # seconds
+# range (low, high) in seconds in which the ITIs are drawn uniformly, overridden by an
+# ITI column in the trial list, and seed of the draw
+DURATION_ITI_JITTER: tuple[float, float] | None = None
+ITI_SEED: int | None = None
+ITI_MARGIN: float = 0.5  # seconds, minimum ITI in excess of DURATION_STIM
 TRIGGER_ADDRESS: int | str = 0x2FB8  # 0x2FB8 or /dev/parport0
 TRIGGERS: dict[str, int] = {
     "standard": 1,
@@ -9,11 +16,23 @@ TRIGGERS: dict[str, int] = {
     "novel": 3,
     "hold": 4,
 }
+AUDIO_BACKEND: str = "ptb"  # "ptb" | "sounddevice" | "null"
 AUDIO_DEVICE: str = "Speakers (SPL Crimson 2.9.86.25)"
 AUDIO_VOLUME: float = 0.1
+CACHE_DIRECTORY: Path = Path.home() / ".flow" / "cache"  # see 'flow oddball prepare'
+SAMPLE_RATES: list[int] = [44100, 48000]  # Hz, sounds resampled by 'prepare'
+CHECKPOINT_DIRECTORY: Path = Path.home() / ".flow" / "checkpoints"
+CPU_AFFINITY: list[int] | None = None  # cores on which a real-time session is pinned
+CONTROL_ADDRESS: str = "tcp://localhost:5555"  # REP socket receiving Unity messages
+EVENT_ADDRESS: str = "tcp://localhost:5556"  # PUB socket broadcasting the trials
 
 # check the variables
 check_type(DURATION_STIM, ("numeric",), "DURATION_STIM")
 check_type(DURATION_ITI, ("numeric",), "DURATION_ITI")
-assert 0.3 < DURATION_ITI - DURATION_STIM - 0.2
+check_type(DURATION_ITI_JITTER, (tuple, None), "DURATION_ITI_JITTER")
+assert AUDIO_BACKEND in ("ptb", "sounddevice", "null")
+assert ITI_MARGIN < DURATION_ITI - DURATION_STIM
+if DURATION_ITI_JITTER is not None:
+    assert ITI_MARGIN < DURATION_ITI_JITTER[0] - DURATION_STIM
+    assert DURATION_ITI_JITTER[0] <= DURATION_ITI_JITTER[1]
 assert all(elt in TRIGGERS for elt in ("standard", "target", "novel"))
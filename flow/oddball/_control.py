@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import time
+from threading import Event, Thread
+from typing import TYPE_CHECKING
+
+import numpy as np
+import zmq
+
+from ..utils._checks import check_type
+from ..utils.logs import logger, warn
+
+if TYPE_CHECKING:
+    from typing import Optional
+
+_MESSAGES: dict[str, bool] = {"hold": True, "continue": False}
+_N_LATENCIES: int = 256  # latencies of the last messages kept for the dashboard
+
+
+class ControlServer:
+    """Receive the control messages from Unity in a background thread.
+
+    The server replies ``"ACK"`` to every message received on a ZMQ ``REP`` socket and
+    exposes the hold state through :class:`threading.Event`, thus the main thread
+    can block on a state change instead of polling the socket.
+
+    Parameters
+    ----------
+    address : str
+        Address on which the ``REP`` socket is bound, e.g. ``"tcp://localhost:5555"``.
+    """
+
+    def __init__(self, address: str) -> None:
+        check_type(address, (str,), "address")
+        self._address = address
+        self._context = None
+        self._holding = Event()
+        self._running = Event()
+        self._running.set()
+        self._thread = None
+        self._latencies = np.zeros(_N_LATENCIES, dtype=np.int64)  # nanoseconds
+        self._n_messages = 0
+
+    def start(self) -> None:
+        """Bind the socket and start receiving messages."""
+        if self._thread is not None:
+            raise RuntimeError("The control server is already started.")
+        # the context is created on start and terminated on stop, thus a stopped server
+        # can be started again
+        self._context = zmq.Context()
+        socket = self._context.socket(zmq.REP)  # REP: Server side for REQ/REP pattern
+        try:
+            socket.bind(self._address)
+        except zmq.ZMQError:
+            socket.close(linger=0)
+            self._context.term()
+            self._context = None
+            raise
+        # inproc pair used to interrupt the blocking poll of the background thread
+        self._interrupt = self._context.socket(zmq.PAIR)
+        self._interrupt.bind(f"inproc://control-{id(self)}")
+        interrupt = self._context.socket(zmq.PAIR)
+        interrupt.connect(f"inproc://control-{id(self)}")
+        self._thread = Thread(target=self._run, args=(socket, interrupt), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop receiving messages and close the sockets."""
+        if self._thread is None:
+            return
+        self._interrupt.send(b"")
+        self._thread.join()
+        self._interrupt.close(linger=0)
+        self._thread = None
+        self._context.term()
+        self._context = None
+
+    def _run(self, socket: zmq.Socket, interrupt: zmq.Socket) -> None:
+        """Receive messages until interrupted."""
+        poller = zmq.Poller()
+        poller.register(socket, zmq.POLLIN)
+        poller.register(interrupt, zmq.POLLIN)
+        while True:
+            socks = dict(poller.poll())
+            if interrupt in socks:
+                break
+            start = time.perf_counter_ns()
+            message = socket.recv_string()
+            logger.info("Received message from Unity: %s", message)
+            # update the state before acknowledging, thus the state change is visible
+            # to the main thread once the client receives the reply
+            self._handle_message(message)
+            self._latencies[self._n_messages % _N_LATENCIES] = (
+                time.perf_counter_ns() - start
+            )
+            self._n_messages += 1
+            socket.send_string("ACK")
+        socket.close(linger=0)
+        interrupt.close(linger=0)
+
+    def _handle_message(self, message: str) -> None:
+        """Update the hold state based on a message."""
+        hold = _MESSAGES.get(message)
+        if hold is None:
+            warn(f"Unknown message '{message}' ignored.")
+        elif hold:
+            self._running.clear()
+            self._holding.set()
+        else:
+            self._holding.clear()
+            self._running.set()
+
+    def wait_for_resume(self, timeout: Optional[float] = None) -> bool:
+        """Block until the paradigm is resumed or until the timeout expires.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Maximum duration to wait in seconds. If None, waits indefinitely.
+
+        Returns
+        -------
+        resumed : bool
+            True if the paradigm is not holding anymore, False if the timeout expired.
+        """
+        return self._running.wait(timeout)
+
+    @property
+    def hold(self) -> bool:
+        """True if the paradigm should hold."""
+        return self._holding.is_set()
+
+    @property
+    def n_messages(self) -> int:
+        """Number of messages received."""
+        return self._n_messages
+
+    @property
+    def latencies(self) -> np.ndarray:
+        """Durations between the reception and the handling of the last messages.
+
+        The durations are in nanoseconds, for the last 256 messages at most, in no
+        particular order.
+        """
+        return self._latencies[: min(self._n_messages, _N_LATENCIES)].copy()
+
+    def __enter__(self) -> ControlServer:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..utils._checks import ensure_int
+from ..utils._dashboard import Dashboard, RateMeter, format_percentiles
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+    from typing import Optional
+
+    from ..force import ForceReader
+    from ._control import ControlServer
+
+
+class SessionStats:
+    """Counters of an oddball session, updated by the trial loop.
+
+    The counters are preallocated, thus recording a trial from the trial loop only
+    stores a value and increments a counter, while the dashboard reads them from its
+    own thread.
+
+    Parameters
+    ----------
+    n_trials : int
+        Total number of trials of the condition.
+    capacity : int
+        Number of onsets kept to compute the percentiles of the lateness.
+    """
+
+    def __init__(self, n_trials: int, capacity: int = 4096) -> None:
+        self.n_trials = ensure_int(n_trials, "n_trials")
+        self.trial = 0
+        self._lateness = np.zeros(ensure_int(capacity, "capacity"), dtype=np.int64)
+        self._n_onsets = 0
+
+    def record_onset(self, trial: int, lateness: int) -> None:
+        """Record the onset of a trial.
+
+        Parameters
+        ----------
+        trial : int
+            Number of the trial in the trial list.
+        lateness : int
+            Duration in nanoseconds between the scheduled onset and the trigger.
+        """
+        self._lateness[self._n_onsets % self._lateness.size] = lateness
+        self._n_onsets += 1
+        self.trial = trial
+
+    @property
+    def lateness(self) -> np.ndarray:
+        """Lateness of the last onsets in nanoseconds, in no particular order."""
+        return self._lateness[: min(self._n_onsets, self._lateness.size)].copy()
+
+
+def _render_session(
+    stats: SessionStats,
+    control: ControlServer,
+    reader: Optional[ForceReader],
+) -> Callable[[], list[str]]:
+    """Create the function rendering the dashboard of an oddball session."""
+    meter = RateMeter()
+
+    def render() -> list[str]:
+        lateness = stats.lateness
+        lines = [
+            f"Trial       {stats.trial} / {stats.n_trials}"
+            f"{'  (holding)' if control.hold else ''}",
+            f"Onset jitter (ms, {lateness.size} onsets)  "
+            f"{format_percentiles(lateness)}",
+            f"Control latency (ms, {control.n_messages} messages)  "
+            f"{format_percentiles(control.latencies)}",
+        ]
+        if reader is None:
+            lines.append("Force       no stream")
+        else:
+            rate = meter.update(reader.n_samples)
+            lines.append(
+                f"Force       {rate:.1f} samples/s, stale {reader.n_stale} times"
+                f"{'  (stale)' if reader.stale else ''}"
+            )
+        return lines
+
+    return render
+
+
+@contextmanager
+def open_dashboard(
+    stats: SessionStats, control: ControlServer
+) -> Generator[Dashboard, None, None]:
+    """Display the dashboard of an oddball session.
+
+    The force stream is read from the shared memory ring written by
+    ``flow forward-force --shm``, if it exists.
+
+    Parameters
+    ----------
+    stats : SessionStats
+        The counters of the session.
+    control : ControlServer
+        The control server receiving the messages from Unity.
+    """
+    from ..force import ForceReader
+
+    try:
+        reader = ForceReader()
+    except (FileNotFoundError, ValueError):
+        reader = None
+    try:
+        with Dashboard(_render_session(stats, control, reader)) as dashboard:
+            yield dashboard
+    finally:
+        if reader is not None:
+            reader.close()
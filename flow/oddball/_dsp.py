@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from math import ceil, gcd
+
+import numpy as np
+
+from ..utils._checks import check_type, ensure_int
+
+
+def resample_poly(
+    data: np.ndarray,
+    up: int,
+    down: int,
+    *,
+    half_width: int = 10,
+    beta: float = 5.0,
+) -> np.ndarray:
+    """Resample a signal by a rational factor with a polyphase FIR filter.
+
+    The anti-aliasing low-pass filter is a Kaiser-windowed sinc, designed as in
+    :func:`scipy.signal.resample_poly`. Only the output samples are computed: each
+    output sample is the dot product of the input samples surrounding it with one of
+    the ``up`` phases of the filter, evaluated for all the output samples at once.
+
+    Parameters
+    ----------
+    data : array of shape (n_samples, n_channels)
+        The signal to resample.
+    up : int
+        Upsampling factor.
+    down : int
+        Downsampling factor.
+    half_width : int
+        Half-width of the filter, in number of zero-crossings of the sinc.
+    beta : float
+        Shape parameter of the Kaiser window.
+
+    Returns
+    -------
+    data : array of shape (n_samples * up / down, n_channels)
+        The resampled signal, with the same dtype as the input.
+    """
+    check_type(data, (np.ndarray,), "data")
+    up = ensure_int(up, "up")
+    down = ensure_int(down, "down")
+    if up <= 0 or down <= 0:
+        raise ValueError(f"The factors must be positive, got {up} and {down}.")
+    factor = gcd(up, down)
+    up, down = up // factor, down // factor
+    if up == down == 1:
+        return data.copy()
+    # low-pass filter at the lowest Nyquist frequency, with a gain 'up' to compensate
+    # the zeros inserted by the upsampling
+    max_rate = max(up, down)
+    n_taps = 2 * half_width * max_rate + 1
+    t = np.arange(n_taps) - (n_taps - 1) / 2
+    h = np.sinc(t / max_rate) * np.kaiser(n_taps, beta)
+    h *= up / h.sum()
+    # polyphase decomposition, phase p holds the taps h[p], h[p + up], ..
+    n_phase_taps = ceil(n_taps / up)
+    phases = np.zeros(n_phase_taps * up)
+    phases[:n_taps] = h
+    phases = phases.reshape(n_phase_taps, up).T
+    # position of the output samples on the upsampled grid, delayed by the half
+    # length of the filter to center it
+    n_in = data.shape[0]
+    n_out = ceil(n_in * up / down)
+    k = np.arange(n_out) * down + (n_taps - 1) // 2
+    idx = (k // up)[:, np.newaxis] - np.arange(n_phase_taps)
+    # zero-pad the input on both sides to evaluate the filter on the edges
+    padded = np.zeros((n_in + 2 * n_phase_taps, data.shape[1]), dtype=np.float64)
+    padded[n_phase_taps : n_phase_taps + n_in] = data
+    out = np.einsum("mi,mic->mc", phases[k % up], padded[idx + n_phase_taps])
+    return out.astype(data.dtype, copy=False)
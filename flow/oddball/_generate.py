@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..utils._checks import check_type, ensure_int, ensure_path
+from ..utils.logs import logger
+from ._prepare import _TRIALS_DTYPE
+from ._utils import list_novel_sounds
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Optional, Union
+
+# number of lists generated at once by a worker, independent of the number of jobs
+# to yield the same lists for a given seed
+_CHUNK_SIZE: int = 256
+# codes of the stimuli in the generated sequences
+_STANDARD: int = 0
+_TARGET: int = 1
+_NOVEL: int = 2
+
+
+def generate_trial_lists(
+    n_lists: int,
+    n_trials: int,
+    *,
+    p_target: float = 0.1,
+    p_novel: float = 0.1,
+    min_spacing: int = 2,
+    cross_every: Optional[int] = None,
+    seed: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+) -> list[np.ndarray]:
+    """Generate random trial lists.
+
+    The deviants (targets and novels) are placed uniformly at random among the
+    positions respecting the minimum spacing, without rejection sampling, and every
+    novel sound is used at most once per list. The lists are generated in chunks of
+    vectorized operations across a pool of processes.
+
+    Parameters
+    ----------
+    n_lists : int
+        Number of trial lists to generate.
+    n_trials : int
+        Number of sounds in each list.
+    p_target : float
+        Proportion of targets, rounded to the closest number of trials.
+    p_novel : float
+        Proportion of novels, rounded to the closest number of trials.
+    min_spacing : int
+        Minimum distance between 2 deviants, e.g. ``2`` to have at least one standard
+        between 2 deviants. ``1`` disables the constraint.
+    cross_every : int | None
+        If provided, a ``"cross"`` is inserted before every ``cross_every`` sounds.
+        The crosses are not supported by the runtime of :func:`~flow.oddball.oddball`,
+        which rejects such lists.
+    seed : int | None
+        Seed of the random number generator, for reproducible lists. The lists do not
+        depend on ``n_jobs``.
+    n_jobs : int | None
+        Number of worker processes. If None, uses the number of CPUs.
+
+    Returns
+    -------
+    trial_lists : list of array
+        The trial lists as structured arrays with the fields ``idx`` and ``trial``,
+        the format of the trial lists compiled by :func:`~flow.oddball.prepare`. A
+        list can be written to the text format with
+        :func:`~flow.oddball.write_trial_list`.
+    """
+    n_lists = ensure_int(n_lists, "n_lists")
+    n_trials = ensure_int(n_trials, "n_trials")
+    for var, name in ((p_target, "p_target"), (p_novel, "p_novel")):
+        check_type(var, ("numeric",), name)
+        if not 0 <= var <= 1:
+            raise ValueError(f"'{name}' must be between 0 and 1, got {var}.")
+    min_spacing = ensure_int(min_spacing, "min_spacing")
+    if cross_every is not None:
+        cross_every = ensure_int(cross_every, "cross_every")
+        if cross_every <= 0:
+            raise ValueError(f"'cross_every' must be positive, got {cross_every}.")
+    n_jobs = os.cpu_count() if n_jobs is None else ensure_int(n_jobs, "n_jobs")
+    if n_lists <= 0 or n_trials <= 0 or min_spacing <= 0 or n_jobs <= 0:
+        raise ValueError(
+            "The number of lists, trials, jobs and the minimum spacing must be "
+            f"positive, got {n_lists}, {n_trials}, {n_jobs} and {min_spacing}."
+        )
+    n_target = round(p_target * n_trials)
+    n_novel = round(p_novel * n_trials)
+    n_deviants = n_target + n_novel
+    if n_trials < n_deviants + max(n_deviants - 1, 0) * (min_spacing - 1):
+        raise ValueError(
+            f"{n_deviants} deviants spaced by at least {min_spacing} trials do not fit "
+            f"in {n_trials} trials."
+        )
+    novels = list_novel_sounds()
+    if len(novels) < n_novel:
+        raise ValueError(
+            f"{n_novel} novels are requested but only {len(novels)} novel sounds are "
+            "available."
+        )
+    start = time.perf_counter()
+    chunks = [
+        (min(_CHUNK_SIZE, n_lists - k), child)
+        for k, child in zip(
+            range(0, n_lists, _CHUNK_SIZE),
+            np.random.SeedSequence(seed).spawn(-(-n_lists // _CHUNK_SIZE)),
+        )
+    ]
+    args = (n_trials, n_target, n_novel, min_spacing, len(novels))
+    if n_jobs == 1 or len(chunks) == 1:
+        results = [_generate_chunk(size, child, *args) for size, child in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(chunks))) as executor:
+            futures = [
+                executor.submit(_generate_chunk, size, child, *args)
+                for size, child in chunks
+            ]
+            results = [future.result() for future in futures]
+    names = np.array(["standard", "target", *novels], dtype=_TRIALS_DTYPE["trial"])
+    trial_lists = np.empty((n_lists, n_trials), dtype=_TRIALS_DTYPE)
+    trial_lists["idx"] = np.arange(1, n_trials + 1)
+    trial_lists["trial"] = names[np.concatenate(results)]
+    if cross_every is not None:
+        # a cross shares the idx of the next sound
+        pos = np.arange(0, n_trials, cross_every)
+        cross = np.empty(pos.size, dtype=_TRIALS_DTYPE)
+        cross["idx"] = pos + 1
+        cross["trial"] = "cross"
+        trial_lists = np.insert(trial_lists, pos, cross, axis=1)
+    trial_lists = list(trial_lists)
+    duration = time.perf_counter() - start
+    logger.info(
+        "Generated %i trial lists in %.2f s (%.0f lists/s).",
+        n_lists,
+        duration,
+        n_lists / duration,
+    )
+    return trial_lists
+
+
+def _generate_chunk(
+    n_lists: int,
+    seed: np.random.SeedSequence,
+    n_trials: int,
+    n_target: int,
+    n_novel: int,
+    min_spacing: int,
+    n_novels: int,
+) -> np.ndarray:
+    """Generate a chunk of trial lists with vectorized operations.
+
+    The chunk is returned as the indices of the stimuli of shape (n_lists, n_trials),
+    a compact representation to transfer between processes.
+    """
+    rng = np.random.default_rng(seed)
+    n_deviants = n_target + n_novel
+    # stars and bars: sampling n_deviants distinct slots among n_slots and shifting
+    # the k-th slot by k * (min_spacing - 1) yields uniformly distributed positions
+    # respecting the minimum spacing
+    n_slots = n_trials - max(n_deviants - 1, 0) * (min_spacing - 1)
+    slots = np.argsort(rng.random((n_lists, n_slots)), axis=1)[:, :n_deviants]
+    positions = np.sort(slots, axis=1) + np.arange(n_deviants) * (min_spacing - 1)
+    labels = np.repeat([_TARGET, _NOVEL], [n_target, n_novel])
+    labels = rng.permuted(np.tile(labels, (n_lists, 1)), axis=1)
+    # index of the stimulus of each trial, the novels are drawn without
+    # replacement and appear in order of their random draw
+    codes = np.full((n_lists, n_trials), _STANDARD, dtype=np.intp)
+    rows = np.arange(n_lists)[:, np.newaxis]
+    codes[rows, positions] = labels
+    draws = rng.permuted(np.tile(np.arange(n_novels), (n_lists, 1)), axis=1)
+    is_novel = codes == _NOVEL
+    codes[is_novel] += draws[:, :n_novel].ravel()
+    return codes.astype(np.uint16)
+
+
+def write_trial_list(
+    trials: np.ndarray,
+    fname: Union[str, Path],
+    itis: Optional[np.ndarray] = None,
+) -> None:
+    """Write a trial list in the text format of the trialList directory.
+
+    Parameters
+    ----------
+    trials : array | list of tuple
+        Trial list, as generated by :func:`~flow.oddball.generate_trial_lists` or as
+        parsed from a text file.
+    fname : path-like
+        Path to the ``.txt`` file to write.
+    itis : array of shape (n_trials,) | None
+        If provided, the ITI of every trial in seconds, written as a third column.
+    """
+    fname = ensure_path(fname, must_exist=False)
+    if itis is not None and len(itis) != len(trials):
+        raise ValueError(
+            f"The number of ITIs {len(itis)} does not match the number of trials "
+            f"{len(trials)}."
+        )
+    with open(fname, "w") as fid:
+        if itis is None:
+            fid.writelines(f"{idx}, {trial}\n" for idx, trial in trials)
+        else:
+            fid.writelines(
+                f"{idx}, {trial}, {iti:.6g}\n"
+                for (idx, trial), iti in zip(trials, itis)
+            )
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import wave
+from hashlib import blake2b
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..utils._checks import ensure_path
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Union
+
+
+def read_wav(fname: Union[str, Path]) -> tuple[np.ndarray, int]:
+    """Read a PCM WAV file.
+
+    Parameters
+    ----------
+    fname : path-like
+        Path to the WAV file, encoded in 8, 16, 24 or 32 bits PCM.
+
+    Returns
+    -------
+    data : array of shape (n_samples, n_channels)
+        The audio samples as float32 between -1 and 1.
+    sample_rate : int
+        The sample rate in Hz.
+    """
+    fname = ensure_path(fname, must_exist=True)
+    with wave.open(str(fname), "rb") as fid:
+        n_channels = fid.getnchannels()
+        sample_width = fid.getsampwidth()
+        sample_rate = fid.getframerate()
+        raw = fid.readframes(fid.getnframes())
+    if sample_width == 1:  # unsigned 8 bits
+        data = np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128
+    elif sample_width == 3:  # pad 24 bits samples to little-endian int32
+        raw = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        padded = np.zeros((raw.shape[0], 4), dtype=np.uint8)
+        padded[:, 1:] = raw
+        data = padded.view("<i4").ravel().astype(np.float32) / 256
+    elif sample_width in (2, 4):
+        data = np.frombuffer(raw, dtype=f"<i{sample_width}").astype(np.float32)
+    else:
+        raise ValueError(
+            f"The WAV file '{fname}' is encoded with an unsupported sample width of "
+            f"{sample_width} bytes."
+        )
+    data /= 2 ** (8 * sample_width - 1)
+    return data.reshape(-1, n_channels), sample_rate
+
+
+def hash_file(fname: Union[str, Path]) -> str:
+    """Hash the content of a file.
+
+    Parameters
+    ----------
+    fname : path-like
+        Path to the file.
+
+    Returns
+    -------
+    digest : str
+        Hexadecimal digest of the file content.
+    """
+    fname = ensure_path(fname, must_exist=True)
+    with open(fname, "rb") as fid:
+        return blake2b(fid.read(), digest_size=16).hexdigest()
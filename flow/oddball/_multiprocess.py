@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import multiprocessing
+import time
+from contextlib import nullcontext
+from functools import partial
+from typing import TYPE_CHECKING
+
+from byte_triggers import MockTrigger, ParallelPortTrigger
+from pynput import keyboard
+
+from ..utils.logs import logger, set_log_level
+from ._audio import create_backend
+from ._checkpoint import Checkpoint
+from ._config import (
+    AUDIO_BACKEND,
+    AUDIO_DEVICE,
+    AUDIO_VOLUME,
+    CONTROL_ADDRESS,
+    CPU_AFFINITY,
+    DURATION_STIM,
+    EVENT_ADDRESS,
+    TRIGGER_ADDRESS,
+)
+from ._control import ControlServer
+from ._publisher import EventPublisher
+from ._runtime import RealtimeSession
+from ._shared import (
+    DONE,
+    FAILED,
+    LOADING,
+    LOG_DTYPE,
+    READY,
+    RUNNING,
+    EventRing,
+    RingHandler,
+    SharedState,
+    handle_records,
+)
+from ._time import PTBClock
+from ._utils import _load_sounds
+
+if TYPE_CHECKING:
+    from multiprocessing.synchronize import Event
+    from pathlib import Path
+    from typing import Optional
+
+    import numpy as np
+
+_POLL_INTERVAL: float = 0.001  # seconds, start polling in the stimulus process
+_DRAIN_INTERVAL: float = 0.01  # seconds, log ring draining in the main process
+
+
+class _SharedController:
+    """Controller reading the hold state from the shared memory.
+
+    The hold state is read from the shared memory without lock in the trial loop,
+    while a hold period blocks on an event set by the main process on resume.
+
+    Parameters
+    ----------
+    state : SharedState
+        The state shared with the main process, which receives the messages.
+    resume : Event
+        Event set by the main process while the paradigm is not holding.
+    """
+
+    def __init__(self, state: SharedState, resume: Event) -> None:
+        self._state = state
+        self._resume = resume
+
+    def wait_for_resume(self, timeout: Optional[float] = None) -> bool:
+        """Block until the paradigm is resumed or until the timeout expires.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Maximum duration to wait in seconds. If None, waits indefinitely.
+
+        Returns
+        -------
+        resumed : bool
+            True if the paradigm is not holding anymore, False if the timeout expired.
+        """
+        return self._resume.wait(timeout)
+
+    @property
+    def hold(self) -> bool:
+        """True if the paradigm should hold."""
+        return self._state.hold
+
+
+class _SharedControlServer(ControlServer):
+    """Control server publishing the hold state to the stimulus process."""
+
+    def __init__(self, address: str, state: SharedState, resume: Event) -> None:
+        super().__init__(address)
+        self._state = state
+        self._resume = resume
+
+    def _handle_message(self, message: str) -> None:
+        super()._handle_message(message)
+        # the flag read by the trial loop is set after the event is cleared and
+        # cleared before the event is set, thus a hold period never ends on a stale
+        # event and a resumed trial loop never reads a stale flag
+        if self.hold:
+            self._resume.clear()
+            self._state.hold = True
+        else:
+            self._state.hold = False
+            self._resume.set()
+
+
+def run_multiprocess(
+    condition: str,
+    trials: list[tuple[int, str]],
+    onsets: np.ndarray,
+    fname_checkpoint: Path,
+    mock: bool,
+    realtime: bool,
+) -> None:
+    """Run the oddball paradigm with the stimulus loop in a dedicated process.
+
+    The stimulus process loads the sounds and the trigger and runs the trial loop. The
+    main process receives the messages from Unity, logs the responses and outputs the
+    logs of the stimulus process. The trial events are published to Unity by the
+    stimulus process. The hold state and the status of the stimulus process
+    are shared through :class:`~flow.oddball._shared.SharedState`, a hold period
+    blocks on an event set on resume, and the logs are sent through an
+    :class:`~flow.oddball._shared.EventRing`, thus the stimulus process never waits on
+    the main process. Both processes share the origin of their clock.
+
+    Parameters
+    ----------
+    condition : str
+        Oddball condition to run.
+    trials : list of tuple
+        Parsed trial list of the condition.
+    onsets : array of shape (n_trials + 1,)
+        The onsets in nanoseconds relative to the first trial.
+    fname_checkpoint : Path
+        Path to the checkpoint of the condition, created beforehand.
+    mock : bool
+        If True, uses a MockTrigger instead of a ParallelPortTrigger.
+    realtime : bool
+        If True, run the trial loop in a
+        :class:`~flow.oddball._runtime.RealtimeSession`.
+    """
+    from .oddball import _callback_on_press
+
+    clock = PTBClock()
+    context = multiprocessing.get_context("spawn")
+    resume = context.Event()
+    resume.set()
+    with SharedState() as state, EventRing(LOG_DTYPE) as ring:
+        process = context.Process(
+            target=_stimulus_process,
+            args=(condition, trials, onsets, fname_checkpoint, mock, realtime),
+            kwargs=dict(
+                t0=clock.to_ptb(0),
+                state=state.name,
+                ring=ring.name,
+                resume=resume,
+                level=logger.level,
+            ),
+            name="oddball-stimulus",
+            daemon=True,
+        )
+        process.start()
+        try:
+            _drain(ring, process, state, LOADING)
+            if state.status != READY:
+                raise RuntimeError("The stimulus process failed to start.")
+            input(">>> Press ENTER to start.")
+            callback = partial(_callback_on_press, clock=clock)
+            with _SharedControlServer(CONTROL_ADDRESS, state, resume):
+                with keyboard.Listener(on_press=callback):
+                    state.status = RUNNING
+                    _drain(ring, process, state, RUNNING)
+            process.join()
+            if state.status != DONE:
+                raise RuntimeError(
+                    f"The stimulus process failed with exit code {process.exitcode}."
+                )
+        finally:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            handle_records(logger, ring.pop())
+            if ring.dropped != 0:
+                logger.warning("%i log records were dropped.", ring.dropped)
+
+
+def _drain(
+    ring: EventRing,
+    process: multiprocessing.Process,
+    state: SharedState,
+    status: int,
+) -> None:
+    """Output the logs of the stimulus process while it is in a given status."""
+    while state.status == status and process.is_alive():
+        handle_records(logger, ring.pop())
+        time.sleep(_DRAIN_INTERVAL)
+    handle_records(logger, ring.pop())
+
+
+def _stimulus_process(
+    condition: str,
+    trials: list[tuple[int, str]],
+    onsets: np.ndarray,
+    fname_checkpoint: Path,
+    mock: bool,
+    realtime: bool,
+    *,
+    t0: float,
+    state: str,
+    ring: str,
+    resume: Event,
+    level: int,
+) -> None:
+    """Entry point of the stimulus process."""
+    from .oddball import _run_trials
+
+    state = SharedState(state)
+    ring = EventRing(LOG_DTYPE, name=ring)
+    # the console and file outputs are left to the main process
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    ring_handler = RingHandler(ring)
+    logger.addHandler(ring_handler)
+    set_log_level(level)
+    try:
+        checkpoint = Checkpoint(fname_checkpoint, condition, trials, resume=True)
+        backend = create_backend(AUDIO_BACKEND, AUDIO_DEVICE)
+        sounds = _load_sounds(
+            trials[checkpoint.counter :], DURATION_STIM, backend, AUDIO_VOLUME
+        )
+        trigger = MockTrigger() if mock else ParallelPortTrigger(TRIGGER_ADDRESS)
+        clock = backend.create_clock(t0)
+        state.status = READY
+        while state.status == READY:
+            time.sleep(_POLL_INTERVAL)
+        runtime = RealtimeSession(CPU_AFFINITY) if realtime else nullcontext()
+        with backend, checkpoint, EventPublisher(EVENT_ADDRESS) as publisher:
+            with runtime as session:
+                _run_trials(
+                    trials,
+                    checkpoint,
+                    sounds,
+                    trigger,
+                    clock,
+                    _SharedController(state, resume),
+                    session,
+                    onsets,
+                    publisher,
+                )
+        state.status = DONE
+    except BaseException as error:
+        # the traceback is printed on stderr by multiprocessing
+        logger.error("The stimulus process failed: %r", error)
+        state.status = FAILED
+        raise
+    finally:
+        logger.removeHandler(ring_handler)
+        state.close()
+        ring.close()
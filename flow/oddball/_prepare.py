@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from importlib.resources import files
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..utils._checks import check_type, ensure_int, ensure_path
+from ..utils.logs import logger, warn
+from ._archive import SoundArchive, write_sound_archive
+from ._config import CACHE_DIRECTORY, SAMPLE_RATES
+from ._dsp import resample_poly
+from ._io import hash_file, read_wav
+from ._schedule import parse_itis
+from ._utils import parse_trial_list
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any, Optional, Union
+
+_ARCHIVE: str = "sounds.pack"
+_MANIFEST_VERSION: int = 6
+_RESOURCES: tuple[str, ...] = ("sounds", "trialList")
+_TRIALS_DTYPE = np.dtype([("idx", "<u4"), ("trial", "<U16")])
+
+
+def prepare(
+    directory: Optional[Union[str, Path]] = None,
+    n_jobs: Optional[int] = None,
+    sample_rates: Optional[list[int]] = None,
+) -> Path:
+    """Parse, validate and compile the trial lists and decode the sounds.
+
+    The trial lists of every condition and every sound are processed in parallel.
+    The trial lists are stored as ``.npy`` files and the sounds are packed in a single
+    archive ``sounds.pack``, see :func:`~flow.oddball._archive.write_sound_archive`,
+    which are memory-mapped when a session starts, alongside a manifest
+    ``manifest.json`` describing the prepared artifacts. The
+    loudness of the novel sounds is normalized by a gain stored in the manifest, see
+    :func:`_compute_gains`, and every sound is resampled offline to the sample rates
+    of the audio devices, see :func:`~flow.oddball._dsp.resample_poly`.
+
+    Parameters
+    ----------
+    directory : path-like | None
+        Directory in which the prepared artifacts are stored. If None,
+        ``CACHE_DIRECTORY`` is used.
+    n_jobs : int | None
+        Number of worker processes. If None, uses the number of CPUs.
+    sample_rates : list of int | None
+        Sample rates in Hz at which the sounds are stored. If None, ``SAMPLE_RATES`` is
+        used.
+
+    Returns
+    -------
+    fname : Path
+        Path to the manifest.
+    """
+    directory = CACHE_DIRECTORY if directory is None else directory
+    directory = ensure_path(directory, must_exist=False)
+    n_jobs = os.cpu_count() if n_jobs is None else ensure_int(n_jobs, "n_jobs")
+    if n_jobs <= 0:
+        raise ValueError(f"The number of jobs must be positive, got {n_jobs}.")
+    sample_rates = SAMPLE_RATES if sample_rates is None else sample_rates
+    check_type(sample_rates, (list, tuple), "sample_rates")
+    sample_rates = sorted({ensure_int(rate, "sample_rate") for rate in sample_rates})
+    (directory / "trialList").mkdir(parents=True, exist_ok=True)
+    # stat the resource directories before listing them, thus a file added during the
+    # preparation invalidates the listing
+    resources = _stat_resources()
+    trial_lists = sorted(
+        elt
+        for elt in (files("flow.oddball") / "trialList").iterdir()
+        if elt.is_file() and elt.suffix == ".txt"
+    )
+    sounds = sorted(
+        elt
+        for elt in (files("flow.oddball") / "sounds").iterdir()
+        if elt.is_file() and elt.suffix == ".wav"
+    )
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures_conditions = {
+            elt.stem: executor.submit(_compile_trial_list, elt, directory)
+            for elt in trial_lists
+        }
+        futures_sounds = {
+            elt.name.split("-")[0]: executor.submit(_decode_sound, elt, sample_rates)
+            for elt in sounds
+        }
+        conditions = {
+            key: future.result() for key, future in futures_conditions.items()
+        }
+        entries, variants = dict(), list()
+        for key, future in futures_sounds.items():
+            entries[key], data = future.result()
+            variants.extend((key, rate, elt) for rate, elt in data.items())
+    _open_archive.cache_clear()  # release the mapping of the previous archive
+    fname_archive = write_sound_archive(directory / _ARCHIVE, variants)
+    manifest = {
+        "version": _MANIFEST_VERSION,
+        "resources": resources,
+        "conditions": conditions,
+        "archive": {"file": _ARCHIVE, **_source_info(fname_archive)},
+        "sounds": entries,
+    }
+    _compute_gains(manifest["sounds"])
+    fname = directory / "manifest.json"
+    # write to a temporary file first to replace the manifest atomically
+    with open(fname.with_suffix(".tmp"), "w") as fid:
+        json.dump(manifest, fid, indent=2)
+    os.replace(fname.with_suffix(".tmp"), fname)
+    _read_manifest.cache_clear()
+    _list_resources.cache_clear()
+    logger.info(
+        "Prepared %i conditions and %i sounds in %s.",
+        len(manifest["conditions"]),
+        len(manifest["sounds"]),
+        directory,
+    )
+    return fname
+
+
+def _compile_trial_list(fname: Path, directory: Path) -> dict[str, Any]:
+    """Parse and validate a trial list and store it as a structured array.
+
+    The ITIs defined in the trial list, if any, are stored in a separate array.
+    """
+    trials = parse_trial_list(fname)
+    array = np.array(trials, dtype=_TRIALS_DTYPE)
+    fname_out = f"trialList/{fname.stem}.npy"
+    np.save(directory / fname_out, array)
+    itis = parse_itis(fname)
+    if itis is None:
+        fname_itis = None
+    else:
+        fname_itis = f"trialList/{fname.stem}-itis.npy"
+        np.save(directory / fname_itis, itis)
+    return {
+        "file": fname_out,
+        "itis": fname_itis,
+        "n_trials": len(trials),
+        **_source_info(fname),
+    }
+
+
+def _decode_sound(
+    fname: Path, sample_rates: list[int]
+) -> tuple[dict[str, Any], dict[int, np.ndarray]]:
+    """Decode a WAV file and resample it at every sample rate."""
+    data, sample_rate = read_wav(fname)
+    variants = {
+        rate: data if rate == sample_rate else resample_poly(data, rate, sample_rate)
+        for rate in sample_rates
+    }
+    entry = {
+        "sample_rate": sample_rate,
+        "sample_rates": sample_rates,
+        "rms": float(np.sqrt(np.mean(np.square(data, dtype=np.float64)))),
+        "peak": float(np.max(np.abs(data))),
+        **_source_info(fname),
+    }
+    return entry, variants
+
+
+def _compute_gains(sounds: dict[str, dict[str, Any]]) -> None:
+    """Compute the gain normalizing the loudness of every novel sound.
+
+    The novel sounds are scaled to the median RMS of the library, thus the average
+    loudness is unchanged, while the tones are left untouched. The gains are limited to
+    prevent clipping. The gains are computed in bulk on the RMS and peak values
+    measured by the workers and stored in each entry, next to the hash of the source.
+    """
+    names = [name for name in sounds if name.startswith("wav")]
+    for entry in sounds.values():
+        entry["gain"] = 1.0
+    if len(names) == 0:
+        return
+    rms = np.array([sounds[name]["rms"] for name in names])
+    peak = np.array([sounds[name]["peak"] for name in names])
+    with np.errstate(divide="ignore"):
+        gains = np.minimum(np.median(rms) / rms, 1 / peak)
+    gains[~np.isfinite(gains)] = 1.0  # silent files
+    for name, gain in zip(names, gains):
+        sounds[name]["gain"] = float(gain)
+
+
+def _source_info(fname: Path) -> dict[str, Any]:
+    """Describe a source file of a prepared artifact."""
+    stat = os.stat(fname)
+    return {
+        "hash": hash_file(fname),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _is_fresh(entry: Optional[dict[str, Any]], fname: Path) -> bool:
+    """Check if a prepared artifact is up to date with its source file.
+
+    The comparison is based on the size and modification time of the source file, to
+    avoid reading it. The modification time changes when the package is reinstalled or
+    checked out, in which case the hash of the source file is compared.
+    """
+    if entry is None:
+        return False
+    try:
+        stat = os.stat(fname)
+    except OSError:
+        return False
+    if entry["size"] != stat.st_size:
+        return False
+    return entry["mtime_ns"] == stat.st_mtime_ns or entry["hash"] == hash_file(fname)
+
+
+@lru_cache(maxsize=4)
+def _read_manifest(directory: Path) -> dict[str, Any]:
+    """Read the manifest of prepared artifacts, empty if missing or invalid."""
+    try:
+        with open(directory / "manifest.json") as fid:
+            manifest = json.load(fid)
+    except (OSError, ValueError):
+        return dict()
+    if manifest.get("version") != _MANIFEST_VERSION:
+        return dict()
+    return manifest
+
+
+@lru_cache(maxsize=4)
+def _open_archive(fname: Path) -> SoundArchive:
+    """Open and memory-map a sound archive once."""
+    return SoundArchive(fname)
+
+
+def _stat_resources() -> dict[str, int]:
+    """Get the modification time of the resource directories of the package.
+
+    The modification time of a directory changes when a file is added, removed or
+    renamed in it.
+    """
+    return {
+        name: os.stat(files("flow.oddball") / name).st_mtime_ns for name in _RESOURCES
+    }
+
+
+def _scan_resources() -> dict[str, tuple[str, ...]]:
+    """Scan the resource directories of the package."""
+    sounds = list()
+    for file in (files("flow.oddball") / "sounds").iterdir():
+        if file.suffix != ".wav":
+            warn(f"Non-wav file {file} found in the sounds directory.")
+            continue
+        sounds.append(file.name.split("-")[0])
+    conditions = [
+        elt.stem
+        for elt in (files("flow.oddball") / "trialList").iterdir()
+        if elt.is_file() and elt.suffix == ".txt"
+    ]
+    return {"sounds": tuple(sorted(sounds)), "conditions": tuple(sorted(conditions))}
+
+
+@lru_cache(maxsize=4)
+def _list_resources(directory: Path) -> dict[str, tuple[str, ...]]:
+    """List the resources from the manifest, or by scanning if it is stale."""
+    manifest = _read_manifest(directory)
+    try:
+        fresh = manifest.get("resources") == _stat_resources()
+    except OSError:
+        fresh = False
+    if not fresh:
+        logger.debug("The manifest in %s is missing or stale, scanning.", directory)
+        return _scan_resources()
+    return {
+        "sounds": tuple(sorted(manifest["sounds"])),
+        "conditions": tuple(sorted(manifest["conditions"])),
+    }
+
+
+def list_resources(
+    directory: Optional[Union[str, Path]] = None,
+) -> dict[str, tuple[str, ...]]:
+    """List the sounds and the conditions shipped with the package.
+
+    The listing is read once from the manifest written by :func:`prepare` and cached.
+    The resource directories are only scanned if the manifest is missing or stale,
+    i.e. if a file was added, removed or renamed in the ``sounds`` or ``trialList``
+    directories since the preparation.
+
+    Parameters
+    ----------
+    directory : path-like | None
+        Directory in which the prepared artifacts are stored. If None,
+        ``CACHE_DIRECTORY`` is used.
+
+    Returns
+    -------
+    resources : dict
+        The sorted names of the ``"sounds"``, e.g. ``"low_tone"`` or ``"wav0001"``,
+        and of the ``"conditions"``, e.g. ``"main1"``.
+    """
+    directory = CACHE_DIRECTORY if directory is None else directory
+    directory = ensure_path(directory, must_exist=False)
+    return _list_resources(directory)
+
+
+def load_prepared_trials(
+    condition: str, directory: Optional[Union[str, Path]] = None
+) -> Optional[list[tuple[int, str]]]:
+    """Load a prepared trial list.
+
+    Parameters
+    ----------
+    condition : str
+        Oddball condition.
+    directory : path-like | None
+        Directory in which the prepared artifacts are stored. If None,
+        ``CACHE_DIRECTORY`` is used.
+
+    Returns
+    -------
+    trials : list of tuple | None
+        The trial list, or None if the condition was not prepared or if the trial
+        list changed since it was prepared.
+    """
+    check_type(condition, (str,), "condition")
+    directory = CACHE_DIRECTORY if directory is None else directory
+    directory = ensure_path(directory, must_exist=False)
+    entry = _read_manifest(directory).get("conditions", {}).get(condition)
+    fname = files("flow.oddball") / "trialList" / f"{condition}.txt"
+    if not _is_fresh(entry, fname):
+        return None
+    array = np.load(directory / entry["file"], mmap_mode="r")
+    return array.tolist()
+
+
+def load_prepared_itis(
+    condition: str, directory: Optional[Union[str, Path]] = None
+) -> Optional[np.ndarray]:
+    """Load the ITIs of a prepared trial list.
+
+    Parameters
+    ----------
+    condition : str
+        Oddball condition.
+    directory : path-like | None
+        Directory in which the prepared artifacts are stored. If None,
+        ``CACHE_DIRECTORY`` is used.
+
+    Returns
+    -------
+    itis : array of shape (n_trials,) | None
+        The ITI of every trial in seconds, see
+        :func:`~flow.oddball._schedule.parse_itis`, or None if the trial list does not
+        define the ITIs. As for :func:`load_prepared_trials`, None is also returned if
+        the condition was not prepared or if the trial list changed since it was
+        prepared.
+    """
+    check_type(condition, (str,), "condition")
+    directory = CACHE_DIRECTORY if directory is None else directory
+    directory = ensure_path(directory, must_exist=False)
+    entry = _read_manifest(directory).get("conditions", {}).get(condition)
+    fname = files("flow.oddball") / "trialList" / f"{condition}.txt"
+    if not _is_fresh(entry, fname) or entry["itis"] is None:
+        return None
+    return np.load(directory / entry["itis"])
+
+
+def load_prepared_sound(
+    name: str,
+    directory: Optional[Union[str, Path]] = None,
+    sample_rate: Optional[int] = None,
+) -> Optional[tuple[np.ndarray, int, float]]:
+    """Load a prepared sound.
+
+    Parameters
+    ----------
+    name : str
+        Name of the sound, e.g. ``"low_tone"`` or ``"wav0000"``.
+    directory : path-like | None
+        Directory in which the prepared artifacts are stored. If None,
+        ``CACHE_DIRECTORY`` is used.
+    sample_rate : int | None
+        Sample rate in Hz of the variant to load. If None, the sample rate of the
+        source file is used.
+
+    Returns
+    -------
+    sound : tuple | None
+        The memory-mapped samples of shape ``(n_samples, n_channels)``, the sample rate
+        in Hz and the gain normalizing the loudness of the sound, or None if the sound
+        was not prepared at this sample rate or if the sound changed since it was
+        prepared.
+    """
+    check_type(name, (str,), "name")
+    directory = CACHE_DIRECTORY if directory is None else directory
+    directory = ensure_path(directory, must_exist=False)
+    entry = _read_manifest(directory).get("sounds", {}).get(name)
+    fname = files("flow.oddball") / "sounds" / f"{name}-48000.wav"
+    if not _is_fresh(entry, fname):
+        return None
+    sample_rate = (
+        entry["sample_rate"]
+        if sample_rate is None
+        else ensure_int(sample_rate, "sample_rate")
+    )
+    archive = _read_manifest(directory)["archive"]
+    if not _is_fresh(archive, directory / archive["file"]):
+        return None
+    data = _open_archive(directory / archive["file"]).get(name, sample_rate)
+    if data is None:
+        return None
+    return data, sample_rate, entry["gain"]
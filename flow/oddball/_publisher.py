@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING
+
+import zmq
+
+from ..utils._checks import check_type
+
+if TYPE_CHECKING:
+    from typing import Any
+
+# little-endian: idx (uint32), trigger (uint8), 3 pad bytes, onset (int64, ns in the
+# session clock), onset_ptb (float64, s in the psychtoolbox timebase), stimulus (16
+# bytes, null-padded ASCII)
+_EVENT = struct.Struct("<IB3xqd16s")
+
+
+class EventPublisher:
+    """Publish the trial events to Unity on a ZMQ ``PUB`` socket.
+
+    Every event is published when the sound is scheduled, ahead of its onset, as a
+    single frame of 40 bytes::
+
+        offset  size  type     field
+        0       4     uint32   idx        index of the trial in the trial list
+        4       1     uint8    trigger    trigger value of the stimulus
+        5       3              padding
+        8       8     int64    onset      onset in ns in the session clock
+        16      8     float64  onset_ptb  onset in s in the psychtoolbox timebase
+        24      16    char[16] stimulus   name of the stimulus, null-padded ASCII
+
+    All fields are little-endian. The socket keeps only the last event for each
+    subscriber (``ZMQ_CONFLATE``), thus a slow subscriber receives the most recent
+    event instead of a backlog, and publishing never blocks the trial loop.
+
+    Parameters
+    ----------
+    address : str
+        Address on which the ``PUB`` socket is bound, e.g. ``"tcp://localhost:5556"``.
+    """
+
+    def __init__(self, address: str) -> None:
+        check_type(address, (str,), "address")
+        self._address = address
+        self._context = None
+        self._socket = None
+
+    def start(self) -> None:
+        """Bind the socket."""
+        if self._socket is not None:
+            raise RuntimeError("The event publisher is already started.")
+        self._context = zmq.Context()
+        self._socket = self._context.socket(zmq.PUB)
+        self._socket.setsockopt(zmq.CONFLATE, 1)
+        self._socket.setsockopt(zmq.LINGER, 0)
+        self._socket.bind(self._address)
+
+    def stop(self) -> None:
+        """Close the socket."""
+        if self._socket is None:
+            return
+        self._socket.close()
+        self._context.term()
+        self._socket = None
+        self._context = None
+
+    def publish(
+        self, idx: int, stimulus: str, trigger: int, onset: int, onset_ptb: float
+    ) -> None:
+        """Publish a trial event.
+
+        Parameters
+        ----------
+        idx : int
+            Index of the trial in the trial list.
+        stimulus : str
+            Name of the stimulus, e.g. ``"standard"`` or ``"wav0001"``.
+        trigger : int
+            Trigger value of the stimulus.
+        onset : int
+            Onset of the trial in nanoseconds, in the referential of the session clock.
+        onset_ptb : float
+            Onset of the trial in seconds, in the psychtoolbox timebase.
+        """
+        # a 40 bytes frame is cheaper to copy than to track for a zero-copy send
+        self._socket.send(
+            _EVENT.pack(idx, trigger, onset, onset_ptb, stimulus.encode()),
+            zmq.NOBLOCK,
+        )
+
+    def __enter__(self) -> EventPublisher:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+def unpack_event(message: bytes) -> dict[str, Any]:
+    """Unpack a trial event published by :class:`EventPublisher`.
+
+    Parameters
+    ----------
+    message : bytes
+        The received frame.
+
+    Returns
+    -------
+    event : dict
+        The fields ``idx``, ``trigger``, ``onset``, ``onset_ptb`` and ``stimulus``.
+    """
+    idx, trigger, onset, onset_ptb, stimulus = _EVENT.unpack(message)
+    return {
+        "idx": idx,
+        "trigger": trigger,
+        "onset": onset,
+        "onset_ptb": onset_ptb,
+        "stimulus": stimulus.rstrip(b"\x00").decode(),
+    }
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import gc
+import os
+import sys
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+import psutil
+
+from ..utils._checks import check_type, ensure_int
+from ..utils.logs import logger, warn
+
+if TYPE_CHECKING:
+    from typing import IO, Callable, Optional
+
+_MCL_CURRENT: int = 1
+_MCL_FUTURE: int = 2
+
+
+class RealtimeSession:
+    """Runtime configuration reducing the jitter of an oddball session.
+
+    Within the context, the process is pinned to the requested cores, its memory is
+    locked in RAM to prevent page faults, the objects allocated so far are frozen
+    with :func:`gc.freeze` and the automatic garbage collection is disabled. The
+    garbage is collected explicitly with :meth:`collect` when the schedule has slack,
+    and the duration of every collection is recorded through :data:`gc.callbacks`.
+
+    Parameters
+    ----------
+    cores : list of int | None
+        Cores on which the process is pinned. If None, the affinity is not changed.
+    lock_memory : bool
+        If True, lock the current and future memory of the process in RAM with
+        ``mlockall``. This requires a ``memlock`` limit set to ``unlimited``, and is
+        only supported on Linux.
+    """
+
+    def __init__(
+        self, cores: Optional[list[int]] = None, lock_memory: bool = True
+    ) -> None:
+        check_type(cores, (list, tuple, None), "cores")
+        if cores is not None:
+            cores = [ensure_int(core, "core") for core in cores]
+        check_type(lock_memory, (bool,), "lock_memory")
+        self._cores = cores
+        self._lock_memory = lock_memory
+        self._old_affinity = None
+        self._memory_locked = False
+        self._gc_start = 0
+        self._gc_pauses: list[int] = list()  # nanoseconds
+
+    def __enter__(self) -> RealtimeSession:
+        if self._cores is not None:
+            self._set_affinity()
+        if self._lock_memory:
+            self._memory_locked = _mlockall()
+        gc.collect()
+        gc.freeze()
+        gc.disable()
+        gc.callbacks.append(self._gc_callback)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        gc.callbacks.remove(self._gc_callback)
+        gc.enable()
+        gc.unfreeze()
+        if self._memory_locked:
+            _munlockall()
+            self._memory_locked = False
+        if self._old_affinity is not None:
+            _set_affinity(self._old_affinity)
+            self._old_affinity = None
+        if len(self._gc_pauses) != 0:
+            pauses = np.array(self._gc_pauses) / 1e6  # milliseconds
+            logger.info(
+                "%i garbage collections, pause p50 %.3f ms, max %.3f ms.",
+                pauses.size,
+                np.median(pauses),
+                np.max(pauses),
+            )
+
+    def _set_affinity(self) -> None:
+        """Pin the process on the requested cores."""
+        try:
+            self._old_affinity = psutil.Process().cpu_affinity()
+            _set_affinity(self._cores)
+        except (AttributeError, OSError, ValueError) as error:
+            self._old_affinity = None
+            warn(f"The process could not be pinned on the cores {self._cores}: {error}")
+        else:
+            logger.info("Process pinned on the cores %s.", self._cores)
+
+    def _gc_callback(self, phase: str, info: dict) -> None:
+        """Record the duration of garbage collections."""
+        if phase == "start":
+            self._gc_start = time.perf_counter_ns()
+        else:
+            self._gc_pauses.append(time.perf_counter_ns() - self._gc_start)
+
+    def collect(self) -> None:
+        """Collect the garbage.
+
+        Since the objects allocated before the session are frozen, a full collection
+        only traverses the objects allocated during the session and is short.
+        """
+        gc.collect()
+
+    @property
+    def gc_pauses(self) -> np.ndarray:
+        """Duration of the garbage collections in nanoseconds."""
+        return np.array(self._gc_pauses, dtype=np.int64)
+
+
+def print_wakeup_latency(fid: Optional[IO] = None) -> None:
+    """Measure and print the wake-up latency of the sleep functions.
+
+    The latency is measured against absolute deadlines like cyclictest, for a single
+    OS sleep and for :meth:`~flow.oddball._time.BaseClock.wait_until`, which takes a
+    couple of seconds.
+
+    Parameters
+    ----------
+    fid : file-like | None
+        The file to write to, passed to :func:`print`. Can be None to use
+        :data:`sys.stdout`.
+    """
+    from ._time import Clock
+
+    for name, sleep in (
+        ("Wake-up latency (OS):", _os_sleep_until),
+        ("Wake-up latency (flow):", Clock.wait_until),
+    ):
+        overshoots = _measure_wakeup_latency(sleep) / 1e3  # microseconds
+        p50, p99 = np.percentile(overshoots, (50, 99))
+        print(
+            name.ljust(26)
+            + f"p50 {p50:.1f} µs, p99 {p99:.1f} µs, max {np.max(overshoots):.1f} µs",
+            file=fid,
+        )
+
+
+def _os_sleep_until(clock, deadline: int) -> None:
+    """Wait until an absolute deadline with a single OS sleep."""
+    time.sleep(max(deadline - clock.get_time_ns(), 0) / 1e9)
+
+
+def _measure_wakeup_latency(
+    sleep: Callable, n_iterations: int = 500, period: float = 0.002
+) -> np.ndarray:
+    """Measure the overshoot of a sleep function against periodic deadlines.
+
+    Parameters
+    ----------
+    sleep : callable
+        Function ``sleep(clock, deadline)`` waiting until the absolute deadline in
+        nanoseconds.
+    n_iterations : int
+        Number of deadlines.
+    period : float
+        Duration between 2 consecutive deadlines in seconds.
+
+    Returns
+    -------
+    overshoots : array of shape (n_iterations,)
+        Overshoot of each wake-up in nanoseconds.
+    """
+    from ._time import Clock
+
+    clock = Clock()
+    overshoots = np.empty(n_iterations, dtype=np.int64)
+    period = int(period * 1e9)
+    deadline = clock.get_time_ns()
+    for k in range(n_iterations):
+        deadline += period
+        sleep(clock, deadline)
+        overshoots[k] = clock.get_time_ns() - deadline
+    return overshoots
+
+
+def _set_affinity(cores: list[int]) -> None:
+    """Set the CPU affinity of all the threads of the process."""
+    process = psutil.Process()
+    if sys.platform.startswith("linux"):
+        # the affinity is set per thread on Linux, new threads inherit it
+        for thread in process.threads():
+            os.sched_setaffinity(thread.id, cores)
+    else:
+        process.cpu_affinity(cores)
+
+
+def _mlockall() -> bool:
+    """Lock the current and future memory of the process in RAM."""
+    if not sys.platform.startswith("linux"):
+        warn("Locking the memory is only supported on Linux.")
+        return False
+    import resource
+
+    limit = resource.getrlimit(resource.RLIMIT_MEMLOCK)[0]
+    if limit != resource.RLIM_INFINITY:
+        # with MCL_FUTURE, allocations beyond the limit would fail
+        warn(
+            f"The memlock limit is set to {limit} bytes instead of 'unlimited'. The "
+            "memory is not locked."
+        )
+        return False
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    if libc.mlockall(_MCL_CURRENT | _MCL_FUTURE) != 0:
+        warn(f"The memory could not be locked: {os.strerror(ctypes.get_errno())}.")
+        return False
+    logger.info("Memory locked in RAM.")
+    return True
+
+
+def _munlockall() -> None:
+    """Unlock the memory of the process."""
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    libc.munlockall()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..utils._checks import check_type, ensure_int, ensure_path
+from ._config import DURATION_ITI, DURATION_STIM, ITI_MARGIN
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Optional, Union
+
+
+def parse_itis(fname: Union[str, Path]) -> Optional[np.ndarray]:
+    """Parse the optional third column of a trial list, the ITI of every trial.
+
+    Parameters
+    ----------
+    fname : path-like
+        Path to the trial list, with lines ``idx, stimulus`` or
+        ``idx, stimulus, iti``.
+
+    Returns
+    -------
+    itis : array of shape (n_trials,) | None
+        The duration in seconds between the onset of each trial and the onset of the
+        next one, or None if the trial list does not define the ITIs.
+    """
+    fname = ensure_path(fname, must_exist=True)
+    with open(fname) as fid:
+        lines = [line.rstrip("\n").split(", ") for line in fid if len(line) != 0]
+    n_columns = {len(line) for line in lines}
+    if n_columns == {2}:
+        return None
+    elif n_columns != {3}:
+        raise ValueError(
+            f"The trial list {fname.name} must define the ITI of every trial or of "
+            "none of them."
+        )
+    try:
+        return np.array([line[2] for line in lines], dtype=np.float64)
+    except ValueError:
+        raise ValueError(
+            f"The ITIs of the trial list {fname.name} could not be interpreted as "
+            "floats."
+        )
+
+
+def compute_onsets(
+    n_trials: int,
+    itis: Optional[np.ndarray] = None,
+    *,
+    jitter: Optional[tuple[float, float]] = None,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """Compute the onset of every trial ahead of the session.
+
+    Parameters
+    ----------
+    n_trials : int
+        Number of trials.
+    itis : array of shape (n_trials,) | None
+        The ITI of every trial in seconds, e.g. from :func:`parse_itis`. If None, the
+        ITIs are drawn from ``jitter``.
+    jitter : tuple of shape (2,) | None
+        Range ``(low, high)`` in seconds in which the ITIs are drawn uniformly. If
+        None, every ITI is set to ``DURATION_ITI``. Ignored if ``itis`` is provided.
+    seed : int | None
+        Seed of the random number generator drawing the jittered ITIs.
+
+    Returns
+    -------
+    onsets : array of shape (n_trials + 1,)
+        The onset of every trial in nanoseconds relative to the onset of the first
+        trial, followed by the end of the last ITI.
+    """
+    n_trials = ensure_int(n_trials, "n_trials")
+    if itis is None:
+        check_type(jitter, (tuple, list, None), "jitter")
+        if jitter is None:
+            itis = np.full(n_trials, DURATION_ITI)
+        else:
+            low, high = jitter
+            if high < low:
+                raise ValueError(
+                    f"The jitter range ({low}, {high}) must be ordered as (low, high)."
+                )
+            itis = np.random.default_rng(seed).uniform(low, high, n_trials)
+    itis = np.asarray(itis, dtype=np.float64)
+    if itis.shape != (n_trials,):
+        raise ValueError(
+            f"The number of ITIs {itis.size} does not match the number of trials "
+            f"{n_trials}."
+        )
+    # same constraint as the one enforced on DURATION_ITI in the configuration
+    invalid = np.flatnonzero(~(ITI_MARGIN < itis - DURATION_STIM))
+    if invalid.size != 0:
+        raise ValueError(
+            f"The ITI of {invalid.size} trial(s) is shorter than the minimum of "
+            f"{DURATION_STIM + ITI_MARGIN:.3f} s, e.g. {itis[invalid[0]]:.3f} s for "
+            f"the trial at position {invalid[0]}."
+        )
+    onsets = np.zeros(n_trials + 1, dtype=np.int64)
+    np.cumsum(np.round(itis * 1e9).astype(np.int64), out=onsets[1:])
+    return onsets
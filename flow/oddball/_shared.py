@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..utils._checks import check_type, ensure_int
+
+if TYPE_CHECKING:
+    from typing import Optional
+
+# status of the stimulus process
+LOADING: int = 0
+READY: int = 1
+RUNNING: int = 2
+DONE: int = 3
+FAILED: int = 4
+
+_STATE_DTYPE = np.dtype([("status", "<i8"), ("hold", "<i8")])
+# head (records written) and tail (records read) on separate cache lines, to avoid
+# false sharing between the producer and the consumer
+_RING_HEADER_DTYPE = np.dtype(
+    {
+        "names": ["head", "tail", "dropped"],
+        "formats": ["<u8"] * 3,
+        "offsets": [0, 64, 128],
+    }
+)
+LOG_DTYPE = np.dtype(
+    [
+        ("created", "<f8"),
+        ("levelno", "<u1"),
+        ("module", "S32"),
+        ("funcName", "S32"),
+        ("lineno", "<u4"),
+        ("message", "S256"),
+    ]
+)
+
+
+class _SharedBlock(ABC):
+    """Block of shared memory, created by a process and attached by others."""
+
+    def __init__(self, size: int, name: Optional[str]) -> None:
+        check_type(name, (str, None), "name")
+        self._owner = name is None
+        if self._owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+
+    def close(self) -> None:
+        """Release the shared memory, and free it if this process created it."""
+        self._release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    @abstractmethod
+    def _release(self) -> None:
+        """Release the views on the shared memory."""
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block, to attach it from another process."""
+        return self._shm.name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class SharedState(_SharedBlock):
+    """Status and hold state shared between the processes of an oddball session.
+
+    Parameters
+    ----------
+    name : str | None
+        Name of an existing block to attach. If None, a new block is created.
+    """
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        super().__init__(_STATE_DTYPE.itemsize, name)
+        self._state = np.ndarray((), dtype=_STATE_DTYPE, buffer=self._shm.buf)
+        if self._owner:
+            self._state[()] = (LOADING, 0)
+
+    def _release(self) -> None:
+        del self._state
+
+    @property
+    def status(self) -> int:
+        """Status of the stimulus process."""
+        return int(self._state["status"])
+
+    @status.setter
+    def status(self, status: int) -> None:
+        self._state["status"] = status
+
+    @property
+    def hold(self) -> bool:
+        """True if the paradigm should hold."""
+        return bool(self._state["hold"])
+
+    @hold.setter
+    def hold(self, hold: bool) -> None:
+        self._state["hold"] = hold
+
+
+class EventRing(_SharedBlock):
+    """Lock-free ring buffer of fixed-size records in shared memory.
+
+    The ring supports a single producer and a single consumer. The producer writes a
+    record and then increments the ``head`` counter, the consumer reads the records up
+    to ``head`` and then increments the ``tail`` counter. Each counter is written by a
+    single process with an aligned 8 bytes store, thus no lock is required. When the
+    ring is full, the new records are dropped and counted instead of blocking the
+    producer.
+
+    Parameters
+    ----------
+    dtype : dtype
+        Data type of the records.
+    capacity : int
+        Number of records in the ring.
+    name : str | None
+        Name of an existing ring to attach. If None, a new ring is created.
+    """
+
+    def __init__(
+        self, dtype: np.dtype, capacity: int = 1024, name: Optional[str] = None
+    ) -> None:
+        dtype = np.dtype(dtype)
+        capacity = ensure_int(capacity, "capacity")
+        if capacity <= 0:
+            raise ValueError(f"The capacity must be positive, got {capacity}.")
+        offset = _RING_HEADER_DTYPE.itemsize
+        super().__init__(offset + capacity * dtype.itemsize, name)
+        self._header = np.ndarray((), dtype=_RING_HEADER_DTYPE, buffer=self._shm.buf)
+        self._records = np.ndarray(
+            (capacity,), dtype=dtype, buffer=self._shm.buf, offset=offset
+        )
+        if self._owner:
+            self._header[()] = (0, 0, 0)
+        self._capacity = capacity
+
+    def _release(self) -> None:
+        del self._header
+        del self._records
+
+    def push(self, record: tuple) -> bool:
+        """Write a record, from the producer.
+
+        Parameters
+        ----------
+        record : tuple
+            The record to write.
+
+        Returns
+        -------
+        written : bool
+            False if the ring is full and the record was dropped.
+        """
+        head = int(self._header["head"])
+        if head - int(self._header["tail"]) == self._capacity:
+            self._header["dropped"] += 1
+            return False
+        self._records[head % self._capacity] = record
+        # the head is incremented after the record is written to publish it
+        self._header["head"] = head + 1
+        return True
+
+    def pop(self) -> np.ndarray:
+        """Read all the records available, from the consumer.
+
+        Returns
+        -------
+        records : array
+            Copy of the records written since the last call, in order.
+        """
+        tail = int(self._header["tail"])
+        head = int(self._header["head"])
+        idx = np.arange(tail, head) % self._capacity
+        records = self._records[idx]  # fancy indexing copies the records
+        self._header["tail"] = head
+        return records
+
+    @property
+    def dropped(self) -> int:
+        """Number of records dropped because the ring was full."""
+        return int(self._header["dropped"])
+
+
+class RingHandler(logging.Handler):
+    """Logging handler writing the records in an :class:`EventRing`.
+
+    The message is formatted in the producer process, while the output, which can
+    block on the console or on a file, is left to the consumer process, see
+    :func:`handle_records`.
+
+    Parameters
+    ----------
+    ring : EventRing
+        Ring of records with the dtype ``LOG_DTYPE``.
+    """
+
+    def __init__(self, ring: EventRing) -> None:
+        super().__init__()
+        self._ring = ring
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a log record in the ring.
+
+        Parameters
+        ----------
+        record : LogRecord
+            The log record.
+        """
+        try:
+            self._ring.push(
+                (
+                    record.created,
+                    record.levelno,
+                    record.module.encode()[:32],
+                    record.funcName.encode()[:32],
+                    record.lineno,
+                    record.getMessage().encode()[:256],
+                )
+            )
+        except Exception:
+            self.handleError(record)
+
+
+def handle_records(logger: logging.Logger, records: np.ndarray) -> None:
+    """Emit the log records read from an :class:`EventRing` through a logger.
+
+    Parameters
+    ----------
+    logger : Logger
+        The logger whose handlers output the records.
+    records : array
+        Records with the dtype ``LOG_DTYPE``.
+    """
+    for record in records:
+        levelno = int(record["levelno"])
+        created = float(record["created"])
+        logger.handle(
+            logging.makeLogRecord(
+                {
+                    "name": logger.name,
+                    "levelno": levelno,
+                    "levelname": logging.getLevelName(levelno),
+                    "created": created,
+                    "msecs": (created - int(created)) * 1000,
+                    "module": record["module"].decode(errors="replace"),
+                    "funcName": record["funcName"].decode(errors="replace"),
+                    "lineno": int(record["lineno"]),
+                    "msg": record["message"].decode(errors="replace"),
+                }
+            )
+        )
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import time
+from importlib.resources import files
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
+
+from byte_triggers._base import BaseTrigger
+
+from ..utils._checks import check_type, check_value
+from ..utils.logs import logger
+from ._audio import NullBackend, NullSound
+from ._checkpoint import Checkpoint
+from ._config import DURATION_ITI_JITTER, ITI_SEED
+from ._control import _MESSAGES
+from ._prepare import list_resources
+from ._schedule import compute_onsets, parse_itis
+from ._utils import parse_trial_list
+from .oddball import _run_trials
+
+if TYPE_CHECKING:
+    from typing import Optional
+
+    import numpy as np
+
+    from ._time import BaseClock
+
+
+class FakeTrigger(BaseTrigger):
+    """Trigger which records the values sent.
+
+    Contrary to :class:`byte_triggers.MockTrigger`, the values are not logged.
+    """
+
+    def __init__(self) -> None:
+        self.values: list[int] = list()
+
+    def signal(self, value: int) -> None:
+        """Send a trigger value.
+
+        Parameters
+        ----------
+        value : int
+            Value of the trigger, between 1 and 255.
+        """
+        self.values.append(super().signal(value))
+
+
+class ScriptedController:
+    """Controller replaying a script of messages, as if received from Unity.
+
+    Parameters
+    ----------
+    script : list of tuple
+        List of ``(time, message)`` with the time in seconds, in the referential of
+        the clock, at which the message is received.
+    clock : BaseClock
+        The clock of the session.
+    """
+
+    def __init__(self, script: list[tuple[float, str]], clock: BaseClock) -> None:
+        check_type(script, (list, tuple), "script")
+        for _, message in script:
+            check_value(message, _MESSAGES, "message")
+        self._script = sorted((int(t * 1e9), message) for t, message in script)
+        self._clock = clock
+        self._idx = 0
+        self._hold = False
+
+    def _update(self) -> None:
+        """Apply the messages received until the current time."""
+        now = self._clock.get_time_ns()
+        while self._idx < len(self._script) and self._script[self._idx][0] <= now:
+            self._hold = _MESSAGES[self._script[self._idx][1]]
+            self._idx += 1
+
+    def wait_for_resume(self, timeout: Optional[float] = None) -> bool:
+        """Block until the paradigm is resumed or until the timeout expires.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Maximum duration to wait in seconds. If None, waits indefinitely.
+
+        Returns
+        -------
+        resumed : bool
+            True if the paradigm is not holding anymore, False if the timeout expired.
+        """
+        deadline = (
+            None if timeout is None else self._clock.get_time_ns() + int(timeout * 1e9)
+        )
+        self._update()
+        while self._hold:
+            if self._idx == len(self._script):
+                if deadline is None:
+                    raise RuntimeError("The script never resumes the paradigm.")
+                self._clock.wait_until(deadline)
+                return False
+            next_message = self._script[self._idx][0]
+            if deadline is not None and deadline < next_message:
+                self._clock.wait_until(deadline)
+                return False
+            self._clock.wait_until(next_message)
+            self._update()
+        return True
+
+    @property
+    def hold(self) -> bool:
+        """True if the paradigm should hold."""
+        self._update()
+        return self._hold
+
+
+def simulate(
+    condition: str,
+    script: Optional[list[tuple[float, str]]] = None,
+    *,
+    virtual: bool = True,
+) -> tuple[np.ndarray, dict[str, NullSound], FakeTrigger]:
+    """Simulate an oddball session headless.
+
+    The session runs the same trial loop as :func:`~flow.oddball.oddball` without
+    audio device, parallel port, ZMQ socket or user prompts. The sounds are played by
+    the :class:`~flow.oddball._audio.NullBackend`, the trigger is replaced by a
+    :class:`~flow.oddball._simulation.FakeTrigger` and the messages from Unity by a
+    :class:`~flow.oddball._simulation.ScriptedController`.
+
+    Parameters
+    ----------
+    condition : "main1" | "main2" | "main3" | "solo" | "stp1" | "stp2" | "stp3"
+        Oddball condition to simulate.
+    script : list of tuple | None
+        List of ``(time, message)`` with the time in seconds since the start of the
+        session at which a message ``"hold"`` or ``"continue"`` is received.
+    virtual : bool
+        If True, the session runs in virtual time, as fast as possible. If False, the
+        session runs in real-time.
+
+    Returns
+    -------
+    events : array
+        Structured array with the fields ``idx``, ``trigger``, ``onset`` (in
+        nanoseconds since the start of the session) and ``time`` of each trial.
+    sounds : dict
+        The null sounds, which recorded the scheduled onsets in seconds and in
+        samples.
+    trigger : FakeTrigger
+        The fake trigger, which recorded the values sent, including the hold triggers.
+    """
+    check_type(condition, (str,), "condition")
+    check_value(condition, list_resources()["conditions"], "condition")
+    check_type(script, (list, tuple, None), "script")
+    check_type(virtual, (bool,), "virtual")
+    fname = files("flow.oddball") / "trialList" / f"{condition}.txt"
+    trials = parse_trial_list(fname)
+    onsets = compute_onsets(
+        len(trials), parse_itis(fname), jitter=DURATION_ITI_JITTER, seed=ITI_SEED
+    )
+    backend = NullBackend(virtual=virtual)
+    names = {"standard", "target"}
+    names.update(trial for _, trial in trials if trial.startswith("wav"))
+    sounds = {name: NullSound(name, backend.sample_rate) for name in names}
+    clock = backend.create_clock()
+    control = ScriptedController([] if script is None else script, clock)
+    trigger = FakeTrigger()
+    start = time.perf_counter()
+    with TemporaryDirectory() as directory:
+        with Checkpoint(f"{directory}/{condition}.ckpt", condition, trials) as ckpt:
+            _run_trials(trials, ckpt, sounds, trigger, clock, control, None, onsets)
+            events = ckpt.events
+    duration = time.perf_counter() - start
+    logger.info(
+        "Simulated %i trials in %.3f s (%.0f trials/s, session duration %.1f s).",
+        events.size,
+        duration,
+        events.size / duration,
+        clock.get_time(),
+    )
+    return events, sounds, trigger
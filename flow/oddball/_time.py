@@ -2,9 +2,16 @@ from __future__ import annotations
 
 import time
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 
+import numpy as np
+
+from ..utils._checks import check_type, ensure_int
 from ..utils._docs import copy_doc
 
+if TYPE_CHECKING:
+    from typing import Optional
+
 
 class BaseClock(ABC):
     """Base class for high precision clocks.
@@ -38,6 +45,28 @@ class BaseClock(ABC):
         """
         return self.get_time_ns() / 1e9
 
+    def wait_until(self, deadline: int) -> None:
+        """High precision wait until the clock reaches an absolute deadline.
+
+        Parameters
+        ----------
+        deadline : int
+            Time in nanoseconds, in the referential of the clock, until which to wait.
+            If the deadline is already past, the method returns immediately.
+
+        Notes
+        -----
+        Contrary to :func:`~flow.oddball._time.sleep`, the deadline is absolute which
+        prevents the accumulation of errors when scheduling a sequence of events on
+        the same clock.
+        """
+        while True:
+            remaining_time = deadline - self.get_time_ns()  # nanoseconds
+            if remaining_time <= 0:
+                break
+            if remaining_time >= 200000:  # 200 microseconds
+                time.sleep(remaining_time * 1e-9 / 2)
+
 
 class Clock(BaseClock):
     """Clock which keeps track of time in nanoseconds.
@@ -64,6 +93,142 @@ class Clock(BaseClock):
         return self._function() - self._t0
 
 
+class PTBClock(BaseClock):
+    """Clock which keeps track of time in nanoseconds in the psychtoolbox timebase.
+
+    The origin ``t=0`` corresponds to the instantiation of the
+    :class:`~flow.oddball._time.PTBClock` object. The time is measured through
+    :func:`psychtoolbox.GetSecs`, which is the timebase used by the psychtoolbox audio
+    backend to schedule sounds. Using this clock to schedule the sounds, the triggers
+    and the logs avoids converting between timebases.
+
+    Parameters
+    ----------
+    t0 : float | None
+        Origin of the clock in seconds, in the psychtoolbox timebase. If None, the
+        origin is the instantiation of the clock. Clocks created with the same origin,
+        e.g. in different processes, share the same referential.
+    """
+
+    def __init__(self, t0: Optional[float] = None) -> None:
+        from psychtoolbox import GetSecs
+
+        check_type(t0, ("numeric", None), "t0")
+        self._function = GetSecs
+        self._t0 = self._function() if t0 is None else float(t0)
+
+    @copy_doc(BaseClock.get_time_ns)
+    def get_time_ns(self) -> int:
+        return int((self._function() - self._t0) * 1e9)
+
+    def to_ptb(self, time_ns: int) -> float:
+        """Convert a time of the clock to the psychtoolbox absolute timebase.
+
+        Parameters
+        ----------
+        time_ns : int
+            Time in nanoseconds, in the referential of the clock.
+
+        Returns
+        -------
+        time : float
+            The corresponding time in seconds returned by :func:`psychtoolbox.GetSecs`,
+            e.g. to be used as the ``when`` argument of a psychtoolbox sound.
+        """
+        return self._t0 + time_ns / 1e9
+
+
+class VirtualClock(BaseClock):
+    """Clock which keeps track of a virtual time in nanoseconds.
+
+    The virtual time starts at ``t=0`` and only advances when the clock waits, thus
+    waiting is instantaneous. This clock is used to simulate a session in accelerated
+    time.
+    """
+
+    def __init__(self) -> None:
+        self._time = 0
+
+    @copy_doc(BaseClock.get_time_ns)
+    def get_time_ns(self) -> int:
+        return self._time
+
+    @copy_doc(BaseClock.wait_until)
+    def wait_until(self, deadline: int) -> None:
+        self._time = max(self._time, deadline)
+
+    def to_ptb(self, time_ns: int) -> float:
+        """Convert a time of the clock to seconds.
+
+        Parameters
+        ----------
+        time_ns : int
+            Time in nanoseconds, in the referential of the clock.
+
+        Returns
+        -------
+        time : float
+            The corresponding time in seconds.
+        """
+        return time_ns / 1e9
+
+
+def sync_clocks(
+    clock: BaseClock,
+    reference: BaseClock,
+    n_samples: int = 100,
+    interval: float = 0.002,
+) -> tuple[float, float]:
+    """Estimate the offset and drift between two clocks.
+
+    The clocks are sampled in an interleaved fashion ``reference, clock, reference``,
+    and the time of ``clock`` is compared to the midpoint of the 2 ``reference``
+    samples. Only the samples with the shortest round-trip are retained, to exclude
+    the samples interrupted by the scheduler, and a linear fit yields the offset and
+    drift.
+
+    Parameters
+    ----------
+    clock : BaseClock
+        Clock instance to synchronize.
+    reference : BaseClock
+        Clock instance used as reference.
+    n_samples : int
+        Number of interleaved samples to acquire.
+    interval : float
+        Duration in seconds between 2 consecutive samples. The drift estimate
+        improves with the duration spanned by the samples, ``n_samples * interval``.
+
+    Returns
+    -------
+    offset : float
+        Offset in nanoseconds such that ``clock = reference * (1 + drift) + offset``.
+    drift : float
+        Relative drift between both clocks, e.g. ``1e-6`` for 1 ppm.
+    """
+    check_type(clock, (BaseClock,), "clock")
+    check_type(reference, (BaseClock,), "reference")
+    n_samples = ensure_int(n_samples, "n_samples")
+    if n_samples < 2:
+        raise ValueError(
+            f"The number of samples must be at least 2, got {n_samples} instead."
+        )
+    check_type(interval, ("numeric",), "interval")
+    samples = np.empty((n_samples, 3), dtype=np.int64)
+    for k in range(n_samples):
+        samples[k, 0] = reference.get_time_ns()
+        samples[k, 1] = clock.get_time_ns()
+        samples[k, 2] = reference.get_time_ns()
+        reference.wait_until(samples[k, 2] + int(interval * 1e9))
+    round_trip = samples[:, 2] - samples[:, 0]
+    mask = round_trip <= np.median(round_trip)
+    midpoints = (samples[mask, 0] + samples[mask, 2]) / 2
+    if np.ptp(midpoints) == 0:  # not enough spread to estimate the drift
+        return float(np.mean(samples[mask, 1] - midpoints)), 0.0
+    slope, offset = np.polyfit(midpoints, samples[mask, 1], deg=1)
+    return float(offset), float(slope - 1)
+
+
 def sleep(duration: float, *, clock: BaseClock = Clock) -> None:
     """High precision sleep function.
 
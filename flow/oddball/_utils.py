@@ -5,25 +5,21 @@ from typing import TYPE_CHECKING
 
 from psychopy import logging
 
-from ..utils._checks import check_value, ensure_path
+from ..utils._checks import compile_check_value, ensure_path
 from ..utils.logs import logger, warn
 
 if TYPE_CHECKING:
     from pathlib import Path
+    from typing import Any
 
-    from psychopy.sound.backend_ptb import SoundPTB
+    from ._audio import BaseAudioBackend
 
 
 def list_novel_sounds() -> list[str]:
-    """List the available sounds."""
-    novel_sounds = list()
-    for file in (files("flow.oddball") / "sounds").iterdir():
-        if file.suffix != ".wav":
-            warn(f"Non-wav file {file} found in the sounds directory.")
-            continue
-        if file.name.startswith("wav"):
-            novel_sounds.append(file.name)
-    return novel_sounds
+    """List the available novel sounds, e.g. ``"wav0001"``."""
+    from ._prepare import list_resources
+
+    return [elt for elt in list_resources()["sounds"] if elt.startswith("wav")]
 
 
 def parse_trial_list(fname: Path) -> list[tuple[int, str]]:
@@ -32,7 +28,9 @@ def parse_trial_list(fname: Path) -> list[tuple[int, str]]:
     with open(fname) as f:
         lines = f.readlines()
     lines = [line.rstrip("\n").split(", ") for line in lines if len(line) != 0]
-    novel_sounds = [sound.split("-")[0] for sound in list_novel_sounds()]
+    novel_sounds = list_novel_sounds()
+    check_trial = compile_check_value(("standard", "target", "cross"), "trial")
+    check_novel = compile_check_value(novel_sounds, "trial")
     lines_checked = list()
     expected_idx = 1
     for line in lines:
@@ -48,9 +46,9 @@ def parse_trial_list(fname: Path) -> list[tuple[int, str]]:
             )
         trial = line[1]
         if not trial.startswith("wav"):
-            check_value(trial, ("standard", "target", "cross"), "trial")
+            check_trial(trial)
         else:
-            check_value(trial, novel_sounds, "trial")
+            check_novel(trial)
         if trial != "cross":
             expected_idx += 1
         lines_checked.append((idx, trial))
@@ -58,35 +56,51 @@ def parse_trial_list(fname: Path) -> list[tuple[int, str]]:
 
 
 def _load_sounds(
-    trials: list[tuple[int, str]], duration: float, device: str, volume: float
-) -> dict[str, SoundPTB]:
-    """Create psychopy sound objects."""
-    from psychopy.sound import setDevice
-
-    setDevice(device, kind="output")
-
-    from psychopy.sound.backend_ptb import SoundPTB
-
+    trials: list[tuple[int, str]],
+    duration: float,
+    backend: BaseAudioBackend,
+    volume: float,
+) -> dict[str, Any]:
+    """Create the sound objects of the audio backend.
+
+    The sounds prepared with :func:`~flow.oddball._prepare.prepare` are loaded from
+    their memory-mapped samples, at the native sample rate of the backend, and their
+    loudness is normalized through their volume. The others are decoded from the WAV
+    files at 48 kHz.
+    """
+    from ._io import read_wav
+    from ._prepare import load_prepared_sound
+
+    sample_rate = backend.sample_rate
+    names = {"standard": "low_tone", "target": "high_tone"}
+    names.update({trial[1]: trial[1] for trial in trials if trial[1].startswith("wav")})
     sounds = dict()
-    fname_standard = files("flow.oddball") / "sounds" / "low_tone-48000.wav"
-    fname_standard = ensure_path(fname_standard, must_exist=True)
-    sounds["standard"] = SoundPTB(
-        fname_standard, secs=duration, hamming=True, name="stim", sampleRate=48000
-    )
-    sounds["standard"].setVolume(volume)
-    fname_target = files("flow.oddball") / "sounds" / "high_tone-48000.wav"
-    fname_target = ensure_path(fname_target, must_exist=True)
-    sounds["target"] = SoundPTB(
-        fname_target, secs=duration, hamming=True, name="stim", sampleRate=48000
-    )
-    sounds["target"].setVolume(volume)
-    novels = [trial[1] for trial in trials if trial[1].startswith("wav")]
-    for novel in novels:
-        fname = files("flow.oddball") / "sounds" / f"{novel}-48000.wav"
-        sounds[novel] = SoundPTB(
-            fname, secs=duration, hamming=True, name="stim", sampleRate=48000
+    missing = list()
+    for key, name in names.items():
+        prepared = load_prepared_sound(name, sample_rate=sample_rate)
+        if prepared is None:
+            fname = files("flow.oddball") / "sounds" / f"{name}-48000.wav"
+            data, rate = read_wav(ensure_path(fname, must_exist=True))
+            gain = 1.0
+            missing.append(name)
+        else:
+            data, rate, gain = prepared
+        sounds[key] = backend.create_sound(key, data, rate, duration)
+        sounds[key].setVolume(volume * gain)
+    novels = [name for name in missing if name.startswith("wav")]
+    if len(novels) != 0:
+        warn(
+            f"The loudness of the novel sounds {', '.join(novels)} is not normalized "
+            "because they are not prepared or changed since they were prepared. Run "
+            "'flow oddball prepare'."
+        )
+    if len(missing) != 0 and sample_rate not in (None, 48000):
+        warn(
+            f"The sounds {', '.join(missing)} are not prepared at the native sample "
+            f"rate of the device ({sample_rate} Hz) and are resampled by the audio "
+            "backend. Run 'flow oddball prepare' with this sample rate in "
+            "SAMPLE_RATES."
         )
-        sounds[novel].setVolume(volume)
     return sounds
 
 
@@ -1,34 +1,61 @@
 from __future__ import annotations
 
+from contextlib import nullcontext
+from functools import partial
 from importlib.resources import files
+from typing import TYPE_CHECKING
 
-import psychtoolbox as ptb
-import zmq
 from byte_triggers import MockTrigger, ParallelPortTrigger
 from pynput import keyboard
 
 from ..utils._checks import check_type, check_value
-from ..utils.logs import logger
+from ..utils.logs import logger, warn
+from ._audio import create_backend
+from ._checkpoint import Checkpoint
 from ._config import (
+    AUDIO_BACKEND,
     AUDIO_DEVICE,
     AUDIO_VOLUME,
+    CHECKPOINT_DIRECTORY,
+    CONTROL_ADDRESS,
+    CPU_AFFINITY,
     DURATION_ITI,
+    DURATION_ITI_JITTER,
     DURATION_STIM,
+    EVENT_ADDRESS,
+    ITI_SEED,
     TRIGGER_ADDRESS,
     TRIGGERS,
 )
-from ._time import sleep
+from ._control import ControlServer
+from ._dashboard import SessionStats, open_dashboard
+from ._multiprocess import run_multiprocess
+from ._prepare import list_resources, load_prepared_itis, load_prepared_trials
+from ._publisher import EventPublisher
+from ._runtime import RealtimeSession
+from ._schedule import compute_onsets, parse_itis
+from ._time import Clock, sync_clocks
 from ._utils import _load_sounds, parse_trial_list
 
-_MESSAGES: dict[str, bool] = {"hold": True, "continue": False}
-_TRIAL_LIST_MAPPING: list[str] = [
-    elt.stem
-    for elt in (files("flow.oddball") / "trialList").iterdir()
-    if elt.is_file() and elt.suffix == ".txt"
-]
+if TYPE_CHECKING:
+    from typing import Any, Optional
 
+    import numpy as np
+    from byte_triggers._base import BaseTrigger
 
-def oddball(condition: str, mock: bool = False) -> None:
+    from ._time import BaseClock
+
+_GC_MIN_SLACK: int = 50_000_000  # nanoseconds, before a garbage collection
+
+
+def oddball(
+    condition: str,
+    mock: bool = False,
+    resume: bool = False,
+    realtime: bool = False,
+    multiprocess: bool = False,
+    dashboard: bool = False,
+) -> None:
     """Run the oddball paradigm.
 
     Parameters
@@ -37,60 +64,283 @@ def oddball(condition: str, mock: bool = False) -> None:
         Oddball condition to run.
     mock : bool
         If True, uses a MockTrigger instead of a ParallelPortTrigger.
+    resume : bool
+        If True, resume the condition from the last trial recorded in its checkpoint,
+        e.g. after a crash. The trials are checkpointed in
+        ``CHECKPOINT_DIRECTORY / f"{condition}.ckpt"``.
+    realtime : bool
+        If True, run the trials in a :class:`~flow.oddball._runtime.RealtimeSession`:
+        the process is pinned on the ``CPU_AFFINITY`` cores, its memory is locked and
+        the garbage is only collected during the inter-trial intervals.
+    multiprocess : bool
+        If True, run the trial loop in a dedicated process which only schedules the
+        sounds and the triggers, while the messages from Unity, the responses and the
+        logs are handled by the main process. See
+        :func:`~flow.oddball._multiprocess.run_multiprocess`. Requires the ``"ptb"``
+        ``AUDIO_BACKEND``, whose timebase is shared between processes.
+    dashboard : bool
+        If True, display a live dashboard with the progress, the onset jitter, the
+        hold state, the latency of the control messages and the rate of the force
+        stream, instead of the logs, see
+        :func:`~flow.oddball._dashboard.open_dashboard`. Not supported with
+        ``multiprocess``.
+
+    Notes
+    -----
+    The sounds are played by the ``AUDIO_BACKEND``, see
+    :func:`~flow.oddball._audio.create_backend`.
     """
     check_type(condition, (str,), "condition")
-    check_value(condition, _TRIAL_LIST_MAPPING, "condition")
+    check_value(condition, list_resources()["conditions"], "condition")
     check_type(mock, (bool,), "mock")
-    # create the ZeroMQ context and a subscriber socket to receive messages from Unity
-    context = zmq.Context()
-    socket = context.socket(zmq.REP)  # REP: Server side for REQ/REP pattern
-    socket.bind("tcp://localhost:5555")  # Bind to port 5555
-    poller = zmq.Poller()
-    poller.register(socket, zmq.POLLIN)
-    # load trials and sounds
+    check_type(resume, (bool,), "resume")
+    check_type(realtime, (bool,), "realtime")
+    check_type(multiprocess, (bool,), "multiprocess")
+    check_type(dashboard, (bool,), "dashboard")
+    if multiprocess and dashboard:
+        raise ValueError("The dashboard is not supported in the multiprocess mode.")
+    if multiprocess and AUDIO_BACKEND != "ptb":
+        raise ValueError(
+            "The multiprocess mode requires the 'ptb' audio backend, got "
+            f"'{AUDIO_BACKEND}'."
+        )
+    # load trials, checkpoint and sounds, skipping the trials already played
     fname = files("flow.oddball") / "trialList" / f"{condition}.txt"
-    trials = parse_trial_list(fname)
-    sounds = _load_sounds(trials, DURATION_STIM, AUDIO_DEVICE, AUDIO_VOLUME)
-    # prepare triggers
-    trigger = MockTrigger() if mock else ParallelPortTrigger(TRIGGER_ADDRESS)
-    # prepare fixation cross window
-    input(">>> Press ENTER to start.")
-    # main loop
-    counter = 0
-    hold = False
+    trials = load_prepared_trials(condition)
+    if trials is None:
+        trials = parse_trial_list(fname)
+        itis = parse_itis(fname)
+    else:
+        itis = load_prepared_itis(condition)
+    if any(trial == "cross" for _, trial in trials):
+        raise ValueError(
+            f"The trial list of the condition '{condition}' contains fixation crosses, "
+            "which are not supported by the oddball runtime."
+        )
+    onsets = compute_onsets(
+        len(trials), itis, jitter=DURATION_ITI_JITTER, seed=ITI_SEED
+    )
+    fname_checkpoint = CHECKPOINT_DIRECTORY / f"{condition}.ckpt"
+    if resume and not fname_checkpoint.exists():
+        warn(
+            f"The checkpoint '{fname_checkpoint}' does not exist. The condition "
+            f"'{condition}' is started from the first trial."
+        )
+    checkpoint = Checkpoint(fname_checkpoint, condition, trials, resume=resume)
+    counter = checkpoint.counter
+    if counter != 0:
+        logger.info("Resuming at trial %i / %i.", trials[counter][0], trials[-1][0])
+    if multiprocess:
+        # the stimulus process attaches the checkpoint and loads the sounds itself
+        checkpoint.close()
+        run_multiprocess(condition, trials, onsets, fname_checkpoint, mock, realtime)
+        input(">>> Press ENTER to continue and close the window.")
+        return
+    with create_backend(AUDIO_BACKEND, AUDIO_DEVICE) as backend:
+        sounds = _load_sounds(trials[counter:], DURATION_STIM, backend, AUDIO_VOLUME)
+        # prepare triggers
+        trigger = MockTrigger() if mock else ParallelPortTrigger(TRIGGER_ADDRESS)
+        # prepare the clock used to schedule sounds, triggers and logs
+        clock = backend.create_clock()
+        offset, drift = sync_clocks(clock, Clock())
+        logger.debug(
+            "Offset between the audio backend and the system clocks: %.1f ns "
+            "(drift %.3f ppm).",
+            offset,
+            drift * 1e6,
+        )
+        # prepare fixation cross window
+        input(">>> Press ENTER to start.")
+        # main loop, the messages from Unity are received in a background thread and
+        # the responses are logged by the keyboard listener thread. The real-time
+        # runtime is entered last to freeze all the objects allocated before the first
+        # trial.
+        runtime = RealtimeSession(CPU_AFFINITY) if realtime else nullcontext()
+        stats = SessionStats(trials[-1][0]) if dashboard else None
+        with checkpoint, ControlServer(CONTROL_ADDRESS) as control:
+            with EventPublisher(EVENT_ADDRESS) as publisher:
+                with keyboard.Listener(
+                    on_press=partial(_callback_on_press, clock=clock)
+                ):
+                    with (
+                        nullcontext()
+                        if stats is None
+                        else open_dashboard(stats, control)
+                    ):
+                        with runtime as session:
+                            _run_trials(
+                                trials,
+                                checkpoint,
+                                sounds,
+                                trigger,
+                                clock,
+                                control,
+                                session,
+                                onsets,
+                                publisher,
+                                stats,
+                            )
+    input(">>> Press ENTER to continue and close the window.")
+
+
+def _run_trials(
+    trials: list[tuple[int, str]],
+    checkpoint: Checkpoint,
+    sounds: dict[str, Any],
+    trigger: BaseTrigger,
+    clock: BaseClock,
+    control: ControlServer,
+    runtime: Optional[RealtimeSession] = None,
+    onsets: Optional[np.ndarray] = None,
+    publisher: Optional[EventPublisher] = None,
+    stats: Optional[SessionStats] = None,
+) -> None:
+    """Run the trials not yet recorded in the checkpoint.
+
+    The onsets are scheduled on an absolute timeline to prevent drift, and are
+    computed ahead of the session, thus variable ITIs do not add any computation
+    between trials. The loop does not interact with the user and all its dependencies
+    are injected, thus it can be run headless, see :func:`~flow.oddball.simulate`.
+
+    Parameters
+    ----------
+    trials : list of tuple
+        Parsed trial list of the condition.
+    checkpoint : Checkpoint
+        Checkpoint in which the trials played are recorded.
+    sounds : dict
+        Sound objects, with a ``play(when)`` method, for each stimulus.
+    trigger : BaseTrigger
+        The trigger object used to mark the trials.
+    clock : BaseClock
+        The clock used to schedule the sounds and the triggers. It must provide a
+        ``to_ptb`` method converting its time to the timebase of the sounds.
+    control : ControlServer
+        The object providing the hold state.
+    runtime : RealtimeSession | None
+        The real-time runtime, used to collect the garbage during the inter-trial
+        intervals.
+    onsets : array of shape (n_trials + 1,) | None
+        The onsets in nanoseconds relative to the first trial, see
+        :func:`~flow.oddball._schedule.compute_onsets`. If None, the trials are spaced
+        by ``DURATION_ITI``.
+    publisher : EventPublisher | None
+        If provided, the publisher on which every trial is broadcasted when its sound
+        is scheduled.
+    stats : SessionStats | None
+        If provided, the counters in which the onset of every trial is recorded for
+        the dashboard, instead of logging every trial.
+    """
+    duration_stim = int(DURATION_STIM * 1e9)
+    duration_iti = int(DURATION_ITI * 1e9)
+    if onsets is None:
+        onsets = compute_onsets(len(trials))
+    onsets = onsets.tolist()  # avoid numpy scalars in the loop
+    counter = checkpoint.counter
+    # the schedule is shifted by the start of the session and by the hold periods
+    offset = clock.get_time_ns() + duration_stim - onsets[counter]
     while counter < len(trials):
         k, trial = trials[counter]
-        # check for a message from Unity and potential hold
-        socks = dict(poller.poll(timeout=10))
-        if socket in socks and socks[socket] == zmq.POLLIN:
-            hold = _read_message(socket)
-        if hold:
-            logger.info("Holding at trial %i / %i", k, trials[-1][0])
-            sounds["standard"].play(when=ptb.GetSecs() + DURATION_STIM)
-            sleep(DURATION_STIM)
-            trigger.signal(TRIGGERS["hold"])
-            sleep(DURATION_ITI - DURATION_STIM)
+        onset = offset + onsets[counter]
+        if control.hold:
+            onset = _hold(
+                control,
+                clock,
+                sounds["standard"],
+                trigger,
+                onset,
+                duration_stim,
+                duration_iti,
+                f"trial {k} / {trials[-1][0]}",
+            )
+            offset = onset - onsets[counter]
             continue
-        logger.info("Trial %i / %i: %s", k, trials[-1][0], trial)
+        if stats is None:  # the dashboard replaces the per-trial logs
+            logger.info(
+                "Trial %i / %i: %s (onset %.4f s)", k, trials[-1][0], trial, onset / 1e9
+            )
         # handle trigger and sound
-        sounds[trial].play(when=ptb.GetSecs() + DURATION_STIM)
-        sleep(DURATION_STIM)
-        trigger.signal(TRIGGERS.get(trial, TRIGGERS["novel"]))
+        value = TRIGGERS.get(trial, TRIGGERS["novel"])
+        onset_ptb = clock.to_ptb(onset)
+        sounds[trial].play(when=onset_ptb)
+        if publisher is not None:
+            publisher.publish(k, trial, value, onset, onset_ptb)
+        clock.wait_until(onset)
+        trigger.signal(value)
+        if stats is not None:
+            stats.record_onset(k, clock.get_time_ns() - onset)
+        checkpoint.record(k, value, onset)
         counter += 1
         # handle inter-trial period
-        with keyboard.Listener(on_press=_callback_on_press):
-            sleep(DURATION_ITI - DURATION_STIM)
-    input(">>> Press ENTER to continue and close the window.")
+        onset = offset + onsets[counter]
+        if (
+            runtime is not None
+            and _GC_MIN_SLACK < onset - duration_stim - clock.get_time_ns()
+        ):
+            runtime.collect()
+        clock.wait_until(onset - duration_stim)
 
 
-def _callback_on_press(key):
-    """Callback function to call when a key is pressed."""  # noqa: D401
-    logger.info("Response %s pressed.", key)
+def _hold(
+    control: ControlServer,
+    clock: BaseClock,
+    sound: Any,
+    trigger: BaseTrigger,
+    onset: int,
+    duration_stim: int,
+    duration_iti: int,
+    position: str,
+) -> int:
+    """Play filler tones on the absolute schedule until the paradigm is resumed.
+
+    Between filler tones, the main thread blocks on the control server event instead
+    of polling, thus a resume is handled as soon as the message is received.
+
+    Parameters
+    ----------
+    control : ControlServer
+        The control server receiving the messages from Unity.
+    clock : BaseClock
+        The clock used to schedule the filler tones.
+    sound : object
+        The filler tone, with a ``play(when)`` method.
+    trigger : BaseTrigger
+        The trigger object used to mark the filler tones.
+    onset : int
+        Onset of the next filler tone in nanoseconds, in the referential of clock.
+    duration_stim : int
+        Duration in nanoseconds between the scheduling of a tone and its onset.
+    duration_iti : int
+        Duration in nanoseconds between 2 consecutive onsets.
+    position : str
+        Position in the trial list at which the hold occurs, used in the log.
 
+    Returns
+    -------
+    onset : int
+        Onset of the next trial in nanoseconds, in the referential of clock.
+    """
+    logger.info("Holding at %s.", position)
+    start = clock.get_time_ns()
+    n_tones = 0
+    while True:
+        timeout = (onset - duration_stim - clock.get_time_ns()) / 1e9
+        if control.wait_for_resume(max(timeout, 0)):
+            break
+        sound.play(when=clock.to_ptb(onset))
+        clock.wait_until(onset)
+        trigger.signal(TRIGGERS["hold"])
+        n_tones += 1
+        onset += duration_iti
+    logger.info(
+        "Resumed at %s after holding for %.2f s (%i filler tones).",
+        position,
+        (clock.get_time_ns() - start) / 1e9,
+        n_tones,
+    )
+    return onset
 
-def _read_message(socket) -> bool:
-    """Check if we received a message from Unity."""
-    message = socket.recv_string()  # Receive the message
-    logger.info("Received message from Unity: %s", message)
-    socket.send_string("ACK")
-    return _MESSAGES.get(message)
+
+def _callback_on_press(key, *, clock: BaseClock):
+    """Callback function to call when a key is pressed."""  # noqa: D401
+    logger.info("Response %s pressed at %.4f s.", key, clock.get_time_ns() / 1e9)
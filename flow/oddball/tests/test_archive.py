@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from flow.oddball._archive import SoundArchive, write_sound_archive
+
+
+def test_sound_archive(tmp_path):
+    """Test writing and reading a sound archive."""
+    rng = np.random.default_rng(0)
+    sounds = [
+        ("low_tone", 48000, rng.uniform(-1, 1, (9600, 1)).astype(np.float32)),
+        ("low_tone", 44100, rng.uniform(-1, 1, (8820, 1)).astype(np.float32)),
+        ("wav0001", 48000, rng.uniform(-1, 1, (101, 2)).astype(np.float32)),
+        ("wav0002", 48000, np.zeros((0, 1), dtype=np.float32)),
+    ]
+    fname = write_sound_archive(tmp_path / "sounds.pack", sounds)
+    archive = SoundArchive(fname)
+    assert len(archive) == 4
+    assert ("low_tone", 44100) in archive
+    assert ("low_tone", 96000) not in archive
+    assert archive.get("high_tone", 48000) is None
+    for name, sample_rate, data in sounds:
+        view = archive.get(name, sample_rate)
+        assert not view.flags.writeable
+        np.testing.assert_array_equal(view, data)
+        if view.size != 0:
+            assert isinstance(view, np.memmap)
+            assert view.ctypes.data % 64 == 0
+
+
+def test_sound_archive_empty(tmp_path):
+    """Test an archive without sounds."""
+    archive = SoundArchive(write_sound_archive(tmp_path / "sounds.pack", []))
+    assert len(archive) == 0
+    assert archive.sounds == []
+
+
+def test_sound_archive_invalid(tmp_path):
+    """Test invalid archives."""
+    data = np.zeros((10, 1), dtype=np.float32)
+    with pytest.raises(ValueError, match="unique"):
+        write_sound_archive(
+            tmp_path / "sounds.pack", [("a", 48000, data), ("a", 48000, data)]
+        )
+    with pytest.raises(ValueError, match="too long"):
+        write_sound_archive(tmp_path / "sounds.pack", [("a" * 17, 48000, data)])
+    with pytest.raises(ValueError, match="must be of shape"):
+        write_sound_archive(tmp_path / "sounds.pack", [("a", 48000, data.ravel())])
+    fname = tmp_path / "invalid.pack"
+    fname.write_bytes(b"\x00" * 128)
+    with pytest.raises(ValueError, match="not a sound archive"):
+        SoundArchive(fname)
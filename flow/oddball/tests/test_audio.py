@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from flow.oddball._audio import NullBackend, _Mixer, _MixerSound, create_backend
+from flow.oddball._time import VirtualClock
+
+
+def test_mixer():
+    """Test mixing scheduled sounds into the blocks of a stream."""
+    sample_rate, n_frames = 1000, 16
+    mixer = _Mixer(sample_rate)
+    sound = _MixerSound(mixer, np.ones((20, 1), dtype=np.float32))
+    sound.setVolume(0.5)
+    sound.play(when=0.010)  # sample 10, across the first 2 blocks
+    sound.play(when=0.040)  # sample 40, in the third block
+    blocks = np.empty((4, n_frames, 2), dtype=np.float32)
+    for k, block in enumerate(blocks):
+        mixer.render(block, dac_time=k * n_frames / sample_rate)
+    out = blocks.reshape(-1, 2)
+    expected = np.zeros(out.shape[0])
+    expected[10:30] += 0.5
+    expected[40:60] += 0.5
+    np.testing.assert_array_equal(out[:, 0], expected)
+    np.testing.assert_array_equal(out[:, 1], expected)
+    assert mixer.n_late == 0
+
+    # overlapping sounds are summed, a late sound is played at the start of the block
+    sound.play(when=0.070)
+    sound.play(when=0.075)
+    sound.play(when=0.0)
+    block = np.empty((n_frames, 1), dtype=np.float32)
+    mixer.render(block, dac_time=0.064)
+    assert mixer.n_late == 1
+    expected = np.full(n_frames, 0.5)
+    expected[6:] += 0.5
+    expected[11:] += 0.5
+    np.testing.assert_array_equal(block[:, 0], expected)
+
+
+def test_null_backend():
+    """Test the null backend."""
+    with NullBackend(sample_rate=44100, virtual=True) as backend:
+        assert backend.sample_rate == 44100
+        clock = backend.create_clock()
+        assert isinstance(clock, VirtualClock)
+        sound = backend.create_sound("standard", np.zeros((10, 1)), 48000, 0.2)
+        sound.setVolume(0.1)
+        assert sound.volume == 0.1
+        sound.play(when=clock.to_ptb(1_500_000_000))
+        assert sound.onsets == [1.5]
+        assert sound.positions == [66150]
+        with pytest.raises(ValueError, match="does not support"):
+            backend.create_clock(1.0)
+    assert isinstance(create_backend("null", "device"), NullBackend)
+    with pytest.raises(ValueError, match="Invalid value for the 'backend'"):
+        create_backend("101", "device")
@@ -0,0 +1,55 @@
+import pytest
+
+from flow.oddball._checkpoint import Checkpoint
+
+_TRIALS: list[tuple[int, str]] = [
+    (1, "standard"),
+    (2, "target"),
+    (3, "wav0000"),
+    (4, "standard"),
+]
+
+
+def test_checkpoint(tmp_path):
+    """Test creating, recording and resuming a checkpoint."""
+    fname = tmp_path / "checkpoints" / "test.ckpt"
+    with Checkpoint(fname, "test", _TRIALS) as checkpoint:
+        assert checkpoint.counter == 0
+        assert checkpoint.events.size == 0
+        checkpoint.record(1, 1, 200)
+        checkpoint.record(2, 2, 1200)
+        assert checkpoint.counter == 2
+    size = fname.stat().st_size
+    with Checkpoint(fname, "test", _TRIALS, resume=True) as checkpoint:
+        assert checkpoint.counter == 2
+        events = checkpoint.events
+        assert events["idx"].tolist() == [1, 2]
+        assert events["trigger"].tolist() == [1, 2]
+        assert events["onset"].tolist() == [200, 1200]
+        checkpoint.record(3, 3, 2200)
+    assert fname.stat().st_size == size  # fixed-size writes
+    # a new session overwrites the checkpoint
+    with Checkpoint(fname, "test", _TRIALS) as checkpoint:
+        assert checkpoint.counter == 0
+    # a resume without checkpoint starts a new session
+    with Checkpoint(tmp_path / "new.ckpt", "test", _TRIALS, resume=True) as checkpoint:
+        assert checkpoint.counter == 0
+
+
+def test_checkpoint_invalid(tmp_path):
+    """Test resuming from an invalid checkpoint."""
+    fname = tmp_path / "test.ckpt"
+    with Checkpoint(fname, "test", _TRIALS) as checkpoint:
+        for k, (idx, _) in enumerate(_TRIALS):
+            checkpoint.record(idx, 1, k)
+    with pytest.raises(RuntimeError, match="already completed"):
+        Checkpoint(fname, "test", _TRIALS, resume=True)
+    with pytest.raises(ValueError, match="does not match the trial list"):
+        Checkpoint(fname, "test", _TRIALS[:-1], resume=True)
+    with pytest.raises(ValueError, match="does not match the trial list"):
+        Checkpoint(fname, "other", _TRIALS, resume=True)
+    fname = tmp_path / "invalid.ckpt"
+    with open(fname, "wb") as fid:
+        fid.write(b"\x00" * 128)
+    with pytest.raises(ValueError, match="not a valid oddball checkpoint"):
+        Checkpoint(fname, "test", _TRIALS, resume=True)
@@ -0,0 +1,33 @@
+import pytest
+
+from flow.oddball._client import ControlClient
+from flow.oddball._control import ControlServer
+
+_ADDRESS: str = "tcp://127.0.0.1:5596"
+
+
+def test_control_client():
+    """Test sending messages on a persistent connection."""
+    with ControlServer(_ADDRESS) as control, ControlClient(_ADDRESS) as client:
+        assert 0 < client.send("hold")
+        assert control.hold
+        client.run(["continue", 0.01, "hold", "continue"], repeat=2)
+        assert not control.hold
+        assert client.rtts.size == 7
+        with pytest.raises(ValueError, match="Invalid value for the 'message'"):
+            client.send("101")
+        for pause in (-1, float("nan"), float("inf")):
+            with pytest.raises(ValueError, match="finite and positive"):
+                client.run(["hold", pause])
+
+
+def test_control_client_timeout():
+    """Test reconnecting and giving up when the server does not reply."""
+    with ControlClient(_ADDRESS, timeout=0.05, retries=1) as client:
+        with pytest.raises(TimeoutError, match="did not reply to 'hold' after 2"):
+            client.send("hold")
+        # the connection is usable once the server is started
+        with ControlServer(_ADDRESS) as control:
+            client.send("hold")
+            assert control.hold
+        assert client.rtts.size == 1
@@ -0,0 +1,95 @@
+import time
+from threading import Timer
+
+import pytest
+import zmq
+from byte_triggers import MockTrigger
+
+from flow.oddball._control import ControlServer
+from flow.oddball._time import Clock
+from flow.oddball.oddball import _hold
+
+_ADDRESS: str = "tcp://127.0.0.1:5599"
+
+
+def _send(message: str) -> str:
+    """Send a message to the control server."""
+    context = zmq.Context()
+    socket = context.socket(zmq.REQ)
+    socket.setsockopt(zmq.RCVTIMEO, 2000)
+    socket.connect(_ADDRESS)
+    socket.send_string(message)
+    reply = socket.recv_string()
+    socket.close(linger=0)
+    context.term()
+    return reply
+
+
+def test_control_server():
+    """Test receiving control messages in a background thread."""
+    with ControlServer(_ADDRESS) as control:
+        assert not control.hold
+        assert control.wait_for_resume(0)
+        assert _send("hold") == "ACK"
+        assert control.hold
+        assert not control.wait_for_resume(0.01)
+        with pytest.warns(RuntimeWarning, match="Unknown message"):
+            assert _send("101") == "ACK"
+        assert control.hold
+        Timer(0.05, _send, args=("continue",)).start()
+        start = time.perf_counter()
+        assert control.wait_for_resume(2)
+        assert time.perf_counter() - start < 1
+        assert not control.hold
+        assert control.n_messages == 3
+        assert control.latencies.size == 3
+        assert (0 < control.latencies).all()
+    # a stopped server can be started again
+    control.start()
+    try:
+        assert _send("hold") == "ACK"
+        assert control.hold
+    finally:
+        control.stop()
+
+
+class _Sound:
+    """Sound recording the scheduled onsets."""
+
+    def __init__(self):
+        self.onsets = list()
+
+    def play(self, when: float):
+        self.onsets.append(when)
+
+
+class _Clock(Clock):
+    def to_ptb(self, time_ns: int) -> float:
+        return time_ns / 1e9
+
+
+def test_hold():
+    """Test the hold state machine."""
+    clock = _Clock()
+    sound = _Sound()
+    trigger = MockTrigger()
+    duration_stim = 10_000_000  # 10 ms
+    duration_iti = 50_000_000  # 50 ms
+    with ControlServer(_ADDRESS) as control:
+        _send("hold")
+        Timer(0.22, _send, args=("continue",)).start()
+        onset = _hold(
+            control,
+            clock,
+            sound,
+            trigger,
+            duration_stim,
+            duration_stim,
+            duration_iti,
+            "trial 1 / 1",
+        )
+    assert 3 <= len(sound.onsets) <= 5
+    assert onset == duration_stim + len(sound.onsets) * duration_iti
+    # the filler tones follow the absolute schedule
+    for k, when in enumerate(sound.onsets):
+        assert when == pytest.approx((duration_stim + k * duration_iti) / 1e9)
@@ -0,0 +1,66 @@
+import uuid
+
+import numpy as np
+
+from flow.force import ForceReader, ForceWriter
+from flow.oddball._audio import NullSound
+from flow.oddball._checkpoint import Checkpoint
+from flow.oddball._dashboard import SessionStats, _render_session
+from flow.oddball._simulation import FakeTrigger, ScriptedController
+from flow.oddball._time import VirtualClock
+from flow.oddball.oddball import _run_trials
+
+_TRIALS = [(1, "standard"), (2, "target"), (3, "standard"), (4, "standard")]
+
+
+class _Control:
+    """Control server with a fixed state."""
+
+    hold = True
+    n_messages = 2
+    latencies = np.array([100_000, 300_000])
+
+
+def test_session_stats():
+    """Test the counters of a session."""
+    stats = SessionStats(10, capacity=4)
+    assert stats.lateness.size == 0
+    for k in range(1, 7):
+        stats.record_onset(k, k * 1000)
+    assert stats.trial == 6
+    assert sorted(stats.lateness) == [3000, 4000, 5000, 6000]
+    lines = _render_session(stats, _Control(), None)()
+    assert lines[0].startswith("Trial")
+    assert "6 / 10" in lines[0]
+    assert "(holding)" in lines[0]
+    assert "4 onsets" in lines[1]
+    assert "max 0.006" in lines[1]
+    assert "2 messages" in lines[2]
+    assert "max 0.300" in lines[2]
+    assert lines[3].endswith("no stream")
+
+
+def test_render_session_force():
+    """Test rendering the force stream read from the shared memory ring."""
+    name = f"flow-test-{uuid.uuid4().hex[:8]}"
+    with ForceWriter(name, capacity=16) as writer, ForceReader(name) as reader:
+        render = _render_session(SessionStats(10), _Control(), reader)
+        writer.stale = True
+        assert render()[3].endswith("stale 1 times  (stale)")
+        writer.stale = False
+        assert render()[3].endswith("stale 1 times")
+
+
+def test_run_trials_stats(tmp_path):
+    """Test recording the onsets of the trials in the counters."""
+    clock = VirtualClock()
+    sounds = {name: NullSound(name) for name in ("standard", "target")}
+    control = ScriptedController([], clock)
+    stats = SessionStats(4)
+    with Checkpoint(tmp_path / "test.ckpt", "test", _TRIALS) as checkpoint:
+        _run_trials(
+            _TRIALS, checkpoint, sounds, FakeTrigger(), clock, control, stats=stats
+        )
+    assert stats.trial == 4
+    # the virtual clock wakes up exactly at the onsets
+    np.testing.assert_array_equal(stats.lateness, np.zeros(4))
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from flow.oddball._dsp import resample_poly
+
+
+@pytest.mark.parametrize(("up", "down"), [(147, 160), (160, 147), (2, 1), (1, 3)])
+def test_resample_poly(up, down):
+    """Test resampling a sine wave."""
+    n_samples = 4800
+    times = np.arange(n_samples) / 48000
+    data = np.sin(2 * np.pi * 1000 * times)[:, np.newaxis].astype(np.float32)
+    out = resample_poly(data, up, down)
+    assert out.shape == (-(-n_samples * up // down), 1)
+    assert out.dtype == np.float32
+    times = np.arange(out.shape[0]) / (48000 * up / down)
+    expected = np.sin(2 * np.pi * 1000 * times)
+    # ignore the edges, affected by the zero-padding
+    np.testing.assert_allclose(out[50:-50, 0], expected[50:-50], atol=1e-3)
+
+
+def test_resample_poly_scipy():
+    """Test that the resampling matches scipy."""
+    signal = pytest.importorskip("scipy.signal")
+    data = np.random.default_rng(0).standard_normal((1000, 2))
+    out = resample_poly(data, 147, 160)
+    np.testing.assert_allclose(
+        out, signal.resample_poly(data, 147, 160, axis=0), atol=1e-10
+    )
+
+
+def test_resample_poly_invalid():
+    """Test invalid resampling factors."""
+    data = np.zeros((10, 1))
+    assert resample_poly(data, 3, 3) is not data
+    with pytest.raises(ValueError, match="must be positive"):
+        resample_poly(data, 0, 3)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from flow.oddball import generate_trial_lists, write_trial_list
+from flow.oddball._prepare import _TRIALS_DTYPE
+from flow.oddball._utils import parse_trial_list
+
+
+def test_generate_trial_lists():
+    """Test the constraints of the generated trial lists."""
+    trial_lists = generate_trial_lists(
+        300, 200, p_target=0.1, p_novel=0.15, min_spacing=3, seed=0, n_jobs=1
+    )
+    assert len(trial_lists) == 300
+    for trials in trial_lists:
+        assert trials.dtype == _TRIALS_DTYPE
+        np.testing.assert_array_equal(trials["idx"], np.arange(1, 201))
+        assert np.sum(trials["trial"] == "target") == 20
+        novels = trials["trial"][np.char.startswith(trials["trial"], "wav")]
+        assert novels.size == 30
+        assert np.unique(novels).size == novels.size
+        deviants = np.flatnonzero(trials["trial"] != "standard")
+        assert np.diff(deviants).min() >= 3
+    # different lists, reproducible regardless of the number of jobs
+    assert not np.array_equal(trial_lists[0], trial_lists[1])
+    trial_lists2 = generate_trial_lists(
+        300, 200, p_target=0.1, p_novel=0.15, min_spacing=3, seed=0, n_jobs=2
+    )
+    for trials, trials2 in zip(trial_lists, trial_lists2):
+        np.testing.assert_array_equal(trials, trials2)
+
+
+def test_generate_trial_lists_cross(tmp_path):
+    """Test inserting crosses and writing the trial lists."""
+    (trials,) = generate_trial_lists(1, 20, cross_every=5, seed=1)
+    assert trials.size == 24
+    crosses = trials[trials["trial"] == "cross"]
+    np.testing.assert_array_equal(crosses["idx"], [1, 6, 11, 16])
+    write_trial_list(trials, tmp_path / "test.txt")
+    assert parse_trial_list(tmp_path / "test.txt") == trials.tolist()
+
+
+def test_generate_trial_lists_invalid():
+    """Test invalid constraints."""
+    with pytest.raises(ValueError, match="do not fit in 10 trials"):
+        generate_trial_lists(1, 10, p_target=0.3, p_novel=0.3, min_spacing=2)
+    with pytest.raises(ValueError, match="must be between 0 and 1"):
+        generate_trial_lists(1, 10, p_target=1.5)
+    with pytest.raises(ValueError, match="novel sounds are available"):
+        generate_trial_lists(1, 100_000, p_target=0, p_novel=0.5, min_spacing=1)
+    with pytest.raises(TypeError, match="'n_lists' must be an integer"):
+        generate_trial_lists(1.5, 10)
@@ -0,0 +1,25 @@
+import multiprocessing
+import time
+from threading import Timer
+
+from flow.oddball._multiprocess import _SharedController, _SharedControlServer
+from flow.oddball._shared import SharedState
+
+
+def test_shared_controller():
+    """Test the hold state shared with the stimulus process."""
+    resume = multiprocessing.get_context("spawn").Event()
+    resume.set()
+    with SharedState() as state:
+        server = _SharedControlServer("tcp://127.0.0.1:5601", state, resume)
+        controller = _SharedController(state, resume)
+        assert not controller.hold
+        assert controller.wait_for_resume(0)
+        server._handle_message("hold")
+        assert controller.hold
+        assert not controller.wait_for_resume(0.01)
+        Timer(0.05, server._handle_message, args=("continue",)).start()
+        start = time.perf_counter()
+        assert controller.wait_for_resume(2)
+        assert time.perf_counter() - start < 1
+        assert not controller.hold
@@ -0,0 +1,166 @@
+import json
+from importlib.resources import files
+
+import numpy as np
+import pytest
+
+from flow.oddball import prepare, write_trial_list
+from flow.oddball._audio import NullBackend
+from flow.oddball._io import read_wav
+from flow.oddball._prepare import (
+    _compile_trial_list,
+    _list_resources,
+    _read_manifest,
+    _scan_resources,
+    list_resources,
+    load_prepared_itis,
+    load_prepared_sound,
+    load_prepared_trials,
+)
+from flow.oddball._schedule import parse_itis
+from flow.oddball._utils import _load_sounds, parse_trial_list
+
+
+def test_prepare(tmp_path):
+    """Test preparing the trial lists and the sounds."""
+    assert load_prepared_trials("solo", tmp_path) is None
+    assert load_prepared_sound("low_tone", tmp_path) is None
+    fname = prepare(tmp_path, n_jobs=2)
+    with open(fname) as fid:
+        manifest = json.load(fid)
+    assert sorted(manifest["conditions"]) == [
+        "main1",
+        "main2",
+        "main3",
+        "solo",
+        "stp1",
+        "stp2",
+        "stp3",
+    ]
+    assert "low_tone" in manifest["sounds"]
+    assert "wav0000" in manifest["sounds"]
+    assert (tmp_path / manifest["archive"]["file"]).exists()
+    assert not (tmp_path / "sounds").exists()
+    for condition in manifest["conditions"]:
+        fname_trials = files("flow.oddball") / "trialList" / f"{condition}.txt"
+        assert load_prepared_trials(condition, tmp_path) == parse_trial_list(
+            fname_trials
+        )
+        itis = parse_itis(fname_trials)
+        if itis is None:
+            assert load_prepared_itis(condition, tmp_path) is None
+        else:
+            np.testing.assert_array_equal(load_prepared_itis(condition, tmp_path), itis)
+    data, sample_rate, _ = load_prepared_sound("wav0100", tmp_path)
+    assert isinstance(data, np.memmap)
+    expected, expected_rate = read_wav(
+        files("flow.oddball") / "sounds" / "wav0100-48000.wav"
+    )
+    assert sample_rate == expected_rate
+    np.testing.assert_array_equal(data, expected)
+
+
+def test_prepare_stale(tmp_path):
+    """Test that stale prepared artifacts are ignored."""
+    fname = prepare(tmp_path, n_jobs=1)
+    assert load_prepared_trials("solo", tmp_path) is not None
+    with open(fname) as fid:
+        manifest = json.load(fid)
+    manifest["conditions"]["solo"]["size"] += 1
+    manifest["sounds"]["low_tone"]["mtime_ns"] += 1
+    manifest["sounds"]["low_tone"]["hash"] = "0" * 32
+    # a different modification time with the same content, e.g. after a reinstall
+    manifest["sounds"]["high_tone"]["mtime_ns"] += 1
+    with open(fname, "w") as fid:
+        json.dump(manifest, fid)
+    _read_manifest.cache_clear()
+    assert load_prepared_trials("solo", tmp_path) is None
+    assert load_prepared_trials("main1", tmp_path) is not None
+    assert load_prepared_sound("low_tone", tmp_path) is None
+    assert load_prepared_sound("high_tone", tmp_path) is not None
+    manifest["archive"]["size"] += 1
+    with open(fname, "w") as fid:
+        json.dump(manifest, fid)
+    _read_manifest.cache_clear()
+    assert load_prepared_sound("high_tone", tmp_path) is None
+
+
+def test_prepare_sample_rates(tmp_path):
+    """Test preparing the sounds at several sample rates."""
+    prepare(tmp_path, n_jobs=1, sample_rates=[44100, 48000])
+    data, sample_rate, gain = load_prepared_sound("low_tone", tmp_path, 44100)
+    assert sample_rate == 44100
+    expected = load_prepared_sound("low_tone", tmp_path)
+    assert expected[1] == 48000
+    assert gain == expected[2]
+    assert data.shape == (expected[0].shape[0] * 147 // 160, 1)
+    assert data.dtype == np.float32
+    assert load_prepared_sound("low_tone", tmp_path, 96000) is None
+
+
+def test_prepare_gains(tmp_path):
+    """Test the normalization of the loudness of the novel sounds."""
+    fname = prepare(tmp_path, n_jobs=1)
+    with open(fname) as fid:
+        sounds = json.load(fid)["sounds"]
+    assert sounds["low_tone"]["gain"] == sounds["high_tone"]["gain"] == 1
+    novels = [entry for name, entry in sounds.items() if name.startswith("wav")]
+    rms = np.array([entry["rms"] * entry["gain"] for entry in novels])
+    peak = np.array([entry["peak"] * entry["gain"] for entry in novels])
+    assert np.all(peak <= 1 + 1e-6)
+    # the sounds which are not limited by their peak share the same loudness
+    target = np.median([entry["rms"] for entry in novels])
+    unclipped = peak < 1 - 1e-6
+    assert 0.5 * len(novels) < np.sum(unclipped)
+    np.testing.assert_allclose(rms[unclipped], target, rtol=1e-6)
+    _, _, gain = load_prepared_sound("wav0000", tmp_path)
+    assert gain == sounds["wav0000"]["gain"]
+
+
+def test_list_resources(tmp_path):
+    """Test listing the resources from the manifest."""
+    resources = list_resources(tmp_path)  # no manifest, scanned
+    assert resources == _scan_resources()
+    assert "low_tone" in resources["sounds"]
+    assert "wav0000" in resources["sounds"]
+    assert "solo" in resources["conditions"]
+    fname = prepare(tmp_path, n_jobs=1)
+    assert list_resources(tmp_path) == resources
+    assert list_resources(tmp_path) is list_resources(tmp_path)
+    # a manifest listing different resources is used as long as it is fresh
+    with open(fname) as fid:
+        manifest = json.load(fid)
+    del manifest["conditions"]["solo"]
+    with open(fname, "w") as fid:
+        json.dump(manifest, fid)
+    _read_manifest.cache_clear()
+    _list_resources.cache_clear()
+    assert "solo" not in list_resources(tmp_path)["conditions"]
+    # a stale manifest is ignored
+    manifest["resources"]["sounds"] += 1
+    with open(fname, "w") as fid:
+        json.dump(manifest, fid)
+    _read_manifest.cache_clear()
+    _list_resources.cache_clear()
+    assert list_resources(tmp_path) == resources
+
+
+def test_compile_trial_list_itis(tmp_path):
+    """Test storing the ITIs of a trial list."""
+    trials = [(1, "standard"), (2, "target"), (3, "standard")]
+    (tmp_path / "trialList").mkdir()
+    write_trial_list(trials, tmp_path / "itis.txt", [1.0, 1.25, 1.5])
+    entry = _compile_trial_list(tmp_path / "itis.txt", tmp_path)
+    np.testing.assert_array_equal(np.load(tmp_path / entry["itis"]), [1, 1.25, 1.5])
+    write_trial_list(trials, tmp_path / "constant.txt")
+    assert _compile_trial_list(tmp_path / "constant.txt", tmp_path)["itis"] is None
+
+
+def test_load_sounds_gains(tmp_path, monkeypatch):
+    """Test the warning on the novel sounds played without their gain."""
+    monkeypatch.setattr("flow.oddball._prepare.CACHE_DIRECTORY", tmp_path)
+    trials = [(1, "standard"), (2, "wav0100")]
+    with pytest.warns(RuntimeWarning, match="wav0100 is not normalized"):
+        _load_sounds(trials, 0.2, NullBackend(), 1.0)
+    prepare(tmp_path, n_jobs=1)
+    _load_sounds(trials, 0.2, NullBackend(), 1.0)
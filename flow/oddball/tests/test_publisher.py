@@ -0,0 +1,79 @@
+import time
+
+import zmq
+
+from flow.oddball._audio import NullSound
+from flow.oddball._checkpoint import Checkpoint
+from flow.oddball._config import TRIGGERS
+from flow.oddball._publisher import EventPublisher, unpack_event
+from flow.oddball._simulation import FakeTrigger, ScriptedController
+from flow.oddball._time import VirtualClock
+from flow.oddball.oddball import _run_trials
+
+_ADDRESS: str = "tcp://127.0.0.1:5598"
+
+
+def test_event_publisher():
+    """Test publishing trial events to a subscriber."""
+    context = zmq.Context()
+    socket = context.socket(zmq.SUB)
+    socket.setsockopt(zmq.SUBSCRIBE, b"")
+    socket.setsockopt(zmq.RCVTIMEO, 100)
+    try:
+        with EventPublisher(_ADDRESS) as publisher:
+            socket.connect(_ADDRESS)
+            # the subscription is propagated asynchronously to the publisher
+            start = time.monotonic()
+            while time.monotonic() - start < 5:
+                publisher.publish(101, "wav0001", 3, 1_200_000_000, 12.5)
+                try:
+                    message = socket.recv()
+                except zmq.Again:
+                    continue
+                break
+            assert len(message) == 40
+            assert unpack_event(message) == {
+                "idx": 101,
+                "trigger": 3,
+                "onset": 1_200_000_000,
+                "onset_ptb": 12.5,
+                "stimulus": "wav0001",
+            }
+    finally:
+        socket.close(linger=0)
+        context.term()
+
+
+class _Publisher:
+    """Publisher recording the events."""
+
+    def __init__(self):
+        self.events = list()
+
+    def publish(self, *args):
+        self.events.append(args)
+
+
+def test_run_trials_publish(tmp_path):
+    """Test that the trial loop publishes every trial ahead of its onset."""
+    trials = [(1, "standard"), (2, "target"), (3, "wav0001")]
+    clock = VirtualClock()
+    sounds = {name: NullSound(name) for name in ("standard", "target", "wav0001")}
+    publisher = _Publisher()
+    with Checkpoint(tmp_path / "test.ckpt", "test", trials) as checkpoint:
+        _run_trials(
+            trials,
+            checkpoint,
+            sounds,
+            FakeTrigger(),
+            clock,
+            ScriptedController([], clock),
+            publisher=publisher,
+        )
+        events = checkpoint.events
+    assert [event[:3] for event in publisher.events] == [
+        (1, "standard", TRIGGERS["standard"]),
+        (2, "target", TRIGGERS["target"]),
+        (3, "wav0001", TRIGGERS["novel"]),
+    ]
+    assert [event[3] for event in publisher.events] == events["onset"].tolist()
@@ -0,0 +1,66 @@
+import gc
+import sys
+
+import numpy as np
+import psutil
+import pytest
+
+from flow.oddball._runtime import (
+    RealtimeSession,
+    _measure_wakeup_latency,
+    _os_sleep_until,
+)
+
+
+def test_realtime_session():
+    """Test the garbage collection control of the real-time session."""
+    assert gc.isenabled()
+    with RealtimeSession(lock_memory=False) as session:
+        assert not gc.isenabled()
+        assert gc.get_freeze_count() != 0
+        session.collect()
+        assert session.gc_pauses.size == 1
+        assert 0 < session.gc_pauses[0]
+    assert gc.isenabled()
+    assert gc.get_freeze_count() == 0
+
+
+@pytest.mark.skipif(
+    not hasattr(psutil.Process, "cpu_affinity"), reason="CPU affinity not supported."
+)
+def test_realtime_session_affinity():
+    """Test pinning the process on cores."""
+    affinity = psutil.Process().cpu_affinity()
+    with RealtimeSession([affinity[0]], lock_memory=False):
+        assert psutil.Process().cpu_affinity() == [affinity[0]]
+    assert psutil.Process().cpu_affinity() == affinity
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only.")
+def test_realtime_session_memory():
+    """Test locking the memory."""
+    import resource
+
+    limit = resource.getrlimit(resource.RLIMIT_MEMLOCK)[0]
+    if limit == resource.RLIM_INFINITY:
+        with RealtimeSession(lock_memory=True):
+            pass
+    else:
+        with pytest.warns(RuntimeWarning, match="memlock limit"):
+            with RealtimeSession(lock_memory=True):
+                pass
+
+
+def test_realtime_session_invalid():
+    """Test invalid arguments."""
+    with pytest.raises(TypeError, match="'cores' must be an instance of"):
+        RealtimeSession(1)
+    with pytest.raises(TypeError, match="'core' must be an integer"):
+        RealtimeSession([1.5])
+
+
+def test_measure_wakeup_latency():
+    """Test the measurement of the wake-up latency."""
+    overshoots = _measure_wakeup_latency(_os_sleep_until, n_iterations=10, period=0.001)
+    assert overshoots.shape == (10,)
+    assert np.all(0 <= overshoots)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from flow.oddball import write_trial_list
+from flow.oddball._audio import NullSound
+from flow.oddball._checkpoint import Checkpoint
+from flow.oddball._config import DURATION_ITI, DURATION_STIM, ITI_MARGIN, TRIGGERS
+from flow.oddball._schedule import compute_onsets, parse_itis
+from flow.oddball._simulation import FakeTrigger, ScriptedController
+from flow.oddball._time import VirtualClock
+from flow.oddball._utils import parse_trial_list
+from flow.oddball.oddball import _run_trials
+
+_TRIALS = [(1, "standard"), (2, "target"), (3, "standard"), (4, "standard")]
+
+
+def test_compute_onsets():
+    """Test computing the onsets with constant and jittered ITIs."""
+    onsets = compute_onsets(4)
+    np.testing.assert_array_equal(onsets, np.arange(5) * int(DURATION_ITI * 1e9))
+    low = DURATION_STIM + ITI_MARGIN + 0.1
+    onsets = compute_onsets(100, jitter=(low, low + 0.5), seed=0)
+    assert onsets.dtype == np.int64
+    itis = np.diff(onsets) / 1e9
+    assert np.all((low <= itis) & (itis <= low + 0.5))
+    assert np.unique(itis).size == 100
+    np.testing.assert_array_equal(
+        onsets, compute_onsets(100, jitter=(low, low + 0.5), seed=0)
+    )
+    # the ITIs take precedence over the jitter
+    onsets = compute_onsets(2, [1.0, 1.5], jitter=(low, low + 0.5))
+    np.testing.assert_array_equal(onsets, [0, 1_000_000_000, 2_500_000_000])
+
+
+def test_compute_onsets_invalid():
+    """Test invalid ITIs."""
+    with pytest.raises(ValueError, match="shorter than the minimum"):
+        compute_onsets(3, [1.0, DURATION_STIM, 1.0])
+    with pytest.raises(ValueError, match="shorter than the minimum"):
+        compute_onsets(3, jitter=(0.1, 0.2))
+    with pytest.raises(ValueError, match="must be ordered"):
+        compute_onsets(3, jitter=(2.0, 1.0))
+    with pytest.raises(ValueError, match="does not match the number of trials"):
+        compute_onsets(3, [1.0, 1.0])
+
+
+def test_parse_itis(tmp_path):
+    """Test parsing the ITI column of a trial list."""
+    write_trial_list(_TRIALS, tmp_path / "constant.txt")
+    assert parse_itis(tmp_path / "constant.txt") is None
+    write_trial_list(_TRIALS, tmp_path / "itis.txt", [1.0, 1.25, 1.5, 1.0])
+    np.testing.assert_array_equal(parse_itis(tmp_path / "itis.txt"), [1, 1.25, 1.5, 1])
+    assert parse_trial_list(tmp_path / "itis.txt") == _TRIALS
+    with open(tmp_path / "invalid.txt", "w") as fid:
+        fid.write("1, standard, 1.0\n2, target\n")
+    with pytest.raises(ValueError, match="every trial or of none"):
+        parse_itis(tmp_path / "invalid.txt")
+
+
+def test_run_trials_onsets(tmp_path):
+    """Test running the trials on a precomputed schedule with a hold."""
+    onsets = compute_onsets(4, [1.0, 2.0, 1.5, 1.0])
+    clock = VirtualClock()
+    sounds = {name: NullSound(name) for name in ("standard", "target")}
+    trigger = FakeTrigger()
+    control = ScriptedController([(2.5, "hold"), (4.0, "continue")], clock)
+    with Checkpoint(tmp_path / "test.ckpt", "test", _TRIALS) as checkpoint:
+        _run_trials(_TRIALS, checkpoint, sounds, trigger, clock, control, None, onsets)
+        events = checkpoint.events
+    stim = int(DURATION_STIM * 1e9)
+    # the hold starts before the 3rd trial and plays 1 filler tone at 3.2 s, the
+    # remaining trials are shifted by the hold and keep their ITIs
+    assert trigger.values.count(TRIGGERS["hold"]) == 1
+    np.testing.assert_array_equal(
+        events["onset"],
+        np.array([0, 1.0, 3.0 + DURATION_ITI, 4.5 + DURATION_ITI]) * 1e9 + stim,
+    )
@@ -0,0 +1,77 @@
+import logging
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from flow.oddball._shared import (
+    LOG_DTYPE,
+    READY,
+    EventRing,
+    RingHandler,
+    SharedState,
+    handle_records,
+)
+
+_DTYPE = np.dtype([("idx", "<u4"), ("value", "<i8")])
+
+
+def _produce(state: str, ring: str, n_records: int) -> None:
+    """Write records in the ring from another process."""
+    state = SharedState(state)
+    ring = EventRing(_DTYPE, capacity=16, name=ring)
+    for k in range(n_records):
+        while not ring.push((k, 10 * k)):
+            pass  # wait for the consumer to read the ring, counted as dropped
+    state.status = READY
+    state.close()
+    ring.close()
+
+
+def test_event_ring():
+    """Test writing and reading the ring in the same process."""
+    with EventRing(_DTYPE, capacity=4) as ring:
+        assert ring.pop().size == 0
+        for k in range(5):
+            assert ring.push((k, k)) == (k < 4)
+        assert ring.dropped == 1
+        records = ring.pop()
+        np.testing.assert_array_equal(records["idx"], np.arange(4))
+        assert ring.push((5, 5))  # wraps around the end of the ring
+        np.testing.assert_array_equal(ring.pop()["idx"], [5])
+    with pytest.raises(ValueError, match="must be positive"):
+        EventRing(_DTYPE, capacity=0)
+
+
+def test_event_ring_multiprocess():
+    """Test reading records written by another process."""
+    context = multiprocessing.get_context("spawn")
+    with SharedState() as state, EventRing(_DTYPE, capacity=16) as ring:
+        assert not state.hold
+        process = context.Process(target=_produce, args=(state.name, ring.name, 100))
+        process.start()
+        records = list()
+        while state.status != READY or len(records) != 100:
+            records.extend(ring.pop().tolist())
+        process.join()
+        assert process.exitcode == 0
+        assert records == [(k, 10 * k) for k in range(100)]
+
+
+def test_ring_handler(caplog):
+    """Test sending log records through a ring."""
+    logger = logging.getLogger("test_ring_handler")
+    with EventRing(LOG_DTYPE) as ring:
+        handler = RingHandler(ring)
+        logger.addHandler(handler)
+        logger.propagate = False
+        logger.warning("Trial %i played.", 101)
+        logger.removeHandler(handler)
+        records = ring.pop()
+    assert records.size == 1
+    logger.propagate = True
+    with caplog.at_level(logging.INFO, logger="test_ring_handler"):
+        handle_records(logger, records)
+    assert caplog.records[0].getMessage() == "Trial 101 played."
+    assert caplog.records[0].levelno == logging.WARNING
+    assert caplog.records[0].funcName == "test_ring_handler"
@@ -0,0 +1,71 @@
+import time
+from importlib.resources import files
+
+import numpy as np
+import pytest
+
+from flow.oddball import simulate
+from flow.oddball._config import DURATION_ITI, DURATION_STIM, TRIGGERS
+from flow.oddball._simulation import ScriptedController
+from flow.oddball._time import VirtualClock
+from flow.oddball._utils import parse_trial_list
+
+
+def test_scripted_controller():
+    """Test the scripted controller in virtual time."""
+    clock = VirtualClock()
+    control = ScriptedController([(2.0, "continue"), (1.0, "hold")], clock)
+    assert not control.hold
+    assert control.wait_for_resume(0)
+    clock.wait_until(1_000_000_000)
+    assert control.hold
+    assert not control.wait_for_resume(0.5)
+    assert clock.get_time_ns() == 1_500_000_000
+    assert control.wait_for_resume()
+    assert clock.get_time_ns() == 2_000_000_000
+    assert not control.hold
+
+    control = ScriptedController([(0, "hold")], clock)
+    assert not control.wait_for_resume(1)
+    with pytest.raises(RuntimeError, match="never resumes"):
+        control.wait_for_resume()
+    with pytest.raises(ValueError, match="Invalid value for the 'message'"):
+        ScriptedController([(0, "101")], clock)
+
+
+def test_simulate():
+    """Test simulating a condition in virtual time."""
+    trials = parse_trial_list(files("flow.oddball") / "trialList" / "main1.txt")
+    start = time.perf_counter()
+    events, sounds, trigger = simulate("main1")
+    assert time.perf_counter() - start < 1
+    assert events["idx"].tolist() == [idx for idx, _ in trials]
+    expected = [TRIGGERS.get(trial, TRIGGERS["novel"]) for _, trial in trials]
+    assert events["trigger"].tolist() == expected
+    assert trigger.values == expected
+    onsets = np.diff(events["onset"])
+    assert np.all(onsets == int(DURATION_ITI * 1e9))
+    assert events["onset"][0] == int(DURATION_STIM * 1e9)
+    n_standards = sum(trial == "standard" for _, trial in trials)
+    assert len(sounds["standard"].onsets) == n_standards
+    # the null backend records the onsets as sample positions
+    positions = np.round(np.array(sounds["standard"].onsets) * 48000)
+    assert sounds["standard"].positions == positions.astype(int).tolist()
+
+
+def test_simulate_hold():
+    """Test simulating a condition with a hold period."""
+    events, sounds, trigger = simulate("solo", [(10.0, "hold"), (15.5, "continue")])
+    # 6 filler tones are played at 10.2, 11.2, .., 15.2 s
+    assert trigger.values.count(TRIGGERS["hold"]) == 6
+    onsets = np.diff(events["onset"])
+    assert np.all(
+        np.isin(onsets, (int(DURATION_ITI * 1e9), int(7 * DURATION_ITI * 1e9)))
+    )
+    assert np.sum(onsets != int(DURATION_ITI * 1e9)) == 1
+    n_trials = len(events)
+    n_standards = np.sum(events["trigger"] == TRIGGERS["standard"])
+    assert len(sounds["standard"].onsets) == n_standards + 6
+    assert n_trials == len(
+        parse_trial_list(files("flow.oddball") / "trialList" / "solo.txt")
+    )
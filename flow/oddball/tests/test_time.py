@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from flow.oddball._time import Clock, PTBClock, sleep, sync_clocks
+
+
+@pytest.mark.parametrize("clock", [Clock, PTBClock])
+def test_clock(clock):
+    """Test the clocks."""
+    if clock is PTBClock:
+        pytest.importorskip("psychtoolbox", exc_type=ImportError)
+    clock = clock()
+    t0 = clock.get_time_ns()
+    assert isinstance(t0, int)
+    time.sleep(0.05)
+    assert 0.04 < clock.get_time() - t0 / 1e9 < 0.1
+
+
+@pytest.mark.parametrize("clock", [Clock, PTBClock])
+def test_wait_until(clock):
+    """Test waiting until an absolute deadline."""
+    if clock is PTBClock:
+        pytest.importorskip("psychtoolbox", exc_type=ImportError)
+    clock = clock()
+    deadline = clock.get_time_ns() + 20_000_000  # 20 ms
+    clock.wait_until(deadline)
+    assert deadline <= clock.get_time_ns() < deadline + 10_000_000
+    # past deadline should return immediately
+    start = clock.get_time_ns()
+    clock.wait_until(0)
+    assert clock.get_time_ns() - start < 1_000_000
+
+
+def test_sleep():
+    """Test the high precision sleep."""
+    clock = Clock()
+    sleep(0.02)
+    assert 0.02 <= clock.get_time() < 0.03
+    sleep(-1)
+    assert clock.get_time() < 0.04
+
+
+def test_sync_clocks():
+    """Test the estimation of offset and drift between clocks."""
+    reference = Clock()
+    time.sleep(0.01)
+    clock = Clock()  # t0 is 10 ms later, thus clock is behind the reference
+    offset, drift = sync_clocks(clock, reference, n_samples=20, interval=0.001)
+    assert -20e6 < offset < -10e6
+    assert abs(drift) < 1e-3
+
+    with pytest.raises(ValueError, match="at least 2"):
+        sync_clocks(clock, reference, n_samples=1)
+    with pytest.raises(TypeError, match="'clock' must be an instance of"):
+        sync_clocks(101, reference)
+
+
+def test_sync_clocks_ptb():
+    """Test the estimation of offset and drift with the psychtoolbox clock."""
+    pytest.importorskip("psychtoolbox", exc_type=ImportError)
+    reference = Clock()
+    time.sleep(0.01)
+    offset, drift = sync_clocks(PTBClock(), reference, n_samples=20, interval=0.001)
+    assert offset < 0
+    assert abs(drift) < 1e-3
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 import operator
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -13,7 +14,7 @@ import numpy as np
 from ._docs import fill_doc
 
 if TYPE_CHECKING:
-    from typing import Any, Optional, Union
+    from typing import Any, Callable, Optional, Union
 
 
 def ensure_int(item: Any, item_name: Optional[str] = None) -> int:
@@ -91,7 +92,18 @@ def check_type(item: Any, types: tuple, item_name: Optional[str] = None) -> None
     TypeError
         When the type of the item is not one of the valid options.
     """
-    check_types = sum(
+    try:
+        check_types = _resolve_types(types)
+    except TypeError:  # unhashable types, e.g. a list
+        check_types = _resolve_types.__wrapped__(types)
+    if not isinstance(item, check_types):
+        _raise_type_error(item, types, item_name)
+
+
+@lru_cache(maxsize=256)
+def _resolve_types(types: tuple) -> tuple:
+    """Resolve the type aliases and None to a tuple of types."""
+    return sum(
         (
             (type(None),)
             if type_ is None
@@ -103,26 +115,66 @@ def check_type(item: Any, types: tuple, item_name: Optional[str] = None) -> None
         (),
     )
 
-    if not isinstance(item, check_types):
-        type_name = [
-            "None"
-            if cls_ is None
-            else cls_.__name__
-            if not isinstance(cls_, str)
-            else cls_
-            for cls_ in types
-        ]
-        if len(type_name) == 1:
-            type_name = type_name[0]
-        elif len(type_name) == 2:
-            type_name = " or ".join(type_name)
-        else:
-            type_name[-1] = "or " + type_name[-1]
-            type_name = ", ".join(type_name)
-        item_name = "Item" if item_name is None else f"'{item_name}'"
-        raise TypeError(
-            f"{item_name} must be an instance of {type_name}, got {type(item)} instead."
-        )
+
+def _raise_type_error(item: Any, types: tuple, item_name: Optional[str]) -> None:
+    """Raise the TypeError of check_type."""
+    type_name = [
+        "None" if cls_ is None else cls_.__name__ if not isinstance(cls_, str) else cls_
+        for cls_ in types
+    ]
+    if len(type_name) == 1:
+        type_name = type_name[0]
+    elif len(type_name) == 2:
+        type_name = " or ".join(type_name)
+    else:
+        type_name[-1] = "or " + type_name[-1]
+        type_name = ", ".join(type_name)
+    item_name = "Item" if item_name is None else f"'{item_name}'"
+    raise TypeError(
+        f"{item_name} must be an instance of {type_name}, got {type(item)} instead."
+    )
+
+
+def compile_check_type(
+    types: tuple, item_name: Optional[str] = None
+) -> Callable[[Any], None]:
+    """Compile a type checker.
+
+    The types are resolved once and the compiled checker is memoized by arguments,
+    thus the validation of a valid item costs a single :func:`isinstance` call.
+
+    Parameters
+    ----------
+    types : tuple of types | tuple of str
+        Types to be checked against, see :func:`~flow.utils._checks.check_type`.
+    item_name : str | None
+        Name of the item to show inside the error message.
+
+    Returns
+    -------
+    checker : callable
+        Function ``checker(item)`` raising the same TypeError as
+        :func:`~flow.utils._checks.check_type` when the type of the item is invalid.
+    """
+    try:
+        return _compile_check_type(types, item_name)
+    except TypeError:  # unhashable types can not be memoized
+        return _compile_check_type.__wrapped__(types, item_name)
+
+
+@lru_cache(maxsize=256)
+def _compile_check_type(
+    types: tuple, item_name: Optional[str]
+) -> Callable[[Any], None]:
+    """Compile a type checker from a tuple of types."""
+    check_types = _resolve_types.__wrapped__(types)
+
+    def checker(item: Any) -> None:
+        if isinstance(item, check_types):
+            return
+        _raise_type_error(item, types, item_name)
+
+    return checker
 
 
 def check_value(
@@ -173,6 +225,59 @@ def check_value(
         )
 
 
+def compile_check_value(
+    allowed_values: Union[tuple, dict[Any, Any]],
+    item_name: Optional[str] = None,
+    extra: Optional[str] = None,
+) -> Callable[[Any], None]:
+    """Compile a value checker.
+
+    The allowed values are converted once to a set and the compiled checker is
+    memoized by arguments, thus the validation of a valid item is a set lookup.
+
+    Parameters
+    ----------
+    allowed_values : tuple of objects | dict of objects
+        Allowed values to be checked against. If a dictionary, checks against the keys.
+    item_name : str | None
+        Name of the item to show inside the error message.
+    extra : str | None
+        Extra string to append to the invalid value sentence, e.g. "when using DC mode".
+
+    Returns
+    -------
+    checker : callable
+        Function ``checker(item)`` raising the same ValueError as
+        :func:`~flow.utils._checks.check_value` when the value of the item is invalid.
+    """
+    allowed_values = tuple(allowed_values)
+    try:
+        return _compile_check_value(allowed_values, item_name, extra)
+    except TypeError:  # unhashable allowed values can not be memoized
+        return _compile_check_value.__wrapped__(allowed_values, item_name, extra)
+
+
+@lru_cache(maxsize=256)
+def _compile_check_value(
+    allowed_values: tuple, item_name: Optional[str], extra: Optional[str]
+) -> Callable[[Any], None]:
+    """Compile a value checker from a tuple of allowed values."""
+    try:
+        allowed_set = frozenset(allowed_values)
+    except TypeError:  # unhashable allowed values
+        allowed_set = frozenset()
+
+    def checker(item: Any) -> None:
+        try:
+            if item in allowed_set:
+                return
+        except TypeError:  # unhashable item
+            pass
+        check_value(item, allowed_values, item_name, extra)
+
+    return checker
+
+
 @fill_doc
 def check_verbose(verbose: Any) -> int:
     """Check that the value of verbose is valid.
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import logging
+import sys
+import time
+from threading import Event, Thread
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ._checks import check_type
+from .logs import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import Optional, TextIO
+
+
+class Dashboard:
+    """Live terminal dashboard refreshed from a background thread.
+
+    The dashboard only reads the state it displays, e.g. counters incremented by the
+    monitored threads, and renders it a few times per second in place, by moving the
+    cursor back to the first line of the previous rendering with ANSI escape codes.
+    The logs below the warnings would scroll the dashboard and are thus not displayed
+    while the dashboard is displayed.
+
+    Parameters
+    ----------
+    render : callable
+        Function called without argument from the background thread, which returns the
+        lines to display.
+    rate : float
+        Number of refreshes per second.
+    stream : file-like | None
+        Stream on which the dashboard is written. If None, ``sys.stdout`` is used.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[], list[str]],
+        rate: float = 4.0,
+        stream: Optional[TextIO] = None,
+    ) -> None:
+        check_type(rate, ("numeric",), "rate")
+        if rate <= 0:
+            raise ValueError(f"The refresh rate must be positive, got {rate}.")
+        self._render = render
+        self._period = 1 / rate
+        self._stream = sys.stdout if stream is None else stream
+        self._n_lines = 0
+        self._level = None
+        self._stopping = Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Start refreshing the dashboard."""
+        if self._thread is not None:
+            raise RuntimeError("The dashboard is already started.")
+        self._level = logger.level
+        logger.setLevel(max(self._level, logging.WARNING))
+        self._stopping.clear()
+        self._thread = Thread(target=self._run, name="dashboard", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop refreshing the dashboard, after a last refresh."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+        logger.setLevel(self._level)
+
+    def _run(self) -> None:
+        """Refresh the dashboard until stopped."""
+        while True:
+            self.refresh()
+            if self._stopping.wait(self._period):
+                break
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Render the dashboard in place of the previous rendering."""
+        lines = self._render()
+        # move up to the first line of the previous rendering and clear the screen
+        # below, in a single write to avoid flickering
+        prefix = f"\x1b[{self._n_lines}F\x1b[J" if self._n_lines != 0 else ""
+        self._stream.write(prefix + "".join(f"{line}\n" for line in lines))
+        self._stream.flush()
+        self._n_lines = len(lines)
+
+    def __enter__(self) -> Dashboard:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+class RateMeter:
+    """Measure the rate at which a counter increases between 2 readings."""
+
+    def __init__(self) -> None:
+        self._count = None
+        self._time = None
+
+    def update(self, count: int) -> float:
+        """Read the counter.
+
+        Parameters
+        ----------
+        count : int
+            Current value of the counter.
+
+        Returns
+        -------
+        rate : float
+            Increase of the counter per second since the previous reading, or NaN on
+            the first reading.
+        """
+        now = time.perf_counter()
+        if self._count is None or now == self._time:
+            rate = np.nan
+        else:
+            rate = (count - self._count) / (now - self._time)
+        self._count = count
+        self._time = now
+        return rate
+
+
+def format_percentiles(values: np.ndarray, scale: float = 1e-6) -> str:
+    """Format the median, the 95th and 99th percentiles and the maximum.
+
+    Parameters
+    ----------
+    values : array
+        The values, e.g. durations in nanoseconds.
+    scale : float
+        Factor applied to the values, e.g. ``1e-6`` to convert nanoseconds to
+        milliseconds.
+
+    Returns
+    -------
+    text : str
+        The formatted percentiles, or ``"n/a"`` if there is no value.
+    """
+    if values.size == 0:
+        return "n/a"
+    p50, p95, p99, maximum = np.percentile(values, (50, 95, 99, 100)) * scale
+    return f"p50 {p50:.3f}  p95 {p95:.3f}  p99 {p99:.3f}  max {maximum:.3f}"
@@ -3,7 +3,9 @@ from __future__ import annotations
 import platform
 import sys
 from functools import lru_cache, partial
+from glob import glob
 from importlib.metadata import metadata, requires, version
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import psutil
@@ -15,7 +17,7 @@ if TYPE_CHECKING:
     from typing import IO, Callable, Optional
 
 
-def sys_info(fid: Optional[IO] = None, developer: bool = False):
+def sys_info(fid: Optional[IO] = None, developer: bool = False, realtime: bool = False):
     """Print the system information for debugging.
 
     Parameters
@@ -25,8 +27,12 @@ def sys_info(fid: Optional[IO] = None, developer: bool = False):
         :data:`sys.stdout`.
     developer : bool
         If True, display information about optional dependencies.
+    realtime : bool
+        If True, display the real-time limits and settings of the system. The wake-up
+        latency of the sleep functions is measured by ``flow sys-info --realtime``.
     """
     check_type(developer, (bool,), "developer")
+    check_type(realtime, (bool,), "realtime")
 
     ljust = 26
     out = partial(print, end="", file=fid)
@@ -75,6 +81,58 @@ def sys_info(fid: Optional[IO] = None, developer: bool = False):
             out(f"\nOptional '{key}' dependencies\n")
             _list_dependencies_info(out, ljust, package, extra_dependencies)
 
+    # real-time readiness
+    if realtime:
+        out("\nReal-time readiness\n")
+        _list_realtime_info(out, ljust)
+
+
+def _list_realtime_info(out: Callable, ljust: int) -> None:
+    """List the real-time limits and settings."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        resource = None
+    limits = (
+        ("RT priority limit:", "RLIMIT_RTPRIO"),
+        ("Nice limit:", "RLIMIT_NICE"),
+        ("Memlock limit:", "RLIMIT_MEMLOCK"),
+    )
+    for name, limit in limits:
+        if resource is None or not hasattr(resource, limit):
+            out(name.ljust(ljust) + "Not available\n")
+            continue
+        soft, hard = (
+            _format_rlimit(value, resource)
+            for value in resource.getrlimit(getattr(resource, limit))
+        )
+        out(name.ljust(ljust) + f"{soft} (hard: {hard})\n")
+    governors = sorted(
+        set(
+            _read_sys_file(fname)
+            for fname in glob("/sys/devices/system/cpu/cpu*/cpufreq/scaling_governor")
+        )
+    )
+    out("CPU governor:".ljust(ljust) + (", ".join(governors) or "Not available") + "\n")
+    slack = _read_sys_file("/proc/self/timerslack_ns")
+    slack = "Not available" if slack is None else f"{slack} ns"
+    out("Timer slack:".ljust(ljust) + slack + "\n")
+    isolated = _read_sys_file("/sys/devices/system/cpu/isolated")
+    out("Isolated cores:".ljust(ljust) + (isolated or "None") + "\n")
+
+
+def _format_rlimit(value: int, resource) -> str:
+    """Format a resource limit."""
+    return "unlimited" if value == resource.RLIM_INFINITY else str(value)
+
+
+def _read_sys_file(fname: str) -> Optional[str]:
+    """Read a system file, e.g. in /sys or /proc."""
+    try:
+        return Path(fname).read_text().strip()
+    except OSError:
+        return None
+
 
 def _list_dependencies_info(
     out: Callable, ljust: int, package: str, dependencies: list[Requirement]
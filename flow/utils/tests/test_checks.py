@@ -4,7 +4,15 @@ from pathlib import Path
 import numpy as np
 import pytest
 
-from .._checks import check_type, check_value, check_verbose, ensure_int, ensure_path
+from .._checks import (
+    check_type,
+    check_value,
+    check_verbose,
+    compile_check_type,
+    compile_check_value,
+    ensure_int,
+    ensure_path,
+)
 
 
 def test_ensure_int():
@@ -63,6 +71,41 @@ def test_check_value():
         check_value(5, [1, 2, 3, 4], "number")
 
 
+def test_compile_check_type():
+    """Test compiled type checker."""
+    checker = compile_check_type(("int-like", str), "number")
+    assert checker is compile_check_type(("int-like", str), "number")  # memoized
+    checker(101)
+    checker("101")
+    for item, types in ((101.0, ("int-like", str)), (101, (float, None))):
+        with pytest.raises(TypeError, match="must be an instance") as exc_compiled:
+            compile_check_type(types, "number")(item)
+        with pytest.raises(TypeError, match="must be an instance") as exc:
+            check_type(item, types, "number")
+        assert str(exc_compiled.value) == str(exc.value)
+    # unhashable types
+    compile_check_type([str, "int-like"])(101)
+    with pytest.raises(TypeError, match="must be an instance"):
+        compile_check_type([str])(101)
+
+
+def test_compile_check_value():
+    """Test compiled value checker."""
+    checker = compile_check_value([1, 2, 3, 4], "number")
+    assert checker is compile_check_value((1, 2, 3, 4), "number")  # memoized
+    checker(4)
+    with pytest.raises(ValueError, match="Invalid value") as exc_compiled:
+        checker(5)
+    with pytest.raises(ValueError, match="Invalid value") as exc:
+        check_value(5, [1, 2, 3, 4], "number")
+    assert str(exc_compiled.value) == str(exc.value)
+    # unhashable items and allowed values
+    compile_check_value([(1, 2), [2, 3]])([2, 3])
+    with pytest.raises(ValueError, match="Invalid value"):
+        compile_check_value([(1, 2), (2, 3)])([2, 3])
+    compile_check_value({"a": 1, "b": 2}, "key")("a")
+
+
 def test_check_verbose():
     """Test check_verbose checker."""
     # valids
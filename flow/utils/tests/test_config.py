@@ -35,6 +35,18 @@ def test_sys_info():
     assert "test" in value
 
 
+def test_sys_info_realtime():
+    """Test real-time readiness information."""
+    out = StringIO()
+    sys_info(fid=out, realtime=True)
+    value = out.getvalue()
+    out.close()
+    assert "Real-time readiness" in value
+    assert "RT priority limit:" in value
+    assert "Memlock limit:" in value
+    assert "CPU governor:" in value
+
+
 def test_gpu_info():
     """Test getting GPU info."""
     pytest.importorskip("pyvista")
@@ -0,0 +1,48 @@
+import io
+import logging
+import time
+
+import numpy as np
+import pytest
+
+from flow.utils._dashboard import Dashboard, RateMeter, format_percentiles
+from flow.utils.logs import logger
+
+
+def test_dashboard():
+    """Test refreshing a dashboard in place."""
+    stream = io.StringIO()
+    counter = [0]
+
+    def render():
+        counter[0] += 1
+        return [f"refresh {counter[0]}", "second line"]
+
+    level = logger.level
+    with Dashboard(render, rate=50, stream=stream):
+        assert logging.WARNING <= logger.level
+        time.sleep(0.1)
+    assert logger.level == level
+    output = stream.getvalue()
+    assert output.startswith("refresh 1\nsecond line\n")
+    # every refresh but the first moves up by 2 lines and clears the screen below
+    assert output.count("\x1b[2F\x1b[J") == counter[0] - 1
+    assert output.endswith(f"refresh {counter[0]}\nsecond line\n")
+    assert 2 < counter[0]
+    with pytest.raises(ValueError, match="must be positive"):
+        Dashboard(render, rate=0)
+
+
+def test_rate_meter():
+    """Test measuring the rate of a counter."""
+    meter = RateMeter()
+    assert np.isnan(meter.update(0))
+    time.sleep(0.05)
+    assert 0 < meter.update(100) < 100 / 0.05 * 1.01
+
+
+def test_format_percentiles():
+    """Test formatting the percentiles."""
+    assert format_percentiles(np.array([])) == "n/a"
+    text = format_percentiles(np.arange(101) * 1e6)
+    assert text == "p50 50.000  p95 95.000  p99 99.000  max 100.000"